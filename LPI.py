@@ -1,2 +0,0 @@
-# Redirect to specific version
-from LPI_23_0 import *
\ No newline at end of file
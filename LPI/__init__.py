@@ -0,0 +1,76 @@
+# LUSAS Programmable Interface (LPI) definitions
+#
+# The full LPI documentation for each version of LUSAS Modeller is contained in the LPI_xx_y modules, which are
+# large and slow to import. Only the module of the current version is kept as a file, for editors, the modules of
+# other versions are synthesised from the single table of all versions maintained by LPI._api.
+# Only get_lusas_modeller and win32 are defined eagerly here, the IF* classes are resolved when first used, such
+# that "from LPI import *" is quick to execute. Use LPI.supports(version, "IFClass.method") to check whether a
+# version of Modeller provides part of the API.
+# Editors and type checkers see the full documented API through the TYPE_CHECKING import below.
+
+from typing import TYPE_CHECKING
+import win32com.client as win32
+from LPI._index import CLASS_NAMES
+
+# Version of LUSAS Modeller to connect to and document
+VERSION = "23.0"
+
+# Type checkers only follow imports of fixed names, so this is pinned to the module of VERSION, the one kept as a file.
+# Change both together
+if TYPE_CHECKING:
+    from LPI.LPI_23_0 import *
+
+_class_names = frozenset(CLASS_NAMES.get(VERSION, ()))
+
+__all__ = ["win32", "get_lusas_modeller", "IDispatch", "IFDispatch", *CLASS_NAMES.get(VERSION, ())]
+
+
+class IDispatch:pass
+class IFDispatch:pass
+
+
+def get_lusas_modeller(showApp = True) -> 'IFModeller':
+
+    app:IFModeller = win32.gencache.EnsureDispatch(f'Lusas.Modeller.{VERSION}')
+    if(app is not None):
+        app.enableUI(showApp)
+        app.setVisible(showApp)
+    return app
+
+
+def get_api():
+    """Returns the module containing the full documented LPI classes of the current version, importing it if necessary"""
+    return load_module(VERSION)
+
+
+def load_module(version):
+    """Returns the module containing the full documented LPI classes of the given version, e.g. "22.0" or 22"""
+    from LPI import _api
+    return _api.load_module(version)
+
+
+def supports(version, name:str) -> bool:
+    """Query whether a version of LUSAS Modeller provides an LPI class or method, e.g. supports(22, "IFModeller.enableUI")"""
+    from LPI import _api
+    return _api.supports(version, name)
+
+
+class _LazyClass(type):
+    # Metaclass of the placeholder classes, any attribute not defined by the placeholder (for example a method
+    # or its documentation) is taken from the documented class, which is imported at that point
+    def __getattr__(cls, name):
+        return getattr(getattr(get_api(), cls.__name__), name)
+
+
+def __getattr__(name:str):
+    # Called for names not yet defined in this module, including by "from LPI import *"
+    if name in _class_names:
+        placeholder = _LazyClass(name, (IFDispatch,), {"__module__": __name__,
+                                 "__doc__": f"Placeholder for {name}, its methods and documentation are those of get_api().{name}"})
+        globals()[name] = placeholder
+        return placeholder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _class_names)
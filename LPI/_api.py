@@ -0,0 +1,242 @@
+# Canonical description of the LPI for all supported versions of LUSAS Modeller.
+#
+# The documented LPI_xx_y modules of different versions are near identical. Each module is split into segments
+# (the file header, each class header, each method and the get_lusas_modeller footer) and every distinct segment
+# is stored once in _api.json.gz. Each version is then just the sequence of segments making up its module, so
+# the module of any version can be synthesised exactly, on demand, as LPI.LPI_xx_y.
+#
+# Usage:
+#   python -m LPI._api add LPI_24_0.py 24.0    Add or update a version from a documented module supplied with LUSAS
+#   python -m LPI._api write 22.0              Write the documented module of a version, e.g. for an editor
+
+import functools
+import gzip
+import importlib.util
+import json
+import marshal
+import os
+import re
+import sys
+import hashlib
+
+API_FILE = os.path.join(os.path.dirname(__file__), "_api.json.gz")
+_SEGMENT_START = re.compile(r"^(class |\tdef |import win32com)")
+_CLASS_LINE = re.compile(r"^class (\w+)(?:\(([\w, ]*)\))?")
+_METHOD_LINE = re.compile(r"^\tdef (\w+)\(")
+
+
+def split_segments(text:str) -> list[str]:
+    """Split the text of a documented module into segments which join to give exactly the original text"""
+    segments, current = [], []
+    for line in text.splitlines(keepends=True):
+        if current and _SEGMENT_START.match(line):
+            segments.append("".join(current))
+            current = []
+        current.append(line)
+    segments.append("".join(current))
+    return segments
+
+
+@functools.cache
+def load_table() -> dict:
+    """The canonical table: {"segments": [text, ...], "versions": {"23.0": [segment index, ...], ...}}"""
+    with gzip.open(API_FILE, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_versions() -> list[str]:
+    return sorted(load_table()["versions"], key=lambda v: tuple(int(p) for p in v.split(".")))
+
+
+def _resolve_version(version) -> str:
+    # Accepts "22.0", 22.0 or the major version number 22 (the latest minor version is used)
+    versions = get_versions()
+    if isinstance(version, int):
+        matches = [v for v in versions if v.split(".")[0] == str(version)]
+    else:
+        matches = [v for v in versions if v == str(version)]
+    if not matches:
+        raise ValueError(f"LPI version {version} is not available, available versions are {versions}")
+    return matches[-1]
+
+
+def get_source(version) -> str:
+    """Text of the documented module of the given version"""
+    table = load_table()
+    return "".join(table["segments"][i] for i in table["versions"][_resolve_version(version)])
+
+
+@functools.cache
+def _get_members(version:str) -> tuple[dict[str, list[str]], dict[str, set[str]]]:
+    # Base classes and methods of each class of the given version
+    bases, methods = {}, {}
+    current = None
+    table = load_table()
+    for i in table["versions"][version]:
+        segment = table["segments"][i]
+        if (match := _CLASS_LINE.match(segment)) is not None:
+            current = match.group(1)
+            bases[current] = [b.strip() for b in (match.group(2) or "").split(",") if b.strip()]
+            methods[current] = set()
+        elif current is not None and (match := _METHOD_LINE.match(segment)) is not None:
+            methods[current].add(match.group(1))
+    return bases, methods
+
+
+def supports(version, name:str) -> bool:
+    """Query whether the LPI of a version of LUSAS Modeller provides a class or method, including inherited methods.
+       Use this to branch on the available API rather than on IFModeller.getMajorVersionNumber()
+
+    Args:
+        version (str | int): Version e.g. "22.0", or a major version number e.g. 22
+        name (str): Class or method e.g. "IFBridgeWizard" or "IFModeller.enableUI"
+
+    Returns:
+        bool: True if the class or method is available
+    """
+    bases, methods = _get_members(_resolve_version(version))
+    class_name, _, method = name.partition(".")
+    if not method:
+        return class_name in bases
+    pending = [class_name]
+    while pending:
+        c = pending.pop()
+        if method in methods.get(c, ()):
+            return True
+        pending.extend(bases.get(c, []))
+    return False
+
+
+def _module_name(version:str) -> str:
+    return f"LPI.LPI_{version.replace('.', '_')}"
+
+
+def _get_code(version:str):
+    # The compiled module is cached, keyed by the content of the table, so it is only compiled once
+    source = get_source(version)
+    key = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    cache_dir = os.path.join(os.path.dirname(__file__), "__pycache__")
+    cache_file = os.path.join(cache_dir, f"LPI_{version.replace('.', '_')}.{sys.implementation.cache_tag}.{key}.bin")
+    try:
+        with open(cache_file, "rb") as f:
+            return marshal.load(f)
+    except (OSError, ValueError, EOFError):
+        pass
+    code = compile(source, f"<LPI {version}>", "exec")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp = cache_file + ".tmp"
+        with open(temp, "wb") as f:
+            marshal.dump(code, f)
+        os.replace(temp, cache_file)
+    except OSError:
+        pass # Read only installation, compile every time
+    return code
+
+
+class _VersionModuleFinder:
+    # Imports LPI.LPI_xx_y from the table when there is no module file of that version. This is both the meta path
+    # finder and the loader, importlib.abc is not used as it is slow to import
+
+    def find_spec(self, fullname, path, target=None):
+        match = re.fullmatch(r"LPI\.LPI_(\d+)_(\d+)", fullname)
+        if match is None or os.path.exists(os.path.join(os.path.dirname(__file__), f"{fullname.split('.')[1]}.py")):
+            return None
+        version = f"{match.group(1)}.{match.group(2)}"
+        if version not in load_table()["versions"]:
+            return None
+        return importlib.util.spec_from_loader(fullname, self)
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        version = module.__name__.split("_", 1)[1].replace("_", ".")
+        exec(_get_code(version), module.__dict__)
+
+
+_finder = _VersionModuleFinder()
+
+
+def install_finder():
+    if _finder not in sys.meta_path:
+        sys.meta_path.append(_finder)
+
+
+def load_module(version):
+    """Import the documented module of the given version, synthesising it from the table if necessary"""
+    install_finder()
+    return importlib.import_module(_module_name(_resolve_version(version)))
+
+
+# %%
+''' Maintenance of the table '''
+
+
+def _save_table(table:dict):
+    temp = API_FILE + ".tmp"
+    with gzip.open(temp, "wt", encoding="utf-8", compresslevel=9) as f:
+        json.dump(table, f, separators=(",", ":"))
+    os.replace(temp, API_FILE)
+    load_table.cache_clear()
+    _get_members.cache_clear()
+
+
+def add_version(filename:str, version:str):
+    """Add or replace a version in the table from the documented module supplied with LUSAS, then rewrite the class index
+
+    Args:
+        filename (str): Documented module, e.g. LPI_24_0.py
+        version (str): Version of the module e.g. "24.0"
+    """
+    with open(filename, encoding="utf-8", newline="") as f:
+        text = f.read()
+    table = load_table() if os.path.exists(API_FILE) else {"segments": [], "versions": {}}
+    table = {"segments": list(table["segments"]), "versions": dict(table["versions"])}
+    index = {segment: i for i, segment in enumerate(table["segments"])}
+    sequence = []
+    for segment in split_segments(text):
+        if segment not in index:
+            index[segment] = len(table["segments"])
+            table["segments"].append(segment)
+        sequence.append(index[segment])
+    table["versions"][version] = sequence
+    # Drop segments no longer used by any version
+    used = sorted({i for s in table["versions"].values() for i in s})
+    renumber = {old: new for new, old in enumerate(used)}
+    table = {"segments": [table["segments"][i] for i in used],
+             "versions": {v: [renumber[i] for i in s] for v, s in table["versions"].items()}}
+    _save_table(table)
+    assert get_source(version) == text, "Synthesised module does not match the original"
+    write_index()
+
+
+def write_module(version, filename:str=None):
+    """Write the documented module of a version, by default into this package as LPI_xx_y.py"""
+    version = _resolve_version(version)
+    if filename is None:
+        filename = os.path.join(os.path.dirname(__file__), f"LPI_{version.replace('.', '_')}.py")
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        f.write(get_source(version))
+
+
+def write_index():
+    """Write _index.py, the class names of each version used by LPI/__init__.py without loading the table"""
+    lines = ["# Generated by LPI._api - do not edit", "", "CLASS_NAMES = {"]
+    for version in get_versions():
+        bases, _ = _get_members(version)
+        names = ", ".join(f'"{name}"' for name in bases if name not in ("IDispatch", "IFDispatch"))
+        lines.append(f'    "{version}": ({names}),')
+    lines.append("}")
+    with open(os.path.join(os.path.dirname(__file__), "_index.py"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    match sys.argv[1:]:
+        case ["add", filename, version]:
+            add_version(filename, version)
+        case ["write", version]:
+            write_module(version)
+        case _:
+            print("Usage: python -m LPI._api add <file> <version> | write <version>")
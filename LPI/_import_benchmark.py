@@ -0,0 +1,30 @@
+# Compares the cold-start import time of the lazy LPI package with importing the full documented module.
+# Run from the repository root:  python -m LPI._import_benchmark
+
+import subprocess
+import sys
+
+STATEMENTS = {
+    "lazy package": "from LPI import *",
+    "full documented module": "from LPI.LPI_23_0 import *",
+}
+
+
+def get_import_time(statement:str, repeats:int=5) -> float:
+    """Best total import time in milliseconds reported by python -X importtime for the given statement"""
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True).stderr
+        # Each line is "import time: self [us] | cumulative | imported package", sum the top level imports
+        total = 0
+        for line in output.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith("  "):
+                total += int(parts[1])
+        times.append(total / 1000)
+    return min(times)
+
+
+if __name__ == "__main__":
+    for name, statement in STATEMENTS.items():
+        print(f"{name:45s} {get_import_time(statement):8.1f} ms")
@@ -0,0 +1,7 @@
+# Generated by LPI._api - do not edit
+
+CLASS_NAMES = {
+    "21.1": ("IFModellerDlg", "IFUnit", "IFUnitSet", "IFCellBitmapDC", "IFCellTextDC", "IFTextWindow", "IFAnimationManager", "IFAnimationView", "IFToolbarManager", "IFMenu", "IFResultsCache", "IFDatabaseMember", "IFFileUtils", "IFPolylineDefn", "IFProject", "IFReportChapter", "IFCustomSubReport", "IFReport", "IFAttribute", "IFAssignment", "IFControl", "IFLoadset", "IFGeometryData", "IF3dCoords", "IF2dCoords", "IFGraphBase", "IFGraphWizardCurve", "IFDialog", "IFResultsComponentSet", "IFResultsContext", "IFLayer", "IFOptions", "IFExportDataObj", "IFLusasRunOptionsObj", "IFImportDataObj", "IFElementDataObj", "IFFeatureToken", "IFGridWindow", "IFAnalysisBaseClass", "IFVLOInfluenceAssignEntry", "IFVLOInfDesignLoadcase", "IFVLOInfAssignResult", "IFTLORunBase", "IFIDSettingsObj", "IFReinforcementSectionBar", "IFTransverseReinforcement", "IFPrestressSolver", "IFDatabaseOperations", "IFObjectSet", "IFSelection", "IFGeometry", "IFMeshFamily", "IFPoint", "IFLine", "IFPolyline", "IFReferencePath", "IFCombinedLine", "IFSurface", "IFVolume", "IFHollowVolume", "IFNode", "IFEdge", "IFFace", "IFElement", "IFGroup", "IFBackgroundGrid", "IFLayoutGrid", "IFLayoutGridRectangular", "IFLayoutGridCircular", "IFLayoutGridByOffset", "IFObjsToDrape", "IFDatabase", "IFUserContentChapter", "IFUtilityChapter", "IFOneClickReportChapter", "IFCustomChapter", "IFModuleChapter", "IFResultsChapter", "IFCableTuningTargetsResultsChapter", "IFPrestressChapter", "IFMeshAttr", "IFMeshPoint", "IFPointSpacingMeshAttr", "IFPointElementMeshAttr", "IFMeshLine", "IFMeshSurface", "IFMeshVolume", "IFMeshPhreatic", "IFLocalCoord", "IFPlanarRotationCartLocalAttr", "IFPlanarRotationCylLocalAttr", "IFPlanarRotationSphLocalAttr", "IFGenRotationCartLocalAttr", "IFGenRotationCylLocalAttr", "IFGenRotationSphLocalAttr", "IFScaleCartLocalAttr", "IFScaleCylLocalAttr", "IFScaleSphLocalAttr", "IFSurfaceAxesLocalAttr", "IFBeamAxesLocalAttr", "IFTransformationAttr", "IFPlanarRotationTransAttr", "IFGenRotationTransAttr", "IFScaleTransAttr", "IFTranslationTransAttr", "IFMirrorPlaneTransAttr", "IFScreenMirrorTransAttr", "IFCompoundTransAttr", "IFAboutAxisTransAttr", "IFVariationAttr", "IFDataset", "IFPSD", "IFPedestrianLoadDefinition", "IFSpectralCurve", "IFVariationField", "IFVariationLine", "IFInterpolationVariation", "IFVariationSurface", "IFVariationBoundary", "IFVariationGrid", "IFVariationFactored", "IFProfileVariation", "IFGeometric", "IFGeometricLine", "IFGeometricSurface", "IFGeometricJoint", "IFGeometricThermalLink", "IFPropertyModifier", "IFActivate", "IFDeactivate", "IFDrained", "IFUndrained", "IFDamping", "IFResetDeformation", "IFDimensionLines", "IFGeomBeamOptimPool", "IFGeomBeamOptimUtil", "IFEquivalence", "IFCrackTip", "IFElementTypeAttr", "IFSurfaceRadiation", "IFSearchArea", "IFAge", "IFPhiCReduction", "IFSlide", "IFThermalSurfaceGap", "IFThermalSurface", "IFSupport", "IFSupportThermal", "IFSupportStructural", "IFInspectionPoint", "IFInspectionLine", "IFGraphInspectionLine", "IFBeamShellSlice", "IFCompositeDesignMember", "IFLoading", "IFLoadingBeamDistributed", "IFLoadingBeamPoint", "IFLoadingConcentrated", "IFLoadingBody", "IFLoadingGravity", "IFLoadingTemperature", "IFLoadingStressStrain", "IFLoadingFace", "IFLoadingTendon", "IFFieldFaceLoading", "IFLoadingGlobalDistributed", "IFLoadingLocalDistributed", "IFPrescribedDisplacementLoad", "IFPrescribedVelocityLoad", "IFPrescribedAccelerationLoad", "IFLoadingFlux", "IFPrescribedTemperatureLoad", "IFLoadingInitialTemperature", "IFLoadingEnvironmental", "IFInternalHeatLoading", "IFInternalHeatUserLoading", "IFLoadingDiscreteBase", "IFLoadingDiscrete", "IFLoadingDiscretePoint", "IFLoadingDiscretePatch", "IFDiscreteFluxPointLoading", "IFDiscreteHeatPointLoading", "IFDiscreteENVTLoading", "IFDiscreteFluxPatchLoading", "IFDiscreteHeatPatchLoading", "IFDiscreteCompoundLoading", "IFInitialVelocityLoad", "IFInitialAccelerationLoad", "IFSurfDistrLoading", "IFTemperatureProfileLoad", "IFStrainProfileLoad", "IFWaterPressureDistrLoad", "IFBeamProjectedPressureLoad", "IFConstraint", "IFConstraintConstant", "IFRigidFloorConstraintEqu", "IFConstraintCyclic", "IFCyclicTranslation", "IFNormalTiedMeshConstraint", "IFEquiDistTiedConstraint", "IFConstraintPath", "IFPlanarSurfaceConstraint", "IFRigidDisplacementConstraint", "IFRigidLinkConstraint", "IFConstraintEquation", "IFConstraintTied", "IFStraightLineConstraint", "IFRetainedFreedom", "IFRetainedStructural", "IFRetainedThermal", "IFThermalProperties", "IFMaterial", "IFAnisotropicMaterial", "IFRigiditiesMaterial", "IFFrictionalJointMaterial", "IFGeneralJointMaterial", "IFNonlinearJointMaterial", "IFSmoothJointMaterial", "IFSpringJointMaterial", "IFUniformJointMaterial", "IFViscousJointMaterial", "IFLeadRubberBearingJointMaterial", "IFFrictionalPendulumJointMaterial", "IFNonLinearUserJointMaterial", "IFPiecewiseLinearJointMaterial", "IFPlasticHingeJointMaterial", "IFPlasticHingePMMJointMaterial", "IFMatrixJointMaterial", "IFMaterialTropicSet", "IFMaterialIsotropic", "IFMaterialOrthotropic", "IFCoupledWovenMaterial", "IFMaterialNonlinearUser", "IFMaterialResultantUser", "IFFieldIsotropicMaterial", "IFFieldOrthotropicMaterial", "IFInterfaceMaterial", "IFRubberMaterial", "IFVolumeCrushingMaterial", "IFMaterialMass", "IFPolymerMaterial", "IFGPMdamageMaterial", "IFComposite", "IFCompositeBeam", "IFCompositeShell", "IFCompositeWoven", "IFCompositeFiberSIM", "IFCompositeSimulayt", "IFInfluence", "IFInfluenceEnvelope", "IFDirectMethodInfluence", "IFTendonProperties", "IFTendonProfile", "IFScriptedAttribute", "IFFailureComposite", "IFVLOVehicleLibrary", "IFVLOVehicle", "IFDesignFactor", "IFDesignAttribute", "IFShearTorsionAdvPropsDefinition", "IFMBWDefinition", "IFTankDefinition", "IFKogasTankDefinition", "IFTankReinforcementDefinition", "IFBridgeWizardDefinition", "IFBridgeWizardBridgeDefinition", "IFBridgeWizardSupportDefinition", "IFBridgeWizardStiffenerDefinition", "IFBridgeWizardSpanDefinition", "IFBridgeWizardSectionDefinition", "IFBridgeWizardTubSectionDefinition", "IFBridgeWizardGirderDefinition", "IFBridgeWizardBracingDefinition", "IFBridgeWizardBracingRunDefinition", "IFBridgeDesignDefinition", "IFBridgeDesignGirderMaterial", "IFBridgeDesignTransverseStiffener", "IFBridgeDesignLongitudinalStiffener", "IFRailTrackAnalysisUtilities", "IFRailTrackAnalysisZlrRlrProperties", "IFRailTrackAnalysisZlrRlrRegions", "IFPushoverCurve", "IFBuildingLoading", "IFBeamStressRecovery", "IFNonlinearUserThermal", "IFCamClayMaterialSet", "IFSoilStructureMaterialSet", "IFPiecewiseLinearBarMaterial", "IFThermalLinkMaterial", "IFDuncanChangMaterialSet", "IFElastoPlasticInterfaceSet", "IFHoekBrownMaterialSet", "IFBarcelonaBasicMaterialSet", "IFCompoundMaterial", "IFBridgeDeckMaterial", "IFPYCurve", "IFPileMaterialLayup", "IFEigenControl", "IFFourierControl", "IFTransientControl", "IFResultsLoadset", "IFPreLoadset", "IFLoadcase", "IFLoadCurve", "IFBasicCombination", "IFSmartCombination", "IFEnvelope", "IFTLOEnvelope", "IFFatigue", "IFIMD", "IFLoadsetResultsContainer", "IFScriptedLoadsetResultsContainer", "IFSlabDesignResultsContainer", "IFRCDesignResultsContainer", "IFLoadsetTargetValues", "IFCableTuningLoadcase", "IFCableTuningAnalysis", "IFCableTuningResults", "IFGraphWizard", "IFGraph", "IFPrintResultsWizard", "IFSavedView", "IFNote", "IFArbitrarySection", "IFParametricSection", "IFCurve", "IFSelectLoadsetsDialog", "IFFileDialog", "IFScriptedResultsComponentSet", "IFPrimaryScriptedResultsComponentSet", "IFScriptedResultsCallbackComponentSet", "IFView", "IFWireframeLayer", "IFGeometryLayer", "IFMeshLayer", "IFLabelLayer", "IFVisualiseLayer", "IFAttributesLayer", "IFUtilitiesLayer", "IFAnnotationLayer", "IFDeformLayer", "IFResultsLayer", "IFVectorsLayer", "IFContoursLayer", "IFDiagramsLayer", "IFValuesLayer", "IFSliceGroup", "IFStoreyGroup", "IFRailTrackDefinition", "IFRailTrackLayout", "IFAnnotation", "IFAnnotationBlock", "IFKeyAnnotation", "IFBorderAnnotation", "IFTextAnnotation", "IFLineAnnotation", "IFPolygonAnnotation", "IFArrowAnnotation", "IFSymbolAnnotation", "IFBitmapAnnotation", "IFTabulateDataObj", "IFExportNasDataObj", "IFExportAnsysDataObj", "IFExportAbaqusDataObj", "IFExportIgesDataObj", "IFExportStepDataObj", "IFExportBimDataObj", "IFExportDxfDataObj", "IFExportMidasDataObj", "IFExportSap2kDataObj", "IFExportScriptDataObj", "IFExportCmdDataObj", "IFExportStlDataObj", "IFImportIgesDataObj", "IFImportDxfDataObj", "IFImportCmdDataObj", "IFImportPatranDataObj", "IFImportStlDataObj", "IFImportDatFileDataObj", "IFImportStepFileDataObj", "IFImportBimFileDataObj", "IFImportInfFileDataObj", "IFImportFiberSimDataObj", "IFPrintResultsWindow", "IFLPIGridWindow", "IFVLOGridWindow", "IFAnalysis", "IFTLOEnvelopeRun", "IFVLOEnvelopeRun", "IFRLOEnvelopeRun", "IFVLORun", "IFRLORun", "IFVLOAnalysis", "IFReciprocalMethodInfAnalysis", "IFDirectMethodInfAnalysisBase", "IFDirectMethodInfAnalysis", "IFRailDMIAnalysis", "IFReinforcementSection", "IFReinforcementLine", "IFCableShape", "IFStaticMovingLoadAnalysis", "IFPedestrianMovingLoadAnalysis", "IFModeller"),
+    "22.0": ("IFModellerDlg", "IFUnit", "IFUnitSet", "IFCellBitmapDC", "IFCellTextDC", "IFTextWindow", "IFAnimationManager", "IFAnimationView", "IFToolbarManager", "IFMenu", "IFResultsCache", "IFDatabaseMember", "IFFileUtils", "IFPolylineDefn", "IFProject", "IFReportChapter", "IFCustomSubReport", "IFReport", "IFAttribute", "IFAssignment", "IFControl", "IFLoadset", "IFGeometryData", "IF3dCoords", "IF2dCoords", "IFGraphBase", "IFGraphWizardCurve", "IFDialog", "IFResultsComponentSet", "IFResultsContext", "IFLayer", "IFOptions", "IFExportDataObj", "IFLusasRunOptionsObj", "IFImportDataObj", "IFElementDataObj", "IFFeatureToken", "IFGridWindow", "IFAnalysisBaseClass", "IFVLOInfluenceAssignEntry", "IFVLOInfDesignLoadcase", "IFVLOInfAssignResult", "IFTLORunBase", "IFIDSettingsObj", "IFReinforcementSectionBar", "IFTransverseReinforcement", "IFPrestressSolver", "IFDatabaseOperations", "IFObjectSet", "IFSelection", "IFGeometry", "IFMeshFamily", "IFPoint", "IFLine", "IFPolyline", "IFReferencePath", "IFCombinedLine", "IFSurface", "IFVolume", "IFHollowVolume", "IFNode", "IFEdge", "IFFace", "IFElement", "IFGroup", "IFBackgroundGrid", "IFLayoutGrid", "IFLayoutGridRectangular", "IFLayoutGridCircular", "IFLayoutGridByOffset", "IFObjsToDrape", "IFDatabase", "IFUserContentChapter", "IFUtilityChapter", "IFOneClickReportChapter", "IFCustomChapter", "IFModuleChapter", "IFResultsChapter", "IFCableTuningTargetsResultsChapter", "IFPrestressChapter", "IFMeshAttr", "IFMeshPoint", "IFPointSpacingMeshAttr", "IFPointElementMeshAttr", "IFMeshLine", "IFMeshSurface", "IFMeshVolume", "IFMeshPhreatic", "IFLocalCoord", "IFPlanarRotationCartLocalAttr", "IFPlanarRotationCylLocalAttr", "IFPlanarRotationSphLocalAttr", "IFGenRotationCartLocalAttr", "IFGenRotationCylLocalAttr", "IFGenRotationSphLocalAttr", "IFScaleCartLocalAttr", "IFScaleCylLocalAttr", "IFScaleSphLocalAttr", "IFSurfaceAxesLocalAttr", "IFBeamAxesLocalAttr", "IFTransformationAttr", "IFPlanarRotationTransAttr", "IFGenRotationTransAttr", "IFScaleTransAttr", "IFTranslationTransAttr", "IFMirrorPlaneTransAttr", "IFScreenMirrorTransAttr", "IFCompoundTransAttr", "IFAboutAxisTransAttr", "IFVariationAttr", "IFDataset", "IFPSD", "IFPedestrianLoadDefinition", "IFSpectralCurve", "IFVariationField", "IFVariationLine", "IFInterpolationVariation", "IFVariationSurface", "IFVariationBoundary", "IFVariationGrid", "IFVariationFactored", "IFVariationPriorResults", "IFProfileVariation", "IFGeometric", "IFGeometricLine", "IFGeometricSurface", "IFGeometricJoint", "IFGeometricThermalLink", "IFPropertyModifier", "IFActivate", "IFDeactivate", "IFDrained", "IFUndrained", "IFDamping", "IFResetDeformation", "IFDimensionLines", "IFGeomBeamOptimPool", "IFGeomBeamOptimUtil", "IFEquivalence", "IFCrackTip", "IFElementTypeAttr", "IFSurfaceRadiation", "IFSearchArea", "IFAge", "IFPhiCReduction", "IFSlide", "IFThermalSurfaceGap", "IFThermalSurface", "IFSupport", "IFSupportThermal", "IFSupportStructural", "IFInspectionPoint", "IFInspectionLine", "IFGraphInspectionLine", "IFBeamShellSlice", "IFCompositeDesignMember", "IFLoading", "IFLoadingBeamDistributed", "IFLoadingBeamPoint", "IFLoadingConcentrated", "IFLoadingBody", "IFLoadingGravity", "IFLoadingTemperature", "IFLoadingStressStrain", "IFLoadingFace", "IFLoadingTendon", "IFFieldFaceLoading", "IFLoadingGlobalDistributed", "IFLoadingLocalDistributed", "IFPrescribedDisplacementLoad", "IFPrescribedVelocityLoad", "IFPrescribedAccelerationLoad", "IFLoadingFlux", "IFPrescribedTemperatureLoad", "IFLoadingInitialTemperature", "IFLoadingEnvironmental", "IFInternalHeatLoading", "IFInternalHeatUserLoading", "IFLoadingDiscreteBase", "IFLoadingDiscrete", "IFLoadingDiscretePoint", "IFLoadingDiscretePatch", "IFDiscreteFluxPointLoading", "IFDiscreteHeatPointLoading", "IFDiscreteENVTLoading", "IFDiscreteFluxPatchLoading", "IFDiscreteHeatPatchLoading", "IFDiscreteCompoundLoading", "IFInitialVelocityLoad", "IFInitialAccelerationLoad", "IFSurfDistrLoading", "IFTemperatureProfileLoad", "IFStrainProfileLoad", "IFWaterPressureDistrLoad", "IFBeamProjectedPressureLoad", "IFViscousSupportLoad", "IFConstraint", "IFConstraintConstant", "IFRigidFloorConstraintEqu", "IFConstraintCyclic", "IFCyclicTranslation", "IFNormalTiedMeshConstraint", "IFEquiDistTiedConstraint", "IFConstraintPath", "IFPlanarSurfaceConstraint", "IFRigidDisplacementConstraint", "IFRigidLinkConstraint", "IFConstraintEquation", "IFConstraintTied", "IFStraightLineConstraint", "IFRetainedFreedom", "IFRetainedStructural", "IFRetainedThermal", "IFThermalProperties", "IFMaterial", "IFAnisotropicMaterial", "IFRigiditiesMaterial", "IFFrictionalJointMaterial", "IFGeneralJointMaterial", "IFNonlinearJointMaterial", "IFSmoothJointMaterial", "IFSpringJointMaterial", "IFUniformJointMaterial", "IFViscousJointMaterial", "IFLeadRubberBearingJointMaterial", "IFFrictionalPendulumJointMaterial", "IFNonLinearUserJointMaterial", "IFPiecewiseLinearJointMaterial", "IFPlasticHingeJointMaterial", "IFPlasticHingePMMJointMaterial", "IFMatrixJointMaterial", "IFMaterialTropicSet", "IFMaterialIsotropic", "IFMaterialOrthotropic", "IFCoupledWovenMaterial", "IFMaterialNonlinearUser", "IFMaterialResultantUser", "IFFieldIsotropicMaterial", "IFFieldOrthotropicMaterial", "IFInterfaceMaterial", "IFRubberMaterial", "IFVolumeCrushingMaterial", "IFMaterialMass", "IFPolymerMaterial", "IFGPMdamageMaterial", "IFComposite", "IFCompositeBeam", "IFCompositeShell", "IFCompositeWoven", "IFCompositeFiberSIM", "IFCompositeSimulayt", "IFInfluence", "IFInfluenceEnvelope", "IFDirectMethodInfluence", "IFTendonProperties", "IFTendonProfile", "IFScriptedAttribute", "IFFailureComposite", "IFVLOVehicleLibrary", "IFVLOVehicle", "IFDesignFactor", "IFDesignAttribute", "IFShearTorsionAdvPropsDefinition", "IFMBWDefinition", "IFTankDefinition", "IFKogasTankDefinition", "IFTankReinforcementDefinition", "IFBridgeWizardDefinition", "IFBridgeWizardBridgeDefinition", "IFBridgeWizardSupportDefinition", "IFBridgeWizardStiffenerDefinition", "IFBridgeWizardSpanDefinition", "IFBridgeWizardSectionDefinition", "IFBridgeWizardTubSectionDefinition", "IFBridgeWizardGirderDefinition", "IFBridgeWizardBracingDefinition", "IFBridgeWizardBracingRunDefinition", "IFBridgeDesignDefinition", "IFBridgeDesignGirderMaterial", "IFBridgeDesignTransverseStiffener", "IFBridgeDesignLongitudinalStiffener", "IFRailTrackAnalysisUtilities", "IFRailTrackAnalysisZlrRlrProperties", "IFRailTrackAnalysisZlrRlrRegions", "IFPushoverCurve", "IFBuildingLoading", "IFBeamStressRecovery", "IFNonlinearUserThermal", "IFCamClayMaterialSet", "IFSoilStructureMaterialSet", "IFPiecewiseLinearBarMaterial", "IFThermalLinkMaterial", "IFDuncanChangMaterialSet", "IFElastoPlasticInterfaceSet", "IFHoekBrownMaterialSet", "IFBarcelonaBasicMaterialSet", "IFCompoundMaterial", "IFBridgeDeckMaterial", "IFPYCurve", "IFPileMaterialLayup", "IFEigenControl", "IFFourierControl", "IFTransientControl", "IFResultsLoadset", "IFPreLoadset", "IFLoadcase", "IFLoadCurve", "IFBasicCombination", "IFSmartCombination", "IFEnvelope", "IFTLOEnvelope", "IFFatigue", "IFIMD", "IFLoadsetResultsContainer", "IFScriptedLoadsetResultsContainer", "IFSlabDesignResultsContainer", "IFRCDesignResultsContainer", "IFLoadsetTargetValues", "IFCableTuningLoadcase", "IFCableTuningAnalysis", "IFCableTuningResults", "IFGraphWizard", "IFGraph", "IFPrintResultsWizard", "IFSavedView", "IFNote", "IFArbitrarySection", "IFParametricSection", "IFCurve", "IFSelectLoadsetsDialog", "IFFileDialog", "IFScriptedResultsComponentSet", "IFPrimaryScriptedResultsComponentSet", "IFScriptedResultsCallbackComponentSet", "IFView", "IFWireframeLayer", "IFGeometryLayer", "IFMeshLayer", "IFLabelLayer", "IFVisualiseLayer", "IFAttributesLayer", "IFUtilitiesLayer", "IFAnnotationLayer", "IFDeformLayer", "IFResultsLayer", "IFVectorsLayer", "IFContoursLayer", "IFDiagramsLayer", "IFValuesLayer", "IFSliceGroup", "IFStoreyGroup", "IFRailTrackDefinition", "IFRailTrackLayout", "IFAnnotation", "IFAnnotationBlock", "IFKeyAnnotation", "IFBorderAnnotation", "IFTextAnnotation", "IFLineAnnotation", "IFPolygonAnnotation", "IFArrowAnnotation", "IFSymbolAnnotation", "IFBitmapAnnotation", "IFTabulateDataObj", "IFExportNasDataObj", "IFExportAnsysDataObj", "IFExportAbaqusDataObj", "IFExportIgesDataObj", "IFExportStepDataObj", "IFExportBimDataObj", "IFExportDxfDataObj", "IFExportMidasDataObj", "IFExportSap2kDataObj", "IFExportScriptDataObj", "IFExportCmdDataObj", "IFExportStlDataObj", "IFImportIgesDataObj", "IFImportDxfDataObj", "IFImportCmdDataObj", "IFImportPatranDataObj", "IFImportStlDataObj", "IFImportDatFileDataObj", "IFImportStepFileDataObj", "IFImportBimFileDataObj", "IFImportInfFileDataObj", "IFImportFiberSimDataObj", "IFPrintResultsWindow", "IFLPIGridWindow", "IFVLOGridWindow", "IFAnalysis", "IFTLOEnvelopeRun", "IFVLOEnvelopeRun", "IFRLOEnvelopeRun", "IFVLORun", "IFRLORun", "IFVLOAnalysis", "IFReciprocalMethodInfAnalysis", "IFDirectMethodInfAnalysisBase", "IFDirectMethodInfAnalysis", "IFRailDMIAnalysis", "IFUserDefinedResult", "IFWoodArmerAttr", "IFResultsTransformationAttr", "IFReinforcementSection", "IFReinforcementLine", "IFCableShape", "IFStaticMovingLoadAnalysis", "IFPedestrianMovingLoadAnalysis", "IFModeller"),
+    "23.0": ("IFModellerDlg", "IFUnit", "IFUnitSet", "IFCellBitmapDC", "IFCellTextDC", "IFTextWindow", "IFAnimationManager", "IFAnimationView", "IFToolbarManager", "IFMenu", "IFResultsCache", "IFDatabaseMember", "IFFileUtils", "IFPolylineDefn", "IFProject", "IFReportChapter", "IFCustomSubReport", "IFReport", "IFAttribute", "IFAssignment", "IFControl", "IFLoadset", "IFGeometryData", "IF3dCoords", "IF2dCoords", "IFGraphBase", "IFGraphWizardCurve", "IFDialog", "IFResultsComponentSet", "IFResultsContext", "IFLayer", "IFOptions", "IFExportDataObj", "IFLusasRunOptionsObj", "IFImportDataObj", "IFElementDataObj", "IFFeatureToken", "IFGridWindow", "IFAnalysisBaseClass", "IFVLOInfluenceAssignEntry", "IFVLOInfDesignLoadcase", "IFVLOInfAssignResult", "IFTLORunBase", "IFIDSettingsObj", "IFReinforcementSectionBar", "IFSurfaceReinforcementLayoutLayer", "IFSurfaceReinforcementLayoutProps", "IFSurfReinfInfoResetter", "IFTransverseReinforcement", "IFPrestressSolver", "IFDatabaseOperations", "IFObjectSet", "IFSelection", "IFGeometry", "IFMeshFamily", "IFPoint", "IFLine", "IFPolyline", "IFReferencePath", "IFCombinedLine", "IFSurface", "IFVolume", "IFHollowVolume", "IFNode", "IFEdge", "IFFace", "IFElement", "IFGroup", "IFBackgroundGrid", "IFLayoutGrid", "IFLayoutGridRectangular", "IFLayoutGridCircular", "IFLayoutGridByOffset", "IFObjsToDrape", "IFDatabase", "IFUserContentChapter", "IFUtilityChapter", "IFOneClickReportChapter", "IFCustomChapter", "IFModuleChapter", "IFResultsChapter", "IFCableTuningTargetsResultsChapter", "IFPrestressChapter", "IFMeshAttr", "IFMeshPoint", "IFPointSpacingMeshAttr", "IFPointElementMeshAttr", "IFMeshLine", "IFMeshSurface", "IFMeshVolume", "IFMeshPhreatic", "IFLocalCoord", "IFPlanarRotationCartLocalAttr", "IFPlanarRotationCylLocalAttr", "IFPlanarRotationSphLocalAttr", "IFGenRotationCartLocalAttr", "IFGenRotationCylLocalAttr", "IFGenRotationSphLocalAttr", "IFScaleCartLocalAttr", "IFScaleCylLocalAttr", "IFScaleSphLocalAttr", "IFSurfaceAxesLocalAttr", "IFBeamAxesLocalAttr", "IFTransformationAttr", "IFPlanarRotationTransAttr", "IFGenRotationTransAttr", "IFScaleTransAttr", "IFTranslationTransAttr", "IFMirrorPlaneTransAttr", "IFScreenMirrorTransAttr", "IFCompoundTransAttr", "IFAboutAxisTransAttr", "IFVariationAttr", "IFDataset", "IFPSD", "IFPedestrianLoadDefinition", "IFSpectralCurve", "IFVariationField", "IFVariationLine", "IFInterpolationVariation", "IFVariationSurface", "IFVariationBoundary", "IFVariationGrid", "IFVariationFactored", "IFVariationPriorResults", "IFProfileVariation", "IFGeometric", "IFGeometricLine", "IFGeometricSurface", "IFGeometricJoint", "IFGeometricThermalLink", "IFPropertyModifier", "IFActivate", "IFDeactivate", "IFDrained", "IFUndrained", "IFDamping", "IFResetDeformation", "IFDimensionLines", "IFGeomBeamOptimPool", "IFGeomBeamOptimUtil", "IFEquivalence", "IFCrackTip", "IFElementTypeAttr", "IFSurfaceRadiation", "IFSearchArea", "IFAge", "IFPhiCReduction", "IFSlide", "IFThermalSurfaceGap", "IFThermalSurface", "IFSupport", "IFSupportThermal", "IFSupportStructural", "IFInspectionPoint", "IFInspectionLine", "IFGraphInspectionLine", "IFBeamShellSlice", "IFCompositeDesignMember", "IFLoading", "IFLoadingBeamDistributed", "IFLoadingBeamPoint", "IFLoadingConcentrated", "IFLoadingBody", "IFLoadingGravity", "IFLoadingTemperature", "IFLoadingStressStrain", "IFLoadingFace", "IFLoadingTendon", "IFFieldFaceLoading", "IFLoadingGlobalDistributed", "IFLoadingLocalDistributed", "IFPrescribedDisplacementLoad", "IFPrescribedVelocityLoad", "IFPrescribedAccelerationLoad", "IFLoadingFlux", "IFPrescribedTemperatureLoad", "IFLoadingInitialTemperature", "IFLoadingEnvironmental", "IFInternalHeatLoading", "IFInternalHeatUserLoading", "IFLoadingDiscreteBase", "IFLoadingDiscrete", "IFLoadingDiscretePoint", "IFLoadingDiscretePatch", "IFDiscreteFluxPointLoading", "IFDiscreteHeatPointLoading", "IFDiscreteENVTLoading", "IFDiscreteFluxPatchLoading", "IFDiscreteHeatPatchLoading", "IFDiscreteCompoundLoading", "IFInitialVelocityLoad", "IFInitialAccelerationLoad", "IFSurfDistrLoading", "IFTemperatureProfileLoad", "IFStrainProfileLoad", "IFWaterPressureDistrLoad", "IFBeamProjectedPressureLoad", "IFViscousSupportLoad", "IFConstraint", "IFConstraintConstant", "IFRigidFloorConstraintEqu", "IFConstraintCyclic", "IFCyclicTranslation", "IFNormalTiedMeshConstraint", "IFEquiDistTiedConstraint", "IFConstraintPath", "IFPlanarSurfaceConstraint", "IFRigidDisplacementConstraint", "IFRigidLinkConstraint", "IFConstraintEquation", "IFConstraintTied", "IFStraightLineConstraint", "IFRetainedFreedom", "IFRetainedStructural", "IFRetainedThermal", "IFThermalProperties", "IFMaterial", "IFAnisotropicMaterial", "IFRigiditiesMaterial", "IFFrictionalJointMaterial", "IFGeneralJointMaterial", "IFNonlinearJointMaterial", "IFSmoothJointMaterial", "IFSpringJointMaterial", "IFUniformJointMaterial", "IFViscousJointMaterial", "IFLeadRubberBearingJointMaterial", "IFFrictionalPendulumJointMaterial", "IFNonLinearUserJointMaterial", "IFPiecewiseLinearJointMaterial", "IFPlasticHingeJointMaterial", "IFMatrixJointMaterial", "IFMaterialTropicSet", "IFMaterialIsotropic", "IFMaterialOrthotropic", "IFCoupledWovenMaterial", "IFMaterialNonlinearUser", "IFMaterialResultantUser", "IFFieldIsotropicMaterial", "IFFieldOrthotropicMaterial", "IFInterfaceMaterial", "IFRubberMaterial", "IFVolumeCrushingMaterial", "IFMaterialMass", "IFPolymerMaterial", "IFGPMdamageMaterial", "IFComposite", "IFCompositeBeam", "IFCompositeShell", "IFCompositeWoven", "IFCompositeFiberSIM", "IFCompositeSimulayt", "IFInfluence", "IFInfluenceEnvelope", "IFDirectMethodInfluence", "IFTendonProperties", "IFTendonProfile", "IFScriptedAttribute", "IFFailureComposite", "IFVLOVehicleLibrary", "IFVLOVehicle", "IFDesignFactor", "IFDesignAttribute", "IFRailTrackAnalysisUtilities", "IFRailTrackAnalysisZlrRlrProperties", "IFRailTrackAnalysisZlrRlrRegions", "IFBeamStressRecovery", "IFNonlinearUserThermal", "IFCamClayMaterialSet", "IFSoilStructureMaterialSet", "IFPiecewiseLinearBarMaterial", "IFThermalLinkMaterial", "IFDuncanChangMaterialSet", "IFElastoPlasticInterfaceSet", "IFHSSMaterialSet", "IFHoekBrownMaterialSet", "IFBarcelonaBasicMaterialSet", "IFCompoundMaterial", "IFBridgeDeckMaterial", "IFPYCurve", "IFPileMaterialLayup", "IFEigenControl", "IFFourierControl", "IFTransientControl", "IFResultsLoadset", "IFPreLoadset", "IFLoadcase", "IFLoadCurve", "IFBasicCombination", "IFSmartCombination", "IFEnvelope", "IFTLOEnvelope", "IFFatigue", "IFIMD", "IFLoadsetResultsContainer", "IFScriptedLoadsetResultsContainer", "IFSlabDesignResultsContainer", "IFRCDesignResultsContainer", "IFLoadsetTargetValues", "IFCableTuningLoadcase", "IFCableTuningAnalysis", "IFCableTuningResults", "IFGraphWizard", "IFGraph", "IFPrintResultsWizard", "IFSavedView", "IFNote", "IFArbitrarySection", "IFParametricSection", "IFCurve", "IFSelectLoadsetsDialog", "IFFileDialog", "IFScriptedResultsComponentSet", "IFPrimaryScriptedResultsComponentSet", "IFScriptedResultsCallbackComponentSet", "IFView", "IFWireframeLayer", "IFGeometryLayer", "IFMeshLayer", "IFLabelLayer", "IFVisualiseLayer", "IFAttributesLayer", "IFUtilitiesLayer", "IFAnnotationLayer", "IFDeformLayer", "IFResultsLayer", "IFVectorsLayer", "IFContoursLayer", "IFDiagramsLayer", "IFValuesLayer", "IFSliceGroup", "IFStoreyGroup", "IFRailTrackDefinition", "IFRailTrackLayout", "IFAnnotation", "IFAnnotationBlock", "IFKeyAnnotation", "IFBorderAnnotation", "IFTextAnnotation", "IFLineAnnotation", "IFPolygonAnnotation", "IFArrowAnnotation", "IFSymbolAnnotation", "IFBitmapAnnotation", "IFTabulateDataObj", "IFExportNasDataObj", "IFExportAnsysDataObj", "IFExportAbaqusDataObj", "IFExportIgesDataObj", "IFExportStepDataObj", "IFExportBimDataObj", "IFExportDxfDataObj", "IFExportMidasDataObj", "IFExportSap2kDataObj", "IFExportScriptDataObj", "IFExportCmdDataObj", "IFExportStlDataObj", "IFImportIgesDataObj", "IFImportDxfDataObj", "IFImportCmdDataObj", "IFImportPatranDataObj", "IFImportStlDataObj", "IFImportDatFileDataObj", "IFImportStepFileDataObj", "IFImportBimFileDataObj", "IFImportInfFileDataObj", "IFImportFiberSimDataObj", "IFPrintResultsWindow", "IFLPIGridWindow", "IFVLOGridWindow", "IFAnalysis", "IFTLOEnvelopeRun", "IFVLOEnvelopeRun", "IFRLOEnvelopeRun", "IFVLORun", "IFRLORun", "IFVLOAnalysis", "IFReciprocalMethodInfAnalysis", "IFDirectMethodInfAnalysisBase", "IFDirectMethodInfAnalysis", "IFRailDMIAnalysis", "IFUserDefinedResult", "IFWoodArmerAttr", "IFResultsTransformationAttr", "IFReinforcementSection", "IFSurfaceReinforcementLayout", "IFSurfaceReinforcement", "IFReinforcementLine", "IFCableShape", "IFStaticMovingLoadAnalysis", "IFPedestrianMovingLoadAnalysis", "IFModeller"),
+}
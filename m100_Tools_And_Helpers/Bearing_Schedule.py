@@ -0,0 +1,141 @@
+# This file extracts the reactions of many supports for many loadsets, as needed for a bearing schedule (#160).
+# For each loadset a single results component set provides every reaction component of every support node, rather
+# than a results component set per component and per max/min. Envelopes and smart combinations need a results
+# component set for each component and max/min, from which the coincident values of the other components are also taken.
+# The reactions are held in a single array from which the schedule of each support and the governing loadset of each
+# extreme, with its coincident reactions, are produced as DataFrames.
+# Reactions are read by Nodal_Results with getContinuousResults, one call per node and component.
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+REACTION_COMPONENTS = ["FX", "FY", "FZ"]
+EXTREMES = ["max", "min"]
+
+@dataclass
+class BearingSchedule:
+    """Reactions of the supports for each loadset"""
+    # Label of each support, e.g. its point ID
+    bearings: list
+    loadset_ids: np.ndarray
+    loadset_names: list[str]
+    components: list[str]
+    # (n_loadsets, n_components, 2, n_bearings, n_components) reactions of each bearing when each component is at its
+    # max and min, i.e. the coincident reactions. These are all the same for loadcases and basic combinations
+    reactions: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """Max and min of each component for each bearing and loadset, as the sheets of #160
+
+        Returns:
+            pd.DataFrame: Indexed by (bearing, loadset ID) with columns (component, "max"/"min")
+        """
+        n_loadsets, n_components, _, n_bearings, _ = self.reactions.shape
+        # The value of each component when it is itself at its max/min: (n_loadsets, n_components, 2, n_bearings)
+        extremes = self.reactions[:, np.arange(n_components), :, :, np.arange(n_components)].transpose(1, 0, 2, 3)
+        values = extremes.transpose(3, 0, 1, 2).reshape(n_bearings * n_loadsets, n_components * 2)
+        index = pd.MultiIndex.from_product([self.bearings, self.loadset_ids], names=["bearing", "loadset"])
+        columns = pd.MultiIndex.from_product([self.components, EXTREMES])
+        return pd.DataFrame(values, index=index, columns=columns)
+
+    def governing(self) -> pd.DataFrame:
+        """Governing loadset of the max and min of each component of each bearing, with the coincident reactions
+
+        Returns:
+            pd.DataFrame: Indexed by (bearing, component, "max"/"min") with the columns "loadset", "loadset name" and each component
+        """
+        n_loadsets, n_components, _, n_bearings, _ = self.reactions.shape
+        j = np.arange(n_components)
+        # (n_loadsets, n_components, 2, n_bearings)
+        extremes = self.reactions[:, j, :, :, j].transpose(1, 0, 2, 3)
+        filled = np.where(np.isnan(extremes), [[-np.inf], [np.inf]], extremes)
+        index = np.stack([np.argmax(filled[:, :, 0], axis=0), np.argmin(filled[:, :, 1], axis=0)], axis=1)  # (n_components, 2, n_bearings)
+        c, e, b = np.meshgrid(j, [0, 1], np.arange(n_bearings), indexing="ij")
+        coincident = self.reactions[index, c, e, b]  # (n_components, 2, n_bearings, n_components)
+
+        frame = pd.DataFrame(coincident.transpose(2, 0, 1, 3).reshape(-1, n_components), columns=self.components,
+                             index=pd.MultiIndex.from_product([self.bearings, self.components, EXTREMES], names=["bearing", "component", "extreme"]))
+        governing = index.transpose(2, 0, 1).reshape(-1)
+        frame.insert(0, "loadset", np.asarray(self.loadset_ids)[governing])
+        frame.insert(1, "loadset name", np.asarray(self.loadset_names, dtype=object)[governing])
+        return frame
+
+    def write_excel(self, filename:str, definitions:pd.DataFrame=None, id_column="ID"):
+        """Write a sheet for each bearing, and a sheet of the governing loadsets with their coincident reactions
+
+        Args:
+            filename (str): Excel file to write
+            definitions (pd.DataFrame): Loadset definitions, e.g. read from the definitions file of #160, joined to each sheet on id_column
+            id_column: Column of definitions containing the loadset IDs
+        """
+        frame = self.to_frame()
+        frame.columns = [f"{component} {extreme}" for component, extreme in frame.columns]
+        with pd.ExcelWriter(filename) as writer:
+            for bearing, sheet in frame.groupby(level="bearing", sort=False):
+                sheet = sheet.droplevel("bearing")
+                if definitions is not None:
+                    sheet = definitions.join(sheet, on=id_column)
+                sheet.to_excel(writer, sheet_name=f"Point{bearing}", index=definitions is None)
+            self.governing().to_excel(writer, sheet_name="Governing")
+
+
+def get_support_nodes(db:'IFDatabase', point_ids:list[int]) -> list['IFNode']:
+    """Node of each support point"""
+    import win32com.client as win32
+    nodes = []
+    for id in point_ids:
+        if not db.exists("Point", id):
+            raise Exception(f"Point {id} is not available in the open model")
+        nodes.append(win32.CastTo(db.getObject("Point", id), "IFPoint").getNodes()[0])
+    return nodes
+
+
+def extract_bearing_schedule(lusas:'IFModeller', nodes:'list[IFNode]', loadset_ids:list[int], components:list[str]=REACTION_COMPONENTS,
+                             bearings:list=None, method:str="continuous") -> BearingSchedule:
+    """Extract the reactions of the support nodes for each loadset, with the coincident reactions of each max and min
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        nodes (list[IFNode]): Support nodes, e.g. from get_support_nodes
+        loadset_ids (list[int]): IDs of the loadsets, loadsets that do not exist are left out
+        components (list[str]): Reaction components
+        bearings (list): Label of each support, e.g. point IDs. Default is the node IDs
+        method (str): "continuous", as Nodal_Results.NodalReader
+
+    Returns:
+        BearingSchedule: Reactions of each bearing
+    """
+    from m100_Tools_And_Helpers import Nodal_Results
+    assert method in Nodal_Results.METHODS, f"Method must be one of {Nodal_Results.METHODS}"
+    db = lusas.database()
+    node_ids = np.array([n.getID() for n in nodes], dtype=np.int64)
+    bearings = list(bearings) if bearings is not None else node_ids.tolist()
+
+    # Results are only calculated at the support nodes
+    context = lusas.newResultsContext(None)
+    objects = context.getCalcResultsSet()
+    for node in nodes:
+        objects.add(node)
+
+    loadsets = [db.getLoadset(int(id)) for id in loadset_ids if db.existsLoadset(int(id))]
+    reader = Nodal_Results.NodalReader(nodes, node_ids, components, method)
+    n_components = len(components)
+    reactions = np.full((len(loadsets), n_components, 2, len(nodes), n_components), np.nan)
+    for l, loadset in enumerate(loadsets):
+        if not loadset.needsPrimaryComponent():
+            context.setActiveLoadset(loadset)
+            reactions[l] = reader.read(db.getResultsComponentSet("Reaction", components[0], "Nodal", context))
+            continue
+        # The max of a min envelope or smart combination is left as nan
+        extreme_loadsets = dict(Nodal_Results.get_extreme_loadsets(loadset))
+        for j, component in enumerate(components):
+            for e, extreme in enumerate(EXTREMES):
+                if extreme not in extreme_loadsets:
+                    continue
+                context.setActiveLoadsetAssocVal("Reaction", component, extreme_loadsets[extreme])
+                reactions[l, j, e] = reader.read(db.getResultsComponentSet("Reaction", component, "Nodal", context))
+
+    return BearingSchedule(bearings, np.array([l.getID() for l in loadsets], dtype=np.int64), [l.getName() for l in loadsets],
+                           list(components), reactions)
+
@@ -0,0 +1,125 @@
+# This file provides a fast detector for coincident (unmerged) nodes, as used by #121 Mesh Cracks
+# Rather than comparing every node with every other node, node coordinates are hashed into a uniform grid
+# of cells the size of the tolerance. Coincident nodes can then only be found in the same or adjacent cells
+# so the number of comparisons grows roughly linearly with the number of nodes.
+# The search itself is pure numpy, the library only needs initialising with LUSAS Modeller to select the results.
+
+import numpy as np
+import pandas as pd
+
+lusas : 'IFModeller' = None
+
+def initialise(modeller:'IFModeller'):
+    global lusas
+    lusas = modeller
+
+
+# Offsets to the cells which must be searched from each cell. Only half of the 26 neighbours are needed
+# since a pair found from cell A to cell B does not need to be found again from cell B to cell A
+_HALF_NEIGHBOURS = np.array([(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)
+                             if (i, j, k) > (0, 0, 0)], dtype=np.int64)
+
+
+def _cell_keys(xyz:np.ndarray, cell_size:float) -> tuple[np.ndarray, np.ndarray]:
+    """Hash coordinates into single integer cell keys
+
+    Args:
+        xyz (np.ndarray): (n, 3) array of coordinates
+        cell_size (float): Size of the grid cells
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The cell key of each coordinate and the key offsets of the half neighbours
+    """
+    cells = np.floor((xyz - xyz.min(axis=0)) / cell_size).astype(np.int64) + 1
+    # Pad the grid by a cell either side so that neighbour offsets never wrap into another row
+    dims = cells.max(axis=0) + 2
+    if np.prod(dims.astype(float)) >= 2**62:
+        raise ValueError("Model extent is too large for the given tolerance, check the tolerance and model units")
+    strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+    return cells @ strides, _HALF_NEIGHBOURS @ strides
+
+
+def find_coincident_nodes(ids:np.ndarray, xyz:np.ndarray, tolerance:float, chunk_size:int=100_000) -> pd.DataFrame:
+    """Find all pairs of nodes which are closer together than the given tolerance
+
+    Args:
+        ids (np.ndarray): (n,) array of node IDs
+        xyz (np.ndarray): (n, 3) array of node coordinates
+        tolerance (float): Distance below which nodes are considered coincident
+        chunk_size (int): Number of nodes processed at a time, this bounds the memory used by the search
+
+    Returns:
+        pd.DataFrame: One row per pair of coincident nodes with columns "Node A", "Node B" and "Distance"
+    """
+    ids = np.asarray(ids)
+    xyz = np.asarray(xyz, dtype=float).reshape(-1, 3)
+    assert len(ids) == len(xyz), "There must be one set of coordinates for each node ID"
+    assert tolerance > 0, "Tolerance must be greater than zero"
+
+    found_a, found_b, found_d = [], [], []
+    if len(ids) > 1:
+        keys, neighbour_offsets = _cell_keys(xyz, tolerance)
+        # Sort the nodes by cell such that all nodes of a cell are contiguous
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        sorted_xyz = xyz[order]
+
+        for start in range(0, len(sorted_keys), chunk_size):
+            i = np.arange(start, min(start + chunk_size, len(sorted_keys)))
+            # Own cell, only nodes after this one to avoid duplicates, then the forward neighbouring cells
+            searches = [(np.searchsorted(sorted_keys, sorted_keys[i], "right"), i + 1)]
+            for offset in neighbour_offsets:
+                target = sorted_keys[i] + offset
+                searches.append((np.searchsorted(sorted_keys, target, "right"), np.searchsorted(sorted_keys, target, "left")))
+
+            for hi, lo in searches:
+                counts = np.maximum(hi - lo, 0)
+                total = counts.sum()
+                if total == 0:
+                    continue
+                # Expand every (node, candidate) combination in this chunk
+                a = np.repeat(i, counts)
+                b = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(total)
+                d = np.sqrt(np.square(sorted_xyz[a] - sorted_xyz[b]).sum(axis=1))
+                close = d < tolerance
+                found_a.append(order[a[close]])
+                found_b.append(order[b[close]])
+                found_d.append(d[close])
+
+    a = np.concatenate(found_a) if found_a else np.empty(0, dtype=np.int64)
+    b = np.concatenate(found_b) if found_b else np.empty(0, dtype=np.int64)
+    d = np.concatenate(found_d) if found_d else np.empty(0, dtype=float)
+    # Report each pair with the lower index first, in the order the nodes were given
+    a, b = np.minimum(a, b), np.maximum(a, b)
+    order = np.lexsort((b, a))
+    return pd.DataFrame({"Node A": ids[a[order]], "Node B": ids[b[order]], "Distance": d[order]})
+
+
+def get_nodes_object_set(pairs:pd.DataFrame) -> 'IFObjectSet':
+    """Create an object set containing all the nodes of the coincident pairs
+
+    Args:
+        pairs (pd.DataFrame): Coincident pairs as returned by find_coincident_nodes
+
+    Returns:
+        IFObjectSet: Object set containing the nodes
+    """
+    obs = lusas.newObjectSet()
+    for id in np.unique(pairs[["Node A", "Node B"]].to_numpy()):
+        obs.add("Node", int(id))
+    return obs
+
+
+def select_coincident_nodes(pairs:pd.DataFrame) -> 'IFObjectSet':
+    """Replace the current selection with the nodes of the coincident pairs such that they are highlighted in Modeller
+
+    Args:
+        pairs (pd.DataFrame): Coincident pairs as returned by find_coincident_nodes
+
+    Returns:
+        IFObjectSet: Object set containing the nodes
+    """
+    obs = get_nodes_object_set(pairs)
+    lusas.selection().remove("all")
+    lusas.selection().add(obs)
+    return obs
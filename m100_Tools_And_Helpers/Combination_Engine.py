@@ -0,0 +1,257 @@
+# This file evaluates basic combinations, smart combinations and envelopes outside of LUSAS Modeller.
+# Results of the basic loadcases are extracted once as numpy arrays, the combination definitions are read from the
+# model (or defined directly) and stored as factor matrices such that all combinations are calculated together
+# with a few matrix operations rather than one loadset at a time.
+#
+# Smart combinations follow the LUSAS definition: the permanent (beneficial) factor is always applied and the
+# variable (adverse - beneficial) factor is only applied where it makes the result more onerous.
+# Where both the max and min versions of an envelope or smart combination are included in a smart combination
+# they are treated as a single entry whose value lies between the two, as in #102 Combination Generator.
+
+import numpy as np
+
+BASIC = "Basic"
+SMART = "Smart"
+ENVELOPE = "Envelope"
+
+
+class CombinationEngine:
+    """Definitions of combinations and envelopes that can be evaluated from basic loadcase results"""
+
+    def __init__(self):
+        # id -> (type, assoc id, entry ids, factors, variable factors)
+        self.definitions : dict[int, tuple] = {}
+        # min id -> max id, for smart combinations and envelopes
+        self.assoc_ids : dict[int, int] = {}
+        self._plan = None
+
+    def add_basic_combination(self, id:int, loadcase_ids:list[int], factors:list[float]) -> 'CombinationEngine':
+        """Add a basic combination
+
+        Args:
+            id (int): Loadset ID of the combination
+            loadcase_ids (list[int]): IDs of the included loadsets
+            factors (list[float]): Factor applied to each loadset
+        """
+        assert len(loadcase_ids) == len(factors), "There must be one factor for each loadcase"
+        self.definitions[id] = (BASIC, None, list(loadcase_ids), np.asarray(factors, dtype=float), np.zeros(len(factors)))
+        self._plan = None
+        return self
+
+    def add_smart_combination(self, id:int, assoc_id:int, loadcase_ids:list[int], permanent_factors:list[float], variable_factors:list[float]) -> 'CombinationEngine':
+        """Add a smart combination, this creates both the max and min results
+
+        Args:
+            id (int): Loadset ID of the max smart combination
+            assoc_id (int): Loadset ID of the associated min smart combination
+            loadcase_ids (list[int]): IDs of the included loadsets
+            permanent_factors (list[float]): Permanent (beneficial) factors
+            variable_factors (list[float]): Variable (adverse - beneficial) factors
+        """
+        assert len(loadcase_ids) == len(permanent_factors) == len(variable_factors), "There must be factors for each loadcase"
+        self.definitions[id] = (SMART, assoc_id, list(loadcase_ids), np.asarray(permanent_factors, dtype=float), np.asarray(variable_factors, dtype=float))
+        self.assoc_ids[assoc_id] = id
+        self._plan = None
+        return self
+
+    def add_envelope(self, id:int, assoc_id:int, loadcase_ids:list[int]) -> 'CombinationEngine':
+        """Add an envelope, this creates both the max and min results
+
+        Args:
+            id (int): Loadset ID of the max envelope
+            assoc_id (int): Loadset ID of the associated min envelope
+            loadcase_ids (list[int]): IDs of the enveloped loadsets
+        """
+        self.definitions[id] = (ENVELOPE, assoc_id, list(loadcase_ids), np.ones(len(loadcase_ids)), np.zeros(len(loadcase_ids)))
+        self.assoc_ids[assoc_id] = id
+        self._plan = None
+        return self
+
+    def get_output_ids(self) -> list[int]:
+        """IDs of all the loadsets calculated by this engine, including the min versions"""
+        ids = []
+        for id, (_, assoc_id, _, _, _) in self.definitions.items():
+            ids.append(id)
+            if assoc_id is not None:
+                ids.append(assoc_id)
+        return ids
+
+    def _owner(self, id:int) -> int:
+        return self.assoc_ids.get(id, id)
+
+    def _compile(self, basic_ids:set[int]) -> list:
+        """Order the definitions into levels in which each definition only depends on earlier levels, and
+        build the factor matrices for each level"""
+        remaining = dict(self.definitions)
+        available = set(basic_ids)
+        plan = []
+        while remaining:
+            level = [id for id, d in remaining.items() if all(e in available for e in d[2])]
+            if not level:
+                missing = {e for d in remaining.values() for e in d[2] if self._owner(e) not in remaining and e not in available}
+                raise ValueError(f"Combinations reference loadsets without results {sorted(missing)}" if missing
+                                 else "Combinations reference each other in a loop")
+            steps = {BASIC: [], SMART: [], ENVELOPE: []}
+            for id in level:
+                steps[remaining[id][0]].append(id)
+
+            if steps[BASIC]:
+                plan.append(self._compile_linear(steps[BASIC]))
+            if steps[SMART]:
+                plan.append(self._compile_linear(steps[SMART]))
+            for id in steps[ENVELOPE]:
+                plan.append((ENVELOPE, id, self.definitions[id][1], self.definitions[id][2]))
+
+            for id in level:
+                available.add(id)
+                if self.definitions[id][1] is not None:
+                    available.add(self.definitions[id][1])
+                del remaining[id]
+        return plan
+
+    def _compile_linear(self, ids:list[int]) -> tuple:
+        """Build the factor matrices for a batch of basic or smart combinations.
+        Each column is a source with an upper and a lower value, for an ordinary loadset these are the same,
+        for a max/min pair of an envelope or smart combination they are the max and min results."""
+        sources : dict[tuple, int] = {}
+        rows = []
+        for id in ids:
+            _, assoc_id, entry_ids, permanent, variable = self.definitions[id]
+            row = {}
+            entries = dict(zip(entry_ids, zip(permanent, variable)))
+            for e, (p, v) in entries.items():
+                owner = self._owner(e)
+                pair = self.definitions[owner][1] if owner in self.definitions else None
+                if pair is not None and owner in entries and pair in entries and entries[owner] == entries[pair]:
+                    if e != owner:
+                        continue # Included with the max version
+                    key = (owner, pair)
+                else:
+                    key = (e, e)
+                col = sources.setdefault(key, len(sources))
+                row[col] = (row[col][0] + p, row[col][1] + v) if col in row else (p, v)
+            rows.append(row)
+
+        # Split factors by the sign of the slopes of the contribution, p below zero and p+v above zero for v > 0.
+        # Where both slopes are positive the max is given by the upper value, where both are negative by the lower.
+        shape = (len(ids), len(sources))
+        m = {k: np.zeros(shape) for k in ["inc_p", "inc_vpos", "inc_vneg", "dec_p", "dec_vpos", "dec_vneg"]}
+        for r, row in enumerate(rows):
+            for col, (p, v) in row.items():
+                if min(p, p + v) >= 0:
+                    prefix = "inc"
+                elif max(p, p + v) <= 0:
+                    prefix = "dec"
+                else:
+                    raise ValueError(f"Combination {ids[r]} has beneficial and adverse factors of opposite sign, this is not supported")
+                m[f"{prefix}_p"][r, col] = p
+                m[f"{prefix}_vpos" if v > 0 else f"{prefix}_vneg"][r, col] = v
+        kind = SMART if self.definitions[ids[0]][0] == SMART else BASIC
+        assoc = [self.definitions[id][1] for id in ids]
+        # Only keep the terms with non zero factors, typically most combinations only have permanent and
+        # positive variable factors in which case two matrix products give the max and two the min
+        max_terms = [(m[k], i) for k, i in [("inc_p", "upper"), ("inc_vpos", "upper_pos"), ("inc_vneg", "upper_neg"),
+                                              ("dec_p", "lower"), ("dec_vpos", "lower_pos"), ("dec_vneg", "lower_neg")] if m[k].any()]
+        min_terms = [(m[k], i) for k, i in [("inc_p", "lower"), ("inc_vpos", "lower_neg"), ("inc_vneg", "lower_pos"),
+                                              ("dec_p", "upper"), ("dec_vpos", "upper_neg"), ("dec_vneg", "upper_pos")] if m[k].any()]
+        return (kind, ids, assoc, list(sources.keys()), max_terms, min_terms if kind == SMART else [])
+
+    def evaluate(self, loadcase_ids:list[int], results:np.ndarray, ids:list[int]=None, chunk_size:int=5_000,
+                 return_governing:bool=False) -> dict[int, np.ndarray] | tuple[dict[int, np.ndarray], dict[int, np.ndarray]]:
+        """Evaluate the combinations and envelopes
+
+        Args:
+            loadcase_ids (list[int]): IDs of the basic loadcases for which results are given
+            results (np.ndarray): Results for each loadcase, shape (n_loadcases, ...) e.g. (n_loadcases, n_locations, n_components)
+            ids (list[int]): IDs of the combinations and envelopes to return (max or min IDs). Default is all of them
+            chunk_size (int): Number of result locations evaluated at a time, this bounds the memory used
+            return_governing (bool): Also return the governing loadset ID of each envelope result
+
+        Returns:
+            dict[int, np.ndarray]: Results of each requested loadset with the same trailing shape as the input results
+            dict[int, np.ndarray]: Governing loadset ID for each requested envelope, if return_governing is True
+        """
+        results = np.asarray(results, dtype=float)
+        assert len(loadcase_ids) == results.shape[0], "There must be results for each loadcase"
+        trailing = results.shape[1:]
+        flat = results.reshape(len(loadcase_ids), -1)
+        if ids is None:
+            ids = self.get_output_ids()
+        if self._plan is None or self._plan[0] != tuple(loadcase_ids):
+            self._plan = (tuple(loadcase_ids), self._compile(set(loadcase_ids)))
+        plan = self._plan[1]
+
+        output = {id: np.empty(flat.shape[1]) for id in ids}
+        governing = {id: np.empty(flat.shape[1], dtype=np.int64) for id in ids if self.definitions.get(self._owner(id), (None,))[0] == ENVELOPE}
+
+        for start in range(0, flat.shape[1], chunk_size):
+            chunk = slice(start, min(start + chunk_size, flat.shape[1]))
+            values = {id: flat[i, chunk] for i, id in enumerate(loadcase_ids)}
+            governed = {}
+            for step in plan:
+                if step[0] == ENVELOPE:
+                    _, id, assoc_id, entries = step
+                    stacked = np.stack([values[e] for e in entries])
+                    i_max, i_min = np.argmax(stacked, axis=0), np.argmin(stacked, axis=0)
+                    columns = np.arange(stacked.shape[1])
+                    values[id], values[assoc_id] = stacked[i_max, columns], stacked[i_min, columns]
+                    governed[id], governed[assoc_id] = np.asarray(entries)[i_max], np.asarray(entries)[i_min]
+                    # An envelope of envelopes is governed by the loadset governing the inner envelope
+                    for k, e in enumerate(entries):
+                        if e in governed:
+                            for i, g in [(i_max, governed[id]), (i_min, governed[assoc_id])]:
+                                g[i == k] = governed[e][i == k]
+                else:
+                    kind, combination_ids, assoc_ids, sources, max_terms, min_terms = step
+                    inputs = {"upper": np.stack([values[hi] for hi, _ in sources])}
+                    inputs["lower"] = np.stack([values[lo] for _, lo in sources]) if any(hi != lo for hi, lo in sources) else inputs["upper"]
+                    for name in ["upper", "lower"]:
+                        inputs[f"{name}_pos"], inputs[f"{name}_neg"] = np.maximum(inputs[name], 0), np.minimum(inputs[name], 0)
+
+                    maximum = sum(matrix @ inputs[i] for matrix, i in max_terms) if max_terms else np.zeros((len(combination_ids), inputs["upper"].shape[1]))
+                    for r, id in enumerate(combination_ids):
+                        values[id] = maximum[r]
+                    if kind == SMART:
+                        minimum = sum(matrix @ inputs[i] for matrix, i in min_terms) if min_terms else np.zeros_like(maximum)
+                        for r, id in enumerate(assoc_ids):
+                            values[id] = minimum[r]
+
+            for id in ids:
+                output[id][chunk] = values[id]
+                if id in governing:
+                    governing[id][chunk] = governed[id]
+
+        output = {id: v.reshape(trailing) for id, v in output.items()}
+        if return_governing:
+            return output, {id: v.reshape(trailing) for id, v in governing.items()}
+        return output
+
+
+def read_from_database(db:'IFDatabase') -> CombinationEngine:
+    """Read the basic combinations, smart combinations and envelopes defined in the model
+
+    Args:
+        db (IFDatabase): Reference to the database
+
+    Returns:
+        CombinationEngine: Engine containing all of the model combinations
+    """
+    import win32com.client as win32
+    engine = CombinationEngine()
+
+    for loadset in db.getLoadsets("Basic Combinations"):
+        combination = win32.CastTo(loadset, "IFBasicCombination")
+        engine.add_basic_combination(combination.getID(), combination.getLoadcaseIDs(), combination.getFactors())
+
+    for loadset in db.getLoadsets("Smart Combinations"):
+        combination = win32.CastTo(loadset, "IFSmartCombination")
+        if combination.isMax():
+            engine.add_smart_combination(combination.getID(), combination.getAssocLoadset().getID(), combination.getLoadcaseIDs(),
+                                         combination.getPermanentFactors(), combination.getVariableFactors())
+
+    for loadset in db.getLoadsets("Envelopes"):
+        envelope = win32.CastTo(loadset, "IFEnvelope")
+        if envelope.isMax():
+            engine.add_envelope(envelope.getID(), envelope.getAssocLoadset().getID(), envelope.getLoadcaseIDs())
+
+    return engine
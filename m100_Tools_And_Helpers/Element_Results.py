@@ -0,0 +1,188 @@
+# This file extracts element results of many elements and components into a single dense numpy array of shape
+# (n_elements, n_points, n_components), with an index of the element IDs of each row.
+# Asking each element for each result point, as in the first examples of #02, takes one call to Modeller per value.
+# Here a results component set is created once per component, in a results context so that the view is unaffected,
+# and all the results of an element are then requested with a single call, i.e. one call per element per component.
+# The calls can optionally be spread over several threads, each with its own connection to the results component
+# sets. Reading the files written by IFResultsComponentSet.dumpToFile is left to Results_Dump, whose layout has not yet
+# been checked against files written by Modeller.
+# Statistics of the most recent extraction, including the number of calls per second, are kept in extraction_statistics.
+# Elements with fewer points than others, e.g. a mixture of beam element types, have their missing points set to nan,
+# as are missing results.
+
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Location type -> (location of the results component set, method returning all results of an element)
+LOCATIONS = {"ElementNodal": ("ElementNodal", "getElementNodalResultsArray"),
+             "Gauss": ("Gauss", "getGaussResultsArray"),
+             "Internal": ("Internal", "getInternalResultsArray"),
+             "Averaged": ("Nodal", "getAveragedResultsArray")}
+
+METHODS = ["array"]
+
+# Statistics of the most recent extraction
+extraction_statistics = {"method": None, "threads": 0, "elements": 0, "components": 0, "com_calls": 0, "seconds": 0.0, "calls_per_second": 0.0}
+
+
+def _get_results_sets(lusas:'IFModeller', loadset:'IFLoadset', entity:str, components:list[str], location:str,
+                      objects:'IFObjectSet') -> tuple[list[tuple['IFResultsComponentSet', int]], int]:
+    # One results component set per component, as envelopes and smart combinations need the context to be set
+    # for each component. Changes to the context do not affect results component sets already created.
+    # Returns the results component sets with their component numbers, and the number of calls made
+    db = lusas.database()
+    context = lusas.newResultsContext(None)
+    context.getCalcResultsSet().add(objects)
+    needs_component = loadset.needsPrimaryComponent()
+    if not needs_component:
+        context.setActiveLoadset(loadset)
+    sets = []
+    for component in components:
+        if needs_component:
+            context.setActiveLoadsetAssocVal(entity, component, loadset)
+        results = db.getResultsComponentSet(entity, component, LOCATIONS[location][0], context)
+        sets.append((results, results.getComponentNumber(component)))
+    return sets, 5 + (len(components) if needs_component else 1) + 2 * len(components)
+
+
+def _fill(values:np.ndarray, row:int, j:int, result) -> np.ndarray:
+    # Copy the results of an element into the output array, which is widened if the element has more points than any so far
+    n = len(result)
+    if n > values.shape[1]:
+        values = np.concatenate([values, np.full((values.shape[0], n - values.shape[1], values.shape[2]), np.nan)], axis=1)
+    values[row, :n, j] = result
+    return values
+
+
+def _pump(sets:list[tuple], method_name:str, elements:list, units) -> np.ndarray:
+    # All results of the given elements, one call per element per component
+    values = np.full((len(elements), 0, len(sets)), np.nan)
+    for j, (results, i_comp) in enumerate(sets):
+        get_array = getattr(results, method_name)
+        for row, element in enumerate(elements):
+            values = _fill(values, row, j, get_array(i_comp, element, units))
+    return values
+
+
+def _marshal(obj):
+    # COM objects can only be used by the thread that obtained them, other threads are given a stream to connect to them
+    import pythoncom
+    return pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, obj._oleobj_)
+
+
+def _unmarshal(stream, class_name:str):
+    import pythoncom
+    import win32com.client as win32
+    return win32.CastTo(win32.Dispatch(pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch)), class_name)
+
+
+def _pump_thread(db_stream, set_streams:list[tuple], method_name:str, ids:np.ndarray, units) -> np.ndarray:
+    import pythoncom
+    pythoncom.CoInitialize()
+    try:
+        db = _unmarshal(db_stream, "IFDatabase")
+        sets = [(_unmarshal(stream, "IFResultsComponentSet"), i_comp) for stream, i_comp in set_streams]
+        # Elements obtained by another thread cannot be used, they are fetched again by ID
+        elements = [db.getObject("Element", int(id)) for id in ids]
+        return _pump(sets, method_name, elements, units)
+    finally:
+        pythoncom.CoUninitialize()
+
+
+def _extract_array(db:'IFDatabase', sets:list[tuple], objects:'IFObjectSet', location:str, n_threads:int, units,
+                   elements:tuple[list, np.ndarray]=None) -> tuple[np.ndarray, np.ndarray, int]:
+    # Results of each element requested with one call per component. Returns the IDs, values and number of calls made
+    if elements is None:
+        elements = objects.getObjects("Element")
+        ids = np.array([e.getID() for e in elements], dtype=np.int64)
+        calls = 1 + len(elements) + len(elements) * len(sets)
+    else:
+        elements, ids = elements
+        calls = len(elements) * len(sets)
+
+    method_name = LOCATIONS[location][1]
+    n_threads = max(1, min(n_threads, len(elements)))
+    if n_threads == 1:
+        return ids, _pump(sets, method_name, elements, units), calls
+
+    is_com = hasattr(db, "_oleobj_")
+    chunks = np.array_split(np.arange(len(elements)), n_threads)
+    with ThreadPoolExecutor(n_threads) as pool:
+        if is_com:
+            # Streams must be created by this thread, one for each thread that connects through them
+            futures = [pool.submit(_pump_thread, _marshal(db), [(_marshal(r), i) for r, i in sets], method_name, ids[chunk], units)
+                       for chunk in chunks]
+        else:
+            futures = [pool.submit(_pump, sets, method_name, [elements[i] for i in chunk], units) for chunk in chunks]
+        parts = [f.result() for f in futures]
+    n_points = max((p.shape[1] for p in parts), default=0)
+    values = np.concatenate([np.pad(p, ((0, 0), (0, n_points - p.shape[1]), (0, 0)), constant_values=np.nan) for p in parts])
+    # Each thread fetches the elements again by ID
+    return ids, values, calls + (len(elements) if is_com else 0)
+
+
+def read_element_results(db:'IFDatabase', sets:list[tuple['IFResultsComponentSet', int]], location:str,
+                         objects:'IFObjectSet', n_threads:int=1, units:'IFUnitSet'=None,
+                         elements:tuple[list, np.ndarray]=None) -> tuple[np.ndarray, np.ndarray]:
+    """Read element results from results component sets already created, e.g. by a caller that reuses a results context
+
+    Args:
+        db (IFDatabase): Reference to the database
+        sets (list[tuple[IFResultsComponentSet, int]]): Results component set and component number of each component
+        location (str): As extract_element_results
+        objects (IFObjectSet): Object set containing the elements, also added to the calculation set of the context
+        n_threads (int): As extract_element_results
+        units (IFUnitSet): As extract_element_results
+        elements (tuple[list, np.ndarray]): Elements of objects and their IDs, if already fetched
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Element IDs, and the (n_elements, n_points, n_components) results padded with nan
+    """
+    from m100_Tools_And_Helpers.Results_Utils import invalid_to_nan
+    ids, values, _ = _extract_array(db, sets, objects, location, n_threads, units, elements)
+    return ids, invalid_to_nan(values)
+
+
+def extract_element_results(lusas:'IFModeller', loadset:'int | IFLoadset', entity:str, components:list[str], location:str,
+                            objects:'IFObjectSet', method:str="array", n_threads:int=1, units:'IFUnitSet'=None) -> tuple[np.ndarray, np.ndarray]:
+    """Extract the results of many components at every results point of the given elements
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadset (int | IFLoadset): Loadset or its ID. Envelopes and smart combinations give the results associated with each component
+        entity (str): Results entity e.g. "Force/Moment - Thick 3D Beam"
+        components (list[str]): Results components e.g. ["Fx", "My"]
+        location (str): "ElementNodal", "Gauss", "Internal" or "Averaged"
+        objects (IFObjectSet): Object set containing the elements, e.g. lusas.newObjectSet().add("Thick 3D Beam")
+        method (str): "array" requests all results of an element with a single call, the only method until the files of
+                      dumpToFile have been checked, see Results_Dump
+        n_threads (int): Number of threads requesting results at the same time. Modeller answers one
+                         request at a time, the benefit depends on how much of the time of each call is spent in python and marshalling
+        units (IFUnitSet): Units of the results. Default is the units of the model
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Element IDs, and the (n_elements, n_points, n_components) results padded with nan
+    """
+    assert location in LOCATIONS, f"Location must be one of {list(LOCATIONS)}"
+    assert method in METHODS, f"Method must be one of {METHODS}"
+    from m100_Tools_And_Helpers.Results_Utils import invalid_to_nan
+    if isinstance(components, str):
+        components = [components]
+    start = time.perf_counter()
+
+    db = lusas.database()
+    calls = 1
+    if isinstance(loadset, (int, np.integer)):
+        loadset = db.getLoadset(int(loadset))
+        calls += 1
+    sets, set_calls = _get_results_sets(lusas, loadset, entity, components, location, objects)
+    ids, values, read_calls = _extract_array(db, sets, objects, location, n_threads, units)
+    calls += set_calls + read_calls
+
+    seconds = time.perf_counter() - start
+    extraction_statistics.update({"method": method, "threads": max(1, min(n_threads, len(ids))), "elements": len(ids),
+                                  "components": len(components), "com_calls": calls, "seconds": seconds,
+                                  "calls_per_second": calls / seconds if seconds > 0 else 0.0})
+    return ids, invalid_to_nan(values)
+
@@ -0,0 +1,247 @@
+# This file runs long extractions of results, such as those of #160, #161 and #123 on large models, as a job of small
+# independent units, each the results of one loadset, entity and chunk of nodes or elements, so that a job that stops
+# part way, because Modeller crashed or a call raised on one loadset, carries on from where it stopped when run again.
+# Each unit is written to a store on disk once it completes, to a temporary file which is then renamed, so a unit is
+# either stored whole or not at all. A rerun skips the units already stored and retries those that failed.
+# The key of a unit includes a hash of everything that determines its results, so a store is never reused for results
+# of different components, objects or transformation, or of another model or a model that has been modified or re-solved.
+# If the connection to Modeller is lost the job stops, rather than recording every remaining unit as failed, and is
+# carried on by running it again once Modeller has been restarted and the model opened.
+# Progress is reported after each unit with an estimate of the time remaining from the measured rate of the units
+# extracted so far in this run.
+# Units are extracted with Results_Query by default. Any other extraction can be run as a job by giving a function of
+# the unit returning a DataFrame.
+
+import os
+import time
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+# HRESULTs of COM errors raised once Modeller has crashed or closed: RPC_E_DISCONNECTED, RPC_S_SERVER_UNAVAILABLE,
+# RPC_S_CALL_FAILED and RPC_S_CALL_FAILED_DNE
+DISCONNECTED_ERRORS = {-2147417848, -2147023174, -2147023170, -2147023169}
+
+@dataclass
+class JobUnit:
+    """Results of one loadset, entity and chunk of nodes or elements"""
+    loadset_id: int
+    entity: str
+    components: list[str]
+    location: str
+    # Position of the chunk and the IDs of its nodes, for "Nodal", or elements
+    chunk: int
+    object_ids: np.ndarray
+    transform: str = None
+    # Identity of the model, from get_model_stamp
+    model: str = ""
+
+    @property
+    def object_type(self) -> str:
+        return "Node" if self.location == "Nodal" else "Element"
+
+    @property
+    def key(self) -> str:
+        sha = hashlib.sha1()
+        sha.update(repr((self.model, self.entity, list(self.components), self.location, self.transform)).encode())
+        sha.update(np.asarray(self.object_ids, dtype=np.int64).tobytes())
+        entity = "".join(c if c.isalnum() else "_" for c in self.entity)
+        return f"{self.loadset_id}_{entity}_{self.location}_{self.chunk:05d}_{sha.hexdigest()[:12]}"
+
+
+@dataclass
+class JobProgress:
+    """State of a job after a unit"""
+    completed: int
+    total: int
+    skipped: int
+    failed: int
+    elapsed: float
+    # Units per second of the units extracted in this run, and the estimated seconds remaining
+    rate: float
+    remaining: float
+
+
+@dataclass
+class JobReport:
+    """Outcome of running a job"""
+    extracted: int
+    skipped: int
+    # Error of each unit that failed, by key
+    failures: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+class JobStore:
+    """Completed units on disk, one pickled DataFrame per unit"""
+
+    def __init__(self, directory:str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key:str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def contains(self, key:str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def save(self, key:str, frame:pd.DataFrame):
+        temp = self._path(key) + ".tmp"
+        frame.to_pickle(temp)
+        # A unit is either stored whole or not at all
+        os.replace(temp, self._path(key))
+        error = os.path.join(self.directory, f"{key}.error.txt")
+        if os.path.exists(error):
+            os.remove(error)
+
+    def load(self, key:str) -> pd.DataFrame:
+        return pd.read_pickle(self._path(key))
+
+    def save_error(self, key:str, error:str):
+        with open(os.path.join(self.directory, f"{key}.error.txt"), "w") as f:
+            f.write(error)
+
+    def delete_all(self):
+        for filename in os.listdir(self.directory):
+            if filename.endswith((".pkl", ".tmp", ".error.txt")):
+                os.remove(os.path.join(self.directory, filename))
+
+
+def get_model_stamp(db:'IFDatabase') -> str:
+    """Identity of the model: its file and the modification times of its analyses, which change whenever it is modified or re-solved"""
+    return repr((db.getDBFilename(), tuple(a.getModificationTime(False) for a in db.getAnalyses())))
+
+
+def _is_disconnected(error:Exception) -> bool:
+    # pywintypes.com_error gives its HRESULT as hresult
+    return getattr(error, "hresult", None) in DISCONNECTED_ERRORS
+
+
+def plan_units(lusas:'IFModeller', loadset_ids:list[int], requests:list[tuple[str, list[str], str]], chunk_size:int=20_000,
+               object_ids:dict[str, np.ndarray]=None, transform:str=None) -> list[JobUnit]:
+    """Split an extraction into units
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadset_ids (list[int]): IDs of the loadsets
+        requests (list[tuple[str, list[str], str]]): Entity, components and location of each set of results, as Results_Diff.extract
+        chunk_size (int): Number of nodes or elements of each unit
+        object_ids (dict[str, np.ndarray]): IDs of the "Node" and "Element" objects to extract, default is all of them
+        transform (str): As Results_Query.query
+
+    Returns:
+        list[JobUnit]: Units in the order of the loadsets
+    """
+    object_ids = dict(object_ids or {})
+    db = lusas.database()
+    model = get_model_stamp(db)
+    for entity, components, location in requests:
+        object_type = "Node" if location == "Nodal" else "Element"
+        if object_type not in object_ids:
+            object_ids[object_type] = np.array([o.getID() for o in db.getObjects(object_type)], dtype=np.int64)
+    units = []
+    for loadset_id in loadset_ids:
+        for entity, components, location in requests:
+            ids = np.sort(np.asarray(object_ids["Node" if location == "Nodal" else "Element"], dtype=np.int64))
+            for chunk, first in enumerate(range(0, len(ids), chunk_size)):
+                units.append(JobUnit(int(loadset_id), entity, list(components), location, chunk, ids[first:first + chunk_size], transform, model))
+    return units
+
+
+def run_units(units:list[JobUnit], extract:Callable[[JobUnit], pd.DataFrame], store:JobStore, retries:int=1,
+              progress:Callable[[JobProgress], None]=None, stop_on_error:bool=False) -> JobReport:
+    """Run the units not already in the store
+
+    Args:
+        units (list[JobUnit]): Units of the job
+        extract (Callable[[JobUnit], pd.DataFrame]): Extracts the results of a unit
+        store (JobStore): Store of the completed units
+        retries (int): Number of times a unit that raises is tried again before it is recorded as failed
+        progress (Callable[[JobProgress], None]): Called after each unit, e.g. print_progress
+        stop_on_error (bool): Raise the error of a failed unit rather than carrying on with the others
+
+    Raises:
+        ConnectionError: If the connection to Modeller is lost, the units already stored are kept for the next run
+
+    Returns:
+        JobReport: Numbers of units extracted and skipped, and the errors of those that failed
+    """
+    start = time.perf_counter()
+    report = JobReport(0, 0)
+    pending = [u for u in units if not store.contains(u.key)]
+    report.skipped = len(units) - len(pending)
+    extracting = 0.0
+    for i, unit in enumerate(pending):
+        unit_start = time.perf_counter()
+        for attempt in range(retries + 1):
+            try:
+                store.save(unit.key, extract(unit))
+                report.extracted += 1
+                break
+            except Exception as e:
+                if _is_disconnected(e):
+                    raise ConnectionError("The connection to Modeller was lost, run the job again once Modeller is restarted") from e
+                if attempt < retries:
+                    continue
+                report.failures[unit.key] = f"{type(e).__name__}: {e}"
+                store.save_error(unit.key, report.failures[unit.key])
+                if stop_on_error:
+                    raise
+        extracting += time.perf_counter() - unit_start
+        if progress is not None:
+            rate = (i + 1) / extracting if extracting > 0 else 0.0
+            progress(JobProgress(report.skipped + i + 1, len(units), report.skipped, len(report.failures), time.perf_counter() - start,
+                                 rate, (len(pending) - i - 1) / rate if rate > 0 else 0.0))
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_progress(state:JobProgress, every:int=None):
+    """Print the progress of a job, by default about 20 times over the job"""
+    every = every or max(1, state.total // 20)
+    if state.completed % every == 0 or state.completed == state.total:
+        minutes, seconds = divmod(int(round(state.remaining)), 60)
+        print(f"{state.completed}/{state.total} units, {state.skipped} already done, {state.failed} failed, "
+              f"{state.rate:.2f} units/s, about {minutes}m {seconds:02d}s remaining")
+
+
+class _ResultsExtractor:
+    """Extracts units with Results_Query, looking up the objects of the model once"""
+
+    def __init__(self, lusas:'IFModeller', method:str="array"):
+        self.lusas = lusas
+        self.method = method
+        self._objects : dict[str, dict[int, object]] = {}
+
+    def __call__(self, unit:JobUnit) -> pd.DataFrame:
+        from m100_Tools_And_Helpers import Results_Query
+        if unit.object_type not in self._objects:
+            self._objects[unit.object_type] = {o.getID(): o for o in self.lusas.database().getObjects(unit.object_type)}
+        lookup = self._objects[unit.object_type]
+        objects = self.lusas.newObjectSet().add([lookup[id] for id in unit.object_ids.tolist()])
+        frame = Results_Query.query(self.lusas, unit.entity, unit.components, [unit.loadset_id], unit.location, objects,
+                                    transform=unit.transform, format="wide", method=self.method)
+        return frame.assign(entity=unit.entity)
+
+
+def extract_results(lusas:'IFModeller', units:list[JobUnit], store:'JobStore | str', retries:int=1, progress:Callable[[JobProgress], None]=print_progress,
+                    method:str="array", stop_on_error:bool=False) -> JobReport:
+    """Extract the results of the units not already in the store with Results_Query, see run_units
+
+    Args:
+        store (JobStore | str): Store, or its directory
+        method (str): As Results_Query.query
+    """
+    store = JobStore(store) if isinstance(store, str) else store
+    return run_units(units, _ResultsExtractor(lusas, method), store, retries, progress, stop_on_error)
+
+
+def collect(store:'JobStore | str', units:list[JobUnit]) -> pd.DataFrame:
+    """Results of all the completed units, in the order of the units, as wide frames of Results_Query with an "entity" column"""
+    store = JobStore(store) if isinstance(store, str) else store
+    frames = [store.load(u.key) for u in units if store.contains(u.key)]
+    return pd.concat(frames) if frames else pd.DataFrame()
+
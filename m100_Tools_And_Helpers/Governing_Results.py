@@ -0,0 +1,205 @@
+# This file finds the N largest and N smallest values of a results component at every node or element results point
+# over many loadsets, and the loadsets giving them, with the coincident values of other components, e.g. the shear
+# with the maximum moment. This replaces extracting the results of every loadset and filtering them with pandas, as #161
+# does, or paging through envelopes in Modeller.
+# The loadsets are read one entry at a time through Results_Query and only the current N best of each row are kept, as
+# (n_rows, N) arrays. A block of loadsets is merged into them at once with np.argpartition, so memory is proportional to
+# N times the number of rows rather than the number of loadsets times the number of rows.
+# For long runs the arrays are saved to a checkpoint file after every block, and a run that was interrupted resumes
+# from the loadsets not yet read.
+
+import os
+import json
+from typing import Callable
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+EXTREMES = ["", "max", "min"]
+
+@dataclass
+class GoverningResults:
+    """N largest and smallest values of a component at each row, a node or element results point"""
+    entity: str
+    component: str
+    coincident: list[str]
+    ids: np.ndarray
+    points: np.ndarray
+    # (n_rows, N) values, largest first for max and smallest first for min, nan where fewer than N entries have results
+    max_values: np.ndarray
+    min_values: np.ndarray
+    # (n_rows, N) loadset ID and position in EXTREMES of the entry giving each value
+    max_loadsets: np.ndarray
+    min_loadsets: np.ndarray
+    max_extremes: np.ndarray
+    min_extremes: np.ndarray
+    # (n_rows, N, n_coincident) values of the coincident components
+    max_coincident: np.ndarray
+    min_coincident: np.ndarray
+
+    def to_frame(self, extreme:str="max", rank:int=None) -> pd.DataFrame:
+        """Values and loadsets of max or min, indexed by (id, point, rank) with rank 0 the governing value, or only the given rank"""
+        values, loadsets, extremes, coincident = (getattr(self, f"{extreme}_{name}") for name in ["values", "loadsets", "extremes", "coincident"])
+        n_rows, n = values.shape
+        ranks = range(n) if rank is None else [rank]
+        frame = pd.DataFrame({"id": np.repeat(self.ids, len(ranks)), "point": np.repeat(self.points, len(ranks)),
+                              "rank": np.tile(list(ranks), n_rows), self.component: values[:, ranks].reshape(-1),
+                              "loadset": loadsets[:, ranks].reshape(-1),
+                              "extreme": np.array(EXTREMES, dtype=object)[extremes[:, ranks].reshape(-1)]})
+        for j, name in enumerate(self.coincident):
+            frame[name] = coincident[:, ranks, j].reshape(-1)
+        return frame[~np.isnan(frame[self.component].to_numpy())].set_index(["id", "point", "rank"])
+
+    def get_governing_loadsets(self) -> pd.DataFrame:
+        """Number of rows at which each loadset gives the max and the min, most frequent first"""
+        counts = [pd.Series(getattr(self, f"{e}_loadsets")[:, 0][~np.isnan(getattr(self, f"{e}_values")[:, 0])]).value_counts().rename(e)
+                  for e in ["max", "min"]]
+        frame = pd.concat(counts, axis=1).fillna(0).astype(np.int64)
+        frame.index.name = "loadset"
+        return frame.sort_values(["max", "min"], ascending=False)
+
+
+class _Heaps:
+    """Fixed size arrays of the N best entries of each row, for either the largest or the smallest values"""
+
+    def __init__(self, n_rows:int, n:int, n_coincident:int, largest:bool):
+        self.largest = largest
+        self.values = np.full((n_rows, n), np.nan)
+        self.loadsets = np.zeros((n_rows, n), dtype=np.int64)
+        self.extremes = np.zeros((n_rows, n), dtype=np.int8)
+        self.coincident = np.full((n_rows, n, n_coincident), np.nan)
+
+    def push(self, values:np.ndarray, loadsets:np.ndarray, extremes:np.ndarray, coincident:np.ndarray):
+        # values (n_rows, n_block), loadsets and extremes (n_block,), coincident (n_rows, n_block, n_coincident)
+        n_rows, n = self.values.shape
+        all_values = np.concatenate([self.values, values], axis=1)
+        all_loadsets = np.concatenate([self.loadsets, np.broadcast_to(loadsets, values.shape)], axis=1)
+        all_extremes = np.concatenate([self.extremes, np.broadcast_to(extremes, values.shape)], axis=1)
+        all_coincident = np.concatenate([self.coincident, coincident], axis=1)
+        # Missing values never displace a value
+        key = np.where(np.isnan(all_values), np.inf, -all_values if self.largest else all_values)
+        keep = np.argpartition(key, n - 1, axis=1)[:, :n] if key.shape[1] > n else np.arange(key.shape[1])[None].repeat(n_rows, 0)
+        order = np.argsort(np.take_along_axis(key, keep, axis=1), axis=1, kind="stable")
+        keep = np.take_along_axis(keep, order, axis=1)
+        self.values = np.take_along_axis(all_values, keep, axis=1)
+        self.loadsets = np.take_along_axis(all_loadsets, keep, axis=1)
+        self.extremes = np.take_along_axis(all_extremes, keep, axis=1)
+        self.coincident = np.take_along_axis(all_coincident, keep[:, :, None], axis=1)
+
+    def grow(self, n_rows:int):
+        # Rows first seen in a later loadset
+        extra = n_rows - len(self.values)
+        if extra > 0:
+            self.values = np.vstack([self.values, np.full((extra, self.values.shape[1]), np.nan)])
+            self.loadsets = np.vstack([self.loadsets, np.zeros((extra, self.loadsets.shape[1]), dtype=np.int64)])
+            self.extremes = np.vstack([self.extremes, np.zeros((extra, self.extremes.shape[1]), dtype=np.int8)])
+            self.coincident = np.concatenate([self.coincident, np.full((extra,) + self.coincident.shape[1:], np.nan)])
+
+
+def _save_checkpoint(filename:str, header:dict, ids:np.ndarray, points:np.ndarray, heaps:dict[str, _Heaps]):
+    arrays = {f"{e}_{name}": getattr(h, name) for e, h in heaps.items() for name in ["values", "loadsets", "extremes", "coincident"]}
+    temp = filename + ".tmp.npz"
+    np.savez(temp, ids=ids, points=points, header=np.array(json.dumps(header)), **arrays)
+    # Replaced in one step, so an interrupted save leaves the previous checkpoint
+    os.replace(temp, filename)
+
+
+def find_governing(lusas:'IFModeller', entity:str, component:str, n:int=5, loadsets:'list[int]'=None, coincident:list[str]=None,
+                   location:str="Nodal", objects:'IFObjectSet'=None, transform:'str | Callable'=None, block:int=20,
+                   checkpoint:str=None, method:str="array", progress:Callable[[int, int], None]=None) -> GoverningResults:
+    """Find the N largest and smallest values of a component at every node or element results point over many loadsets
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        entity (str): Results entity e.g. "Force/Moment - Thick 3D Beam"
+        component (str): Results component e.g. "My"
+        n (int): Number of values kept at each row
+        loadsets (list[int]): IDs of the loadsets, default is every loadset of db.getLoadsets(). Envelopes and smart combinations
+                              give their max and min entries
+        coincident (list[str]): Other components reported with each value
+        location (str): As Results_Query.query
+        objects (IFObjectSet): Nodes or elements, default is all of them
+        transform (str | Callable): As Results_Query.query
+        block (int): Number of loadsets read between merges and checkpoints
+        checkpoint (str): If given, a .npz file saved after each block, and resumed from if it exists for the same search
+        method (str): As Results_Query.query
+        progress (Callable[[int, int], None]): Called with the number of loadsets read and the total after each block
+
+    Returns:
+        GoverningResults: The N largest and smallest values of each row and their loadsets
+    """
+    from m100_Tools_And_Helpers import Results_Query
+    db = lusas.database()
+    coincident = list(coincident or [])
+    components = [component] + [c for c in coincident if c != component]
+    if loadsets is None:
+        loadsets = [l.getID() for l in db.getLoadsets()]
+    loadsets = [int(id) for id in loadsets]
+    header = {"entity": entity, "component": component, "coincident": coincident, "n": n, "location": location, "loadsets": loadsets}
+
+    done, ids, points, heaps = 0, None, None, None
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with np.load(checkpoint) as saved:
+            saved_header = json.loads(str(saved["header"]))
+            if {k: v for k, v in saved_header.items() if k != "done"} == header:
+                done, ids, points = saved_header["done"], saved["ids"], saved["points"]
+                heaps = {}
+                for e in ["max", "min"]:
+                    heaps[e] = _Heaps(0, n, len(coincident), e == "max")
+                    for name in ["values", "loadsets", "extremes", "coincident"]:
+                        setattr(heaps[e], name, saved[f"{e}_{name}"])
+    last_index, rows = None, None
+    positions = {}
+    if ids is not None:
+        positions = {key: i for i, key in enumerate(zip(ids.tolist(), points.tolist()))}
+
+    while done < len(loadsets):
+        chunk = loadsets[done:done + block]
+        block_values, block_loadsets, block_extremes, block_coincident = [], [], [], []
+        for frame in Results_Query.iter_query(lusas, entity, components, chunk, location, objects, transform=transform, format="wide", method=method):
+            if len(frame) == 0:
+                continue
+            loadset_id, extreme = frame.index[0][0], frame.index[0][1]
+            frame = frame.droplevel(["loadset", "extreme"])
+            if ids is None:
+                ids = frame.index.get_level_values(0).to_numpy(np.int64)
+                points = frame.index.get_level_values(1).to_numpy(np.int64)
+                positions = {key: i for i, key in enumerate(zip(ids.tolist(), points.tolist()))}
+                heaps = {e: _Heaps(len(ids), n, len(coincident), e == "max") for e in ["max", "min"]}
+            if last_index is None or not frame.index.equals(last_index):
+                # The rows are usually the same for every entry, and only looked up when they change
+                keys = list(zip(frame.index.get_level_values(0).tolist(), frame.index.get_level_values(1).tolist()))
+                new = [k for k in keys if k not in positions]
+                if new:
+                    for k in new:
+                        positions[k] = len(positions)
+                    ids = np.concatenate([ids, np.array([k[0] for k in new], dtype=np.int64)])
+                    points = np.concatenate([points, np.array([k[1] for k in new], dtype=np.int64)])
+                    # Rows of earlier entries of this block are padded when the block is merged
+                last_index, rows = frame.index, np.array([positions[k] for k in keys], dtype=np.int64)
+            values = np.full((len(ids), len(components)), np.nan)
+            values[rows] = frame[components].to_numpy(dtype=float)
+            block_values.append(values)
+            block_loadsets.append(int(loadset_id))
+            block_extremes.append(EXTREMES.index(extreme))
+
+        if block_values:
+            n_rows = len(ids)
+            stacked = np.stack([np.pad(v, ((0, n_rows - len(v)), (0, 0)), constant_values=np.nan) for v in block_values], axis=1)
+            for e, heap in heaps.items():
+                heap.grow(n_rows)
+                heap.push(stacked[:, :, 0], np.array(block_loadsets), np.array(block_extremes, dtype=np.int8),
+                          stacked[:, :, [components.index(c) for c in coincident]])
+        done += len(chunk)
+        if checkpoint is not None and heaps is not None:
+            _save_checkpoint(checkpoint, dict(header, done=done), ids, points, heaps)
+        if progress is not None:
+            progress(done, len(loadsets))
+
+    if heaps is None:
+        ids, points = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        heaps = {e: _Heaps(0, n, len(coincident), e == "max") for e in ["max", "min"]}
+    return GoverningResults(entity, component, coincident, ids, points,
+                            heaps["max"].values, heaps["min"].values, heaps["max"].loadsets, heaps["min"].loadsets,
+                            heaps["max"].extremes, heaps["min"].extremes, heaps["max"].coincident, heaps["min"].coincident)
+
@@ -5,6 +5,9 @@
 # The library must be initialised with the a reference to LUSAS Modeller before using these functions.
 
 from LPI import *
+import time
+import warnings
+import numpy as np
 
 def initialise(modeller:'IFModeller'):
     global lusas
@@ -580,3 +583,291 @@ def get_line_between_points(p1:IFPoint, p2:IFPoint) -> IFLine: # type: ignore
             line:IFLine = win32.CastTo(hof, "IFLine")
             if line.getStartPoint() == p2 or line.getEndPoint() == p2:
                 return line
+
+
+
+# Structured array type returned by get_node_table
+NODE_TABLE_DTYPE = np.dtype([("id", np.int64), ("x", float), ("y", float), ("z", float)])
+
+# Node coordinates already read from the database, keyed by the database stamp at the time they were read
+_node_table_cache = {"stamp": None, "ids": np.empty(0, dtype=np.int64), "xyz": np.empty((0, 3))}
+
+# Running count of LPI calls made by get_node_table, and of the calls saved compared to getID, getX, getY, getZ per node
+node_table_statistics = {"com_calls": 0, "com_calls_saved": 0}
+
+# HRESULTs of the COM errors raised where getXYZ cannot return its output arguments: DISP_E_MEMBERNOTFOUND,
+# DISP_E_TYPEMISMATCH and DISP_E_BADPARAMCOUNT
+_GET_XYZ_ERRORS = {-2147352573, -2147352571, -2147352562}
+
+def _get_database_stamp(db:'IFDatabase') -> tuple:
+    # There is no single modification counter for the database, the model file, number of nodes and the
+    # modification times of the analyses together change whenever the mesh could have changed
+    return (db.getDBFilename(), db.count("Node"), tuple(a.getModificationTime(False) for a in db.getAnalyses()))
+
+
+def _get_nodes_xyz(nodes:list) -> tuple[np.ndarray, int]:
+    # (n, 3) coordinates and the number of calls made. One getXYZ call per node, the output arguments are returned as a
+    # tuple, or getX, getY and getZ where getXYZ is not available with output arguments
+    try:
+        return np.array([tuple(n.getXYZ(0.0, 0.0, 0.0))[:3] for n in nodes], dtype=float).reshape(-1, 3), len(nodes)
+    except Exception as e:
+        # pywintypes.com_error gives its HRESULT as hresult
+        if not isinstance(e, AttributeError) and getattr(e, "hresult", None) not in _GET_XYZ_ERRORS:
+            raise
+        warnings.warn(f"IFNode.getXYZ could not be used, the coordinates are read with getX, getY and getZ instead. {e}")
+        return np.array([(n.getX(), n.getY(), n.getZ()) for n in nodes], dtype=float).reshape(-1, 3), 3 * len(nodes)
+
+
+def clear_node_table_cache():
+    """Discard all cached node coordinates, for example after modifying the mesh within the same second"""
+    _node_table_cache.update({"stamp": None, "ids": np.empty(0, dtype=np.int64), "xyz": np.empty((0, 3))})
+
+
+def get_node_table(objects:'IFObjectSet | list[IFNode]' = None) -> np.ndarray:
+    """Gets the IDs and coordinates of nodes as a structured numpy array with fields id, x, y, z.
+       Coordinates are read with a single IFNode.getXYZ call per node rather than getX, getY and getZ,
+       and are cached until the database changes, such that repeated calls only need the node IDs.
+       The LPI calls made, and saved compared to getID, getX, getY and getZ per node, are added to node_table_statistics.
+
+    Args:
+        objects (IFObjectSet | list[IFNode]): Nodes, or object set containing nodes. Default is all nodes in the database
+
+    Returns:
+        np.ndarray: Structured array of NODE_TABLE_DTYPE with one row per node
+    """
+    db = lusas.database()
+    stamp = _get_database_stamp(db)
+    calls = 1 + 3 + len(stamp[2])
+    if stamp != _node_table_cache["stamp"]:
+        clear_node_table_cache()
+        _node_table_cache["stamp"] = stamp
+
+    if objects is None:
+        nodes = db.getObjects("Node")
+    elif isinstance(objects, (list, tuple)):
+        nodes = objects
+    else:
+        nodes = objects.getObjects("Node")
+    calls += 0 if isinstance(objects, (list, tuple)) else 1
+
+    ids = np.array([n.getID() for n in nodes], dtype=np.int64)
+    calls += len(nodes)
+
+    # Only read the coordinates of nodes that are not already cached
+    cached_ids, cached_xyz = _node_table_cache["ids"], _node_table_cache["xyz"]
+    missing = ~np.isin(ids, cached_ids)
+    if missing.any():
+        new_xyz, xyz_calls = _get_nodes_xyz([n for n, m in zip(nodes, missing) if m])
+        calls += xyz_calls
+        new_ids, first = np.unique(ids[missing], return_index=True)
+        cached_ids = np.concatenate([cached_ids, new_ids])
+        cached_xyz = np.vstack([cached_xyz, new_xyz[first]])
+        order = np.argsort(cached_ids)
+        _node_table_cache["ids"], _node_table_cache["xyz"] = cached_ids[order], cached_xyz[order]
+        cached_ids, cached_xyz = _node_table_cache["ids"], _node_table_cache["xyz"]
+
+    table = np.empty(len(ids), dtype=NODE_TABLE_DTYPE)
+    table["id"] = ids
+    xyz = cached_xyz[np.searchsorted(cached_ids, ids)] if len(ids) > 0 else np.empty((0, 3))
+    table["x"], table["y"], table["z"] = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+
+    node_table_statistics["com_calls"] += calls
+    node_table_statistics["com_calls_saved"] += 4 * len(ids) - calls
+    return table
+
+
+
+# Sessions entered and not yet closed, the outermost first. Only the outermost session changes the state of Modeller
+_open_fast_sessions : list['FastSession'] = []
+
+# Statistics of each closed session, the most recent last
+fast_session_statistics : list[dict] = []
+
+
+class FastSession:
+    """Disables the user interface of Modeller and groups commands into a command batch, restoring the previous state when closed.
+       Create using fast_session
+    """
+
+    def __init__(self, modeller:'IFModeller', label:str, undoable:bool=True, batch:bool=True, hide:bool=False):
+        self.lusas = modeller
+        self.label = label
+        self.undoable = undoable
+        self.batch = batch
+        self.hide = hide
+        self.statistics = {"label": label, "seconds": None, "com_calls": None}
+        self._restore = []
+        self._start_time = None
+        self._start_calls = None
+
+    def __enter__(self) -> 'FastSession':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_after_error()
+        return False
+
+    def start(self) -> 'FastSession':
+        """Enter the session, for use where a with block cannot be used, e.g. across notebook cells. Must be followed by close()"""
+        assert self._start_time is None, "The session has already been started"
+        self._start_time = time.perf_counter()
+        # Calls can only be counted where the modeller counts its calls, as the stand in for Modeller of the tests does
+        self._start_calls = getattr(self.lusas, "calls", None)
+        outermost = len(_open_fast_sessions) == 0
+        _open_fast_sessions.append(self)
+        if not outermost:
+            return self
+        try:
+            # In v22 and later the user interface can be disabled, earlier versions must be made invisible
+            hide = self.hide
+            if self.lusas.getMajorVersionNumber() >= 22:
+                if self.lusas.isUIEnabled():
+                    self.lusas.enableUI(False)
+                    self._restore.append(lambda: self.lusas.enableUI(True))
+            else:
+                hide = True
+            if hide and self.lusas.isVisible():
+                self.lusas.setVisible(False)
+                self._restore.append(lambda: self.lusas.setVisible(True))
+            if self.batch:
+                db = self.lusas.database()
+                rejected = db.beginCommandBatch(self.label, "undoable" if self.undoable else "not undoable")
+                self._restore.append(db.closeCommandBatch)
+                if rejected:
+                    raise RuntimeError(f"Command batch {self.label} was rejected by Modeller")
+        except BaseException:
+            self._close_after_error()
+            raise
+        return self
+
+    def _close_after_error(self):
+        # The original error is raised rather than any error restoring Modeller, which is printed instead
+        try:
+            self.close()
+        except Exception as e:
+            print(f"Error closing fast session {self.label}: {str(e)}")
+
+    def close(self):
+        """Restore the state of Modeller. Any sessions started within this session and not yet closed are closed first"""
+        if self not in _open_fast_sessions:
+            return
+        while _open_fast_sessions[-1] is not self:
+            _open_fast_sessions[-1].close()
+        _open_fast_sessions.pop()
+        # Restore in the reverse order, continuing if any step fails so that Modeller is never left disabled
+        error = None
+        while self._restore:
+            try:
+                self._restore.pop()()
+            except Exception as e:
+                error = error or e
+        self.statistics["seconds"] = time.perf_counter() - self._start_time
+        if self._start_calls is not None:
+            self.statistics["com_calls"] = self.lusas.calls - self._start_calls
+        fast_session_statistics.append(self.statistics)
+        if error is not None:
+            raise error
+
+
+def fast_session(modeller:'IFModeller', label:str, undoable:bool=True, batch:bool=True, hide:bool=False) -> FastSession:
+    """Context manager for bulk operations. Disables the user interface (v22 and later) or makes Modeller invisible (earlier versions)
+       and groups the commands into a command batch, restoring the previous state at the end of the block even if an error occurs.
+       Sessions may be nested, only the outermost session changes the state of Modeller.
+       The time taken, and the number of calls to Modeller where they are counted, are recorded in the session statistics
+       and appended to fast_session_statistics.
+
+    Example:
+        with Helpers.fast_session(lusas, "Create loadcases") as session:
+            ...
+        print(session.statistics)
+
+    Args:
+        modeller (IFModeller): Reference to LUSAS Modeller
+        label (str): Label of the command batch, shown by Undo
+        undoable (bool): Whether the command batch can be undone
+        batch (bool): Group the commands into a command batch. Not needed when only reading from the model
+        hide (bool): Also make Modeller invisible in v22 and later
+
+    Returns:
+        FastSession: Session, use in a with statement or call start() and close()
+    """
+    return FastSession(modeller, label, undoable, batch, hide)
+
+
+def close_all_fast_sessions():
+    """Close all open sessions, restoring Modeller after an error in a notebook where start() was called without a with block"""
+    if _open_fast_sessions:
+        _open_fast_sessions[0].close()
+
+
+def _get_created_ids(objects:'IFObjectSet', type:str, count:int) -> np.ndarray:
+    # Objects are numbered in the order they are created, sorting the IDs gives the order of the coordinates
+    ids = np.sort(np.array([o.getID() for o in objects.getObjects(type)], dtype=np.int64))
+    assert len(ids) == count, f"Expected {count} new objects of type {type} but {len(ids)} were created, check for repeated or existing geometry"
+    return ids
+
+
+def create_points(xyz:np.ndarray) -> np.ndarray:
+    """Create many points from coordinates with a single createPoint call.
+       Much faster than calling create_point for each point.
+
+    Args:
+        xyz (np.ndarray): (n, 3) array of global X, Y, Z coordinates. The coordinates must be distinct and not coincide with existing points
+
+    Returns:
+        np.ndarray: IDs of the points created, in the order of the coordinates
+    """
+    xyz = np.asarray(xyz, dtype=float).reshape(-1, 3)
+    if len(xyz) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    with fast_session(lusas, "Create points"):
+        db = lusas.database()
+        geom_data = lusas.geometryData().setAllDefaults()
+        geom_data.setLowerOrderGeometryType("coordinates")
+        for x, y, z in xyz.tolist():
+            geom_data.addCoords(x, y, z)
+        objects = db.createPoint(geom_data)
+    return _get_created_ids(objects, "Point", len(xyz))
+
+
+def create_lines(start_xyz:np.ndarray, end_xyz:np.ndarray) -> np.ndarray:
+    """Create many straight lines from their start and end coordinates.
+       Consecutive lines where each starts at the end of the previous line are created together by a single createLine call,
+       so ordering the lines along each member (e.g. each girder of a grillage) minimises the number of calls to Modeller.
+
+    Args:
+        start_xyz (np.ndarray): (n, 3) array of global X, Y, Z coordinates of the start of each line
+        end_xyz (np.ndarray): (n, 3) array of global X, Y, Z coordinates of the end of each line
+
+    Returns:
+        np.ndarray: IDs of the lines created, in the order of the coordinates
+    """
+    start_xyz = np.asarray(start_xyz, dtype=float).reshape(-1, 3)
+    end_xyz = np.asarray(end_xyz, dtype=float).reshape(-1, 3)
+    assert start_xyz.shape == end_xyz.shape, "There must be an end coordinate for each start coordinate"
+    if len(start_xyz) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Split the lines into runs of connected lines, a new run starts wherever a line does not start at the end of the previous line
+    continues = np.zeros(len(start_xyz), dtype=bool)
+    continues[1:] = (start_xyz[1:] == end_xyz[:-1]).all(axis=1)
+    run_starts = np.flatnonzero(~continues)
+    run_ends = np.append(run_starts[1:], len(start_xyz))
+
+    ids = []
+    with fast_session(lusas, "Create lines"):
+        db = lusas.database()
+        geom_data = lusas.geometryData().setAllDefaults()
+        geom_data.setLowerOrderGeometryType("coordinates")
+        geom_data.setCreateMethod("straight")
+        for i, (first, last) in enumerate(zip(run_starts, run_ends)):
+            if i > 0:
+                geom_data.removeAllCoords()
+            for x, y, z in [start_xyz[first].tolist()] + end_xyz[first:last].tolist():
+                geom_data.addCoords(x, y, z)
+            ids.append(_get_created_ids(db.createLine(geom_data), "Line", last - first))
+    return np.concatenate(ids)
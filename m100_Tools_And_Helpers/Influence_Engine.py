@@ -0,0 +1,270 @@
+# This file finds the worst positions of vehicles on influence lines and surfaces with numpy alone, so that new vehicles
+# and lane arrangements do not need a moving load analysis or influence envelope to be solved again in Modeller.
+# Influence ordinates are read once, e.g. the results of the loadsets of a direct method influence analysis (#410) at
+# the nodes of the deck, and resampled onto a regular grid.
+# A vehicle is a set of wheel loads at offsets from its front axle. At grid positions each wheel load is shared between
+# the neighbouring grid points by linear (bilinear for surfaces) interpolation, which gives a small set of shifted
+# weights, and the effects of all positions of the vehicle are then the sum of the shifted ordinates times the weights,
+# computed for every position and every influence at once. This is exactly the influence ordinates linearly interpolated
+# at each wheel, as reference_line_effects computes position by position, which can be used to check results on small cases.
+# Vehicles are defined as in #100 User Vehicle Library.
+
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+@dataclass
+class Vehicle:
+    """Axle loads of a vehicle, as #100. Offsets are from the front axle, negative behind it"""
+    name: str
+    axle_offsets: np.ndarray
+    axle_loads: np.ndarray
+    # Distance between the wheels of each axle, 0 for a single wheel on the centreline
+    axle_widths: np.ndarray
+
+    def get_wheels(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Longitudinal and transverse offset and load of each wheel, half the axle load each side of the centreline"""
+        x, y, load = [], [], []
+        for offset, axle_load, width in zip(self.axle_offsets, self.axle_loads, self.axle_widths):
+            if width == 0:
+                x.append(offset)
+                y.append(0.0)
+                load.append(axle_load)
+            else:
+                x += [offset, offset]
+                y += [width / 2, -width / 2]
+                load += [axle_load / 2, axle_load / 2]
+        return np.array(x, dtype=float), np.array(y, dtype=float), np.array(load, dtype=float)
+
+    def reversed(self) -> 'Vehicle':
+        """The vehicle travelling in the opposite direction"""
+        return Vehicle(f"{self.name} reversed", -np.asarray(self.axle_offsets), self.axle_loads, self.axle_widths)
+
+
+def parse_vehicle(name:str, spacings:str, loads:str, widths:str, scale:float=1.0) -> Vehicle:
+    """Vehicle from the "|" separated spacings, loads and widths of a row of User Vehicles.xlsx, as #100
+
+    Args:
+        scale (float): Factor applied to the loads, e.g. for the conversion to model units
+    """
+    spacings, loads, widths = [np.array(str(v).split("|"), dtype=float) for v in (spacings, loads, widths)]
+    assert len(spacings) == len(loads) == len(widths), f"The number of values in {name} is inconsistent"
+    # Each axle is at the given spacing behind the previous one
+    return Vehicle(name, -np.cumsum(spacings), np.abs(loads) * scale, widths)
+
+
+def read_vehicles(filename:str, sheet_name:str="Vehicles") -> list[Vehicle]:
+    """Vehicles of a spreadsheet in the format of #100. Values are in the units given for each vehicle"""
+    frame = pd.read_excel(filename, sheet_name=sheet_name, usecols=range(0, 5))
+    return [parse_vehicle(row.Name, row.Spacings, row.Loads, row.Widths) for row in frame.itertuples()]
+
+
+@dataclass
+class InfluenceLine:
+    """Influence ordinates of one or more effects on a regular grid along a lane"""
+    x0: float
+    dx: float
+    # (n_influences, n_x) ordinates
+    ordinates: np.ndarray
+    names: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_points(cls, x:np.ndarray, values:np.ndarray, dx:float, names:list[str]=None) -> 'InfluenceLine':
+        """Resample ordinates at increasing distances x, (n_x,) or (n_influences, n_x), onto a grid of spacing dx"""
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        grid = np.arange(x[0], x[-1] + dx / 2, dx)
+        ordinates = np.array([np.interp(grid, x, v) for v in values])
+        return cls(float(x[0]), dx, ordinates, names or [f"Influence {i + 1}" for i in range(len(values))])
+
+
+@dataclass
+class InfluenceSurface:
+    """Influence ordinates of one or more effects on a regular grid over a deck"""
+    x0: float
+    y0: float
+    dx: float
+    dy: float
+    # (n_influences, n_x, n_y) ordinates
+    ordinates: np.ndarray
+    names: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_points(cls, xy:np.ndarray, values:np.ndarray, dx:float, dy:float, names:list[str]=None) -> 'InfluenceSurface':
+        """Resample ordinates at the nodes of a rectilinear grid, e.g. a regular deck mesh, onto a grid of spacing dx, dy
+
+        Args:
+            xy (np.ndarray): (n_points, 2) coordinates of the ordinates, on lines of constant x and y
+            values (np.ndarray): (n_points,) or (n_influences, n_points) ordinates
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        xs, ix = np.unique(np.round(xy[:, 0], 9), return_inverse=True)
+        ys, iy = np.unique(np.round(xy[:, 1], 9), return_inverse=True)
+        assert len(xs) * len(ys) == len(xy), "The points must be the nodes of a rectilinear grid"
+        table = np.full((len(values), len(xs), len(ys)), np.nan)
+        table[:, ix, iy] = values
+        grid_x = np.arange(xs[0], xs[-1] + dx / 2, dx)
+        grid_y = np.arange(ys[0], ys[-1] + dy / 2, dy)
+        # Linear in x along each line of the mesh, then linear in y
+        along = np.array([[np.interp(grid_x, xs, t[:, j]) for j in range(len(ys))] for t in table])
+        ordinates = np.array([[np.interp(grid_y, ys, a[:, i]) for i in range(len(grid_x))] for a in along])
+        return cls(float(xs[0]), float(ys[0]), dx, dy, ordinates, names or [f"Influence {i + 1}" for i in range(len(values))])
+
+
+def _get_taps(offsets:np.ndarray, loads:np.ndarray, d:float) -> tuple[np.ndarray, np.ndarray]:
+    # Shifts in grid points, and weights, equivalent to the loads at the offsets with linear interpolation between grid points
+    position = np.asarray(offsets, dtype=float) / d
+    # Rounding first keeps offsets at grid points from splitting over two points
+    base = np.floor(np.round(position, 9)).astype(np.int64)
+    fraction = np.clip(position - base, 0.0, 1.0)
+    shifts = np.concatenate([base, base + 1])
+    weights = np.concatenate([loads * (1 - fraction), loads * fraction])
+    unique, inverse = np.unique(shifts, return_inverse=True)
+    summed = np.zeros(len(unique))
+    np.add.at(summed, inverse, weights)
+    keep = summed != 0
+    return unique[keep], summed[keep]
+
+
+def line_effects(influence:InfluenceLine, vehicle:Vehicle) -> tuple[np.ndarray, np.ndarray]:
+    """Effects of a vehicle at every grid position of its front axle at which any axle is on the influence line
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Positions of the front axle, and the (n_influences, n_positions) effects
+    """
+    x, _, load = vehicle.get_wheels()
+    shifts, weights = _get_taps(x, load, influence.dx)
+    n_influences, n_x = influence.ordinates.shape
+    lo, hi = int(shifts.min()), int(shifts.max())
+    pad = hi - lo
+    ordinates = np.pad(influence.ordinates, ((0, 0), (pad, pad)))
+    # Front axle at grid index i for i in [-hi, n_x - 1 - lo]
+    first, n_positions = -hi, n_x + hi - lo
+    effects = np.zeros((n_influences, n_positions))
+    for shift, weight in zip(shifts, weights):
+        start = first + shift + pad
+        effects += weight * ordinates[:, start:start + n_positions]
+    return influence.x0 + influence.dx * np.arange(first, first + n_positions), effects
+
+
+def reference_line_effects(influence:InfluenceLine, vehicle:Vehicle, positions:np.ndarray) -> np.ndarray:
+    """Effects of a vehicle at the given front axle positions, one position at a time, for checking line_effects"""
+    x, _, load = vehicle.get_wheels()
+    grid = influence.x0 + influence.dx * np.arange(influence.ordinates.shape[1])
+    effects = np.zeros((len(influence.ordinates), len(positions)))
+    for p, position in enumerate(positions):
+        for i, ordinates in enumerate(influence.ordinates):
+            effects[i, p] = sum(l * np.interp(position + o, grid, ordinates, left=0.0, right=0.0) for o, l in zip(x, load))
+    return effects
+
+
+def surface_effects(surface:InfluenceSurface, vehicle:Vehicle, y_range:tuple[float, float]=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Effects of a vehicle travelling along x at every grid position of its front axle centre
+
+    Args:
+        surface (InfluenceSurface): Influence surfaces
+        vehicle (Vehicle): The vehicle
+        y_range (tuple[float, float]): Transverse positions of the centreline of the vehicle, e.g. the limits of a lane.
+                                       Default is every position with all the wheels on the surface
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Longitudinal and transverse positions, and (n_influences, n_x, n_y) effects
+    """
+    x, y, load = vehicle.get_wheels()
+    n_influences, n_x, n_y = surface.ordinates.shape
+    # Bilinear interpolation, the taps in x for each wheel at each of its taps in y
+    y_position = y / surface.dy
+    y_base = np.floor(np.round(y_position, 9)).astype(np.int64)
+    y_fraction = np.clip(y_position - y_base, 0.0, 1.0)
+    taps = {}
+    for sy, fraction in [(y_base, 1 - y_fraction), (y_base + 1, y_fraction)]:
+        for wheel in range(len(x)):
+            if fraction[wheel] == 0:
+                continue
+            shifts, weights = _get_taps(x[wheel:wheel + 1], load[wheel:wheel + 1] * fraction[wheel], surface.dx)
+            for sx, w in zip(shifts, weights):
+                taps[(int(sx), int(sy[wheel]))] = taps.get((int(sx), int(sy[wheel])), 0.0) + w
+
+    sx_all, sy_all = np.array(list(taps)).T
+    lo_x, hi_x, lo_y, hi_y = int(sx_all.min()), int(sx_all.max()), int(sy_all.min()), int(sy_all.max())
+    pad_x, pad_y = hi_x - lo_x, hi_y - lo_y
+    ordinates = np.pad(surface.ordinates, ((0, 0), (pad_x, pad_x), (pad_y, pad_y)))
+    first_x, n_px = -hi_x, n_x + hi_x - lo_x
+    y_grid = surface.y0 + surface.dy * np.arange(n_y)
+    if y_range is None:
+        # All wheels on the surface
+        j = np.arange(-lo_y, n_y - hi_y)
+    else:
+        j = np.flatnonzero((y_grid >= y_range[0] - 1e-9) & (y_grid <= y_range[1] + 1e-9))
+    effects = np.zeros((n_influences, n_px, len(j)))
+    for (sx, sy), w in taps.items():
+        start = first_x + sx + pad_x
+        effects += w * ordinates[:, start:start + n_px, j + sy + pad_y]
+    return surface.x0 + surface.dx * np.arange(first_x, first_x + n_px), y_grid[j], effects
+
+
+def udl_effects(influence:InfluenceLine, load_per_length:float) -> tuple[np.ndarray, np.ndarray]:
+    """Most adverse effects of a uniformly distributed lane load applied only where it adds to the effect
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Maximum and minimum effect of each influence line
+    """
+    def area(o:np.ndarray) -> np.ndarray:
+        # Trapezoidal rule over the grid
+        return influence.dx * (o.sum(axis=1) - (o[:, 0] + o[:, -1]) / 2)
+    return load_per_length * area(np.maximum(influence.ordinates, 0)), load_per_length * area(np.minimum(influence.ordinates, 0))
+
+
+def find_worst(influence:'InfluenceLine | InfluenceSurface', vehicles:list[Vehicle], both_directions:bool=True,
+               y_range:tuple[float, float]=None) -> pd.DataFrame:
+    """Worst positions of each vehicle on each influence line or surface
+
+    Args:
+        influence (InfluenceLine | InfluenceSurface): Influence lines or surfaces
+        vehicles (list[Vehicle]): Vehicles
+        both_directions (bool): Also consider each vehicle travelling in the opposite direction
+        y_range (tuple[float, float]): Transverse positions of the vehicle on influence surfaces, see surface_effects
+
+    Returns:
+        pd.DataFrame: Max and min effect and the position of the front axle of each, indexed by (influence, vehicle)
+    """
+    rows = []
+    for vehicle in vehicles:
+        for v in [vehicle, vehicle.reversed()] if both_directions else [vehicle]:
+            if isinstance(influence, InfluenceSurface):
+                xs, ys, effects = surface_effects(influence, v, y_range)
+                flat = effects.reshape(len(effects), -1)
+                positions = np.column_stack([np.repeat(xs, len(ys)), np.tile(ys, len(xs))])
+            else:
+                xs, flat = line_effects(influence, v)
+                positions = np.column_stack([xs, np.zeros(len(xs))])
+            i_max, i_min = flat.argmax(axis=1), flat.argmin(axis=1)
+            for i, name in enumerate(influence.names):
+                rows.append({"influence": name, "vehicle": v.name, "max": flat[i, i_max[i]], "x max": positions[i_max[i], 0],
+                             "y max": positions[i_max[i], 1], "min": flat[i, i_min[i]], "x min": positions[i_min[i], 0],
+                             "y min": positions[i_min[i], 1]})
+    frame = pd.DataFrame(rows).set_index(["influence", "vehicle"])
+    if isinstance(influence, InfluenceLine):
+        frame = frame.drop(columns=["y max", "y min"])
+    return frame
+
+
+def get_envelope(worst:pd.DataFrame) -> pd.DataFrame:
+    """Max and min of each influence over all the vehicles, to compare with an influence envelope of Modeller"""
+    return worst.groupby(level="influence").agg({"max": "max", "min": "min"})
+
+
+def read_influence_surfaces(lusas:'IFModeller', loadset_ids:list[int], entity:str, component:str, dx:float, dy:float,
+                            objects:'IFObjectSet'=None) -> InfluenceSurface:
+    """Influence surfaces from nodal results of Modeller, one loadset per influence, e.g. those of a direct method
+       influence analysis. The nodes, default all, must form a rectilinear grid in plan
+    """
+    from m100_Tools_And_Helpers import Results_Query, Helpers
+    Helpers.initialise(lusas)
+    frame = Results_Query.query(lusas, entity, component, loadset_ids, "Nodal", objects, format="wide")
+    table = frame[component].unstack(level=["loadset", "extreme", "point"])
+    nodes = Helpers.get_node_table(objects)
+    nodes = nodes[np.isin(nodes["id"], table.index.to_numpy())]
+    table = table.reindex(nodes["id"])
+    names = [f"{loadset} {extreme}".strip() for loadset, extreme, _ in table.columns]
+    return InfluenceSurface.from_points(np.column_stack([nodes["x"], nodes["y"]]), table.to_numpy().T, dx, dy, names)
+
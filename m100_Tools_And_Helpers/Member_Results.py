@@ -0,0 +1,174 @@
+# This file extracts the resultant forces of beam/shell slices (IFBeamShellSlice), e.g. the girders of #161, for many
+# slices and loadsets into a single array of shape (slice, loadset, location, component).
+# Results are taken from a results context rather than the view, so the view is unaffected. All the slices are added to
+# the context such that Modeller calculates them together for each loadset.
+# Envelopes and smart combinations are resolved into their max and their associated min loadset, each being an entry
+# of the loadset axis, and each component is taken with the loadset set for that component.
+# For decks with many girders the slices can be shared between several worker processes, each with its own instance
+# of Modeller, using Parametric_Study.run_study.
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+SLICE_ENTITY = "Beam/Shell Slice Resultants"
+
+# Components of each location returned by getAllResults, followed by the distance along the slice
+SLICE_COMPONENTS = ["Fx", "Fy", "Fz", "Mx", "My", "Mz"]
+
+@dataclass
+class SliceResults:
+    """Resultants of beam/shell slices"""
+    slices: list[str]
+    # ID, name and "max", "min" or "" of each entry of the loadset axis
+    loadset_ids: np.ndarray
+    loadset_names: list[str]
+    extremes: list[str]
+    # (n_slices, n_locations) distance of each location along its slice, padded with nan
+    positions: np.ndarray
+    # (n_slices, n_loadsets, n_locations, n_components) padded with nan
+    values: np.ndarray
+
+    def get_labels(self) -> list[str]:
+        """Label of each entry of the loadset axis, as the columns of #161"""
+        return [f"{name} {extreme}" if extreme else name for name, extreme in zip(self.loadset_names, self.extremes)]
+
+    def to_frame(self, slice_name:str, component:str) -> pd.DataFrame:
+        """Results of one slice and component with a column per loadset, as the sheets of #161"""
+        i, j = self.slices.index(slice_name), SLICE_COMPONENTS.index(component)
+        n = int(np.sum(~np.isnan(self.positions[i])))
+        frame = pd.DataFrame(self.values[i, :, :n, j].T, columns=self.get_labels())
+        frame.insert(0, "Position", self.positions[i, :n])
+        return frame
+
+    def get_totals(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sum of the max and min entries of the loadset axis, as the totals of #161. Loadsets without max and min count in both
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (n_slices, n_locations, n_components) totals max and min
+        """
+        extremes = np.array(self.extremes)
+        totals_max = np.nansum(self.values[:, extremes != "min"], axis=1)
+        totals_min = np.nansum(self.values[:, extremes != "max"], axis=1)
+        return totals_max, totals_min
+
+
+def _cast(obj, class_name:str):
+    # Objects that are not COM objects, e.g. stand ins for Modeller, are used as they are
+    if not hasattr(obj, "_oleobj_"):
+        return obj
+    import win32com.client as win32
+    return win32.CastTo(obj, class_name)
+
+
+def _get_loadset_pairs(db:'IFDatabase', loadset_ids:list[int]) -> list[tuple['IFLoadset', str]]:
+    # Loadsets and their max/min, the max of an envelope or smart combination also gives its associated loadset as min
+    from m100_Tools_And_Helpers.Nodal_Results import get_extreme_loadsets
+    pairs = []
+    for id in loadset_ids:
+        if not db.existsLoadset(int(id)):
+            continue
+        loadset = db.getLoadset(int(id))
+        if not loadset.needsPrimaryComponent():
+            pairs.append((loadset, ""))
+            continue
+        pairs.extend((target, extreme) for extreme, target in get_extreme_loadsets(loadset))
+    return pairs
+
+
+def _to_array(results) -> np.ndarray:
+    # getAllResults returns n sets of 7 values, Fx, Fy, Fz, Mx, My, Mz and distance
+    return np.array(results, dtype=float).reshape(-1, len(SLICE_COMPONENTS) + 1)
+
+
+def extract_slice_results(lusas:'IFModeller', slice_names:list[str], loadset_ids:list[int], option:str="abs", units:'IFUnitSet'=None) -> SliceResults:
+    """Extract the resultants of many beam/shell slices for many loadsets, without changing the view
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        slice_names (list[str]): Names of the "Beam/Shell Slicing" objects
+        loadset_ids (list[int]): IDs of the loadsets, loadsets that do not exist are left out
+        option (str): Result where more than one slice exists at a location, "error", "max", "min" or "abs"
+        units (IFUnitSet): Units of the results. Default is the units of the model
+
+    Returns:
+        SliceResults: (slice, loadset, location, component) results, with a max and min entry for envelopes and smart combinations
+    """
+    db = lusas.database()
+    slices = [_cast(db.getObject("Beam/Shell Slicing", name), "IFBeamShellSlice") for name in slice_names]
+    context = lusas.newResultsContext(None)
+    objects = context.getCalcResultsSet()
+    for slice in slices:
+        objects.add(slice)
+
+    pairs = _get_loadset_pairs(db, loadset_ids)
+    n_components = len(SLICE_COMPONENTS)
+    parts = [[None] * len(pairs) for _ in slices]
+    for l, (loadset, _) in enumerate(pairs):
+        if not loadset.needsPrimaryComponent():
+            context.setActiveLoadset(loadset)
+            for i, slice in enumerate(slices):
+                parts[i][l] = _to_array(slice.getAllResults(option, context, units))
+            continue
+        # Each component with the loadset giving the max/min of that component
+        for j, component in enumerate(SLICE_COMPONENTS):
+            context.setActiveLoadsetAssocVal(SLICE_ENTITY, component, loadset)
+            for i, slice in enumerate(slices):
+                results = _to_array(slice.getAllResults(option, context, units))
+                if parts[i][l] is None:
+                    parts[i][l] = results.copy()
+                parts[i][l][:, j] = results[:, j]
+
+    n_locations = max((len(p) for row in parts for p in row), default=0)
+    values = np.full((len(slices), len(pairs), n_locations, n_components), np.nan)
+    positions = np.full((len(slices), n_locations), np.nan)
+    for i, row in enumerate(parts):
+        for l, p in enumerate(row):
+            values[i, l, :len(p)] = p[:, :n_components]
+            positions[i, :len(p)] = p[:, n_components]
+    return SliceResults(list(slice_names), np.array([l.getID() for l, _ in pairs], dtype=np.int64), [l.getName() for l, _ in pairs],
+                        [extreme for _, extreme in pairs], positions, values)
+
+
+def slice_worker(lusas:'IFModeller', parameters:dict) -> dict:
+    """Worker of Parametric_Study.run_study, opening the model read only if necessary and extracting a share of the slices"""
+    db = lusas.database() if lusas.existsDatabase() else None
+    if db is None or db.getDBFilename() != parameters["model"]:
+        lusas.openProject(parameters["model"], True)
+    results = extract_slice_results(lusas, list(parameters["slices"]), list(parameters["loadsets"]), parameters["option"])
+    return {"results": results}
+
+
+def extract_slice_results_parallel(model_file:str, slice_names:list[str], loadset_ids:list[int], n_workers:int=None,
+                                   option:str="abs", modeller_factory=None) -> SliceResults:
+    """Extract slice results with the slices shared between several worker processes, each with its own instance of Modeller
+
+    Args:
+        model_file (str): Saved model with results, opened read only by each worker
+        slice_names (list[str]): Names of the "Beam/Shell Slicing" objects
+        loadset_ids (list[int]): IDs of the loadsets
+        n_workers (int): Number of worker processes, limited by the LUSAS licences available. Default is the number of cores
+        option (str): Result where more than one slice exists at a location, "error", "max", "min" or "abs"
+        modeller_factory (Callable): Function starting Modeller in each worker, default is Parametric_Study.new_modeller
+
+    Returns:
+        SliceResults: As extract_slice_results
+    """
+    import os
+    from m100_Tools_And_Helpers import Parametric_Study
+    n_workers = min(n_workers or os.cpu_count(), len(slice_names))
+    chunks = [tuple(c) for c in np.array_split(np.array(slice_names, dtype=object), n_workers) if len(c) > 0]
+    parameter_sets = [{"model": model_file, "slices": c, "loadsets": tuple(loadset_ids), "option": option} for c in chunks]
+    factory = modeller_factory if modeller_factory is not None else Parametric_Study.new_modeller
+    table = Parametric_Study.run_study(slice_worker, parameter_sets, n_workers=n_workers, modeller_factory=factory)
+    failed = table[table["error"].notna()]
+    if len(failed) > 0:
+        raise RuntimeError(f"Slices {list(failed['slices'])} failed: {list(failed['error'])}")
+
+    parts : list[SliceResults] = list(table["results"])
+    n_locations = max(p.values.shape[2] for p in parts)
+    pad = lambda a, axis: np.pad(a, [(0, n_locations - a.shape[axis]) if k == axis else (0, 0) for k in range(a.ndim)], constant_values=np.nan)
+    first = parts[0]
+    return SliceResults([name for p in parts for name in p.slices], first.loadset_ids, first.loadset_names, first.extremes,
+                        np.concatenate([pad(p.positions, 1) for p in parts]), np.concatenate([pad(p.values, 2) for p in parts]))
+
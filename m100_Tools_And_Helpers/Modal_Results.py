@@ -0,0 +1,187 @@
+# This file reads the results of an eigenvalue frequency analysis, as in #210, into arrays: the frequency and mass
+# participation of each mode and every mode shape as a (n_modes, n_nodes, 6) array, in one pass over the modes.
+# The mode shapes are read through Results_Query, one results component set per mode, rather than one getResults call
+# per node, component and mode.
+# Response spectrum results can then be combined without Modeller, and without solving again, for any number of spectra.
+# The peak response of each mode is its participation factor times its mode shape times the spectral displacement
+# Sa / w^2 at its period, and the peak responses are combined by SRSS or CQC. All spectra are combined at once.
+# The participation factors of mass normalised modes are taken as the square root of the participating mass. LUSAS only
+# gives the participating mass, so their signs are not known. SRSS does not depend on the signs, CQC does, so CQC needs
+# the factors with their signs to be given.
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+MODE_COMPONENTS = ["DX", "DY", "DZ", "THX", "THY", "THZ"]
+
+DIRECTIONS = ["X", "Y", "Z"]
+
+RULES = ["SRSS", "CQC"]
+
+@dataclass
+class ModalResults:
+    """Modes of an eigenvalue loadcase"""
+    loadcase_id: int
+    # Eigenvalue ID of each mode
+    modes: np.ndarray
+    eigenvalues: np.ndarray
+    # Natural frequencies in Hz
+    frequencies: np.ndarray
+    # (n_modes, 3) participating mass in X, Y and Z, as given by LUSAS
+    participation: np.ndarray
+    total_mass: float
+    node_ids: np.ndarray
+    # (n_modes, n_nodes, 6) mode shapes, nan where a component is not available
+    shapes: np.ndarray
+
+    @property
+    def periods(self) -> np.ndarray:
+        return 1.0 / self.frequencies
+
+    @property
+    def circular_frequencies(self) -> np.ndarray:
+        return 2.0 * np.pi * self.frequencies
+
+    def to_frame(self) -> pd.DataFrame:
+        """Frequency, period and mass participation of each mode, with the cumulative participation as #210"""
+        frame = pd.DataFrame({"Mode": self.modes, "Eigenvalue": self.eigenvalues, "Frequency": self.frequencies, "Period": self.periods})
+        for i, direction in enumerate(DIRECTIONS):
+            frame[f"Mass {direction}"] = self.participation[:, i]
+            frame[f"Cumulative {direction}"] = np.cumsum(self.participation[:, i])
+        return frame.set_index("Mode")
+
+    def get_participation_factors(self, direction:str) -> np.ndarray:
+        """Participation factor of each mode in a direction, taking the modes to be mass normalised and the participating
+           mass to be a fraction of the total mass. The factors are all positive
+        """
+        return np.sqrt(np.abs(self.participation[:, DIRECTIONS.index(direction)]) * self.total_mass)
+
+
+def extract_modes(lusas:'IFModeller', loadcase:'int | IFLoadcase', objects:'IFObjectSet'=None, components:list[str]=MODE_COMPONENTS,
+                  method:str="array") -> ModalResults:
+    """Read the frequencies, mass participation and mode shapes of all the modes of an eigenvalue loadcase
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadcase (int | IFLoadcase): The eigenvalue loadcase or its ID
+        objects (IFObjectSet): Nodes of the mode shapes, default is all nodes
+        components (list[str]): Components of the mode shapes
+        method (str): As Results_Query.query
+
+    Returns:
+        ModalResults: The modes
+    """
+    from m100_Tools_And_Helpers import Results_Query
+    db = lusas.database()
+    if isinstance(loadcase, (int, np.integer)):
+        loadcase = db.getLoadset(int(loadcase))
+    if hasattr(loadcase, "_oleobj_"):
+        import win32com.client as win32
+        loadcase = win32.CastTo(loadcase, "IFLoadcase")
+    modes = loadcase.getResultsLoadcases()
+
+    values = np.array([[m.getValue(name) for name in ["EIGVL", "NATFRQ", "PMASSX", "PMASSY", "PMASSZ"]] for m in modes], dtype=float).reshape(-1, 5)
+    total_mass = float(modes[0].getValue("TMASS")) if modes else 0.0
+    mode_ids = np.array([m.getEigenvalueID() for m in modes], dtype=np.int64)
+
+    # One frame per mode, in the order of the modes
+    frames = [frame.droplevel(["loadset", "extreme", "point"])
+              for frame in Results_Query.iter_query(lusas, "Displacement", components, modes, "Nodal", objects, format="wide", method=method)]
+    node_ids = np.unique(np.concatenate([f.index.to_numpy(np.int64) for f in frames])) if frames else np.empty(0, dtype=np.int64)
+    shapes = np.stack([f.reindex(node_ids)[components].to_numpy(dtype=float) for f in frames]) if frames else np.empty((0, 0, len(components)))
+    return ModalResults(loadcase.getID(), mode_ids, values[:, 0], values[:, 1], values[:, 2:], total_mass, node_ids, shapes)
+
+
+def get_cqc_coefficients(frequencies:np.ndarray, damping:'float | np.ndarray') -> np.ndarray:
+    """Correlation coefficients between modes for the CQC rule, of Der Kiureghian (1981)
+
+    Args:
+        frequencies (np.ndarray): Frequency of each mode
+        damping (float | np.ndarray): Damping ratio, of all the modes or of each mode
+
+    Returns:
+        np.ndarray: (n_modes, n_modes) coefficients, 1 on the diagonal
+    """
+    w = np.asarray(frequencies, dtype=float)
+    z = np.broadcast_to(np.asarray(damping, dtype=float), w.shape)
+    r = w[None, :] / w[:, None]
+    zi, zj = z[:, None], z[None, :]
+    return 8 * np.sqrt(zi * zj) * (zi + r * zj) * r**1.5 / ((1 - r**2)**2 + 4 * zi * zj * r * (1 + r**2) + 4 * (zi**2 + zj**2) * r**2)
+
+
+def combine(responses:np.ndarray, rule:str="SRSS", coefficients:np.ndarray=None) -> np.ndarray:
+    """Combine peak modal responses
+
+    Args:
+        responses (np.ndarray): (..., n_modes, n_points) peak response of each mode, e.g. (n_spectra, n_modes, n_points)
+        rule (str): "SRSS" or "CQC"
+        coefficients (np.ndarray): (n_modes, n_modes) correlation coefficients of get_cqc_coefficients, for CQC
+
+    Returns:
+        np.ndarray: Combined responses with the modes axis removed
+    """
+    assert rule in RULES, f"Rule must be one of {RULES}"
+    responses = np.asarray(responses, dtype=float)
+    if rule == "SRSS":
+        return np.sqrt(np.sum(responses**2, axis=-2))
+    assert coefficients is not None, "CQC needs the correlation coefficients"
+    # sum_ij r_i rho_ij r_j for every point of every spectrum, a matrix product over the modes
+    return np.sqrt(np.maximum(np.einsum("...ip,ij,...jp->...p", responses, coefficients, responses, optimize=True), 0.0))
+
+
+def interpolate_spectra(periods:np.ndarray, spectra:np.ndarray, mode_periods:np.ndarray) -> np.ndarray:
+    """Spectral accelerations of many spectra, sharing the same periods, at the periods of the modes
+
+    Args:
+        periods (np.ndarray): Increasing periods of the spectra
+        spectra (np.ndarray): (n_spectra, n_periods) accelerations
+        mode_periods (np.ndarray): Period of each mode, outside the spectra the nearest value is used
+
+    Returns:
+        np.ndarray: (n_spectra, n_modes) accelerations
+    """
+    periods = np.asarray(periods, dtype=float)
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=float))
+    t = np.clip(np.asarray(mode_periods, dtype=float), periods[0], periods[-1])
+    upper = np.clip(np.searchsorted(periods, t), 1, len(periods) - 1)
+    lower = upper - 1
+    fraction = (t - periods[lower]) / (periods[upper] - periods[lower])
+    return spectra[:, lower] * (1 - fraction) + spectra[:, upper] * fraction
+
+
+def response_spectrum(modal:ModalResults, accelerations:np.ndarray, direction:str, rule:str="SRSS", damping:float=0.05,
+                      factors:np.ndarray=None, modes:np.ndarray=None, block:int=20) -> np.ndarray:
+    """Combined displacements of many response spectra in one direction, without Modeller
+
+    Args:
+        modal (ModalResults): Modes from extract_modes
+        accelerations (np.ndarray): (n_spectra, n_modes) spectral acceleration of each mode, e.g. from interpolate_spectra
+        direction (str): Direction of the excitation, "X", "Y" or "Z"
+        rule (str): "SRSS" or "CQC". CQC depends on the signs of the participation factors, so it needs factors
+        damping (float): Damping ratio of the modes for CQC
+        factors (np.ndarray): Participation factor of each mode, with its sign. Default is from the participating mass, for SRSS only
+        modes (np.ndarray): Boolean mask or indices of the modes to include, default is all
+        block (int): Number of spectra combined at once, memory is about 8 * block * n_modes * n_nodes * n_components bytes
+
+    Returns:
+        np.ndarray: (n_spectra, n_nodes, n_components) combined peak displacements, always positive
+    """
+    assert rule in RULES, f"Rule must be one of {RULES}"
+    assert rule != "CQC" or factors is not None, "CQC depends on the signs of the participation factors, which must be given as factors"
+    index = np.arange(len(modal.modes)) if modes is None else np.arange(len(modal.modes))[modes]
+    w = modal.circular_frequencies[index]
+    factors = modal.get_participation_factors(direction)[index] if factors is None else np.asarray(factors, dtype=float)[index]
+    accelerations = np.atleast_2d(np.asarray(accelerations, dtype=float))[:, index]
+
+    n_spectra, (n_modes, n_nodes, n_components) = len(accelerations), modal.shapes[index].shape
+    # Peak modal displacement per unit shape, then the shapes scaled by it
+    scale = accelerations * (factors / w**2)[None, :]
+    shapes = np.nan_to_num(modal.shapes[index]).reshape(n_modes, -1)
+    coefficients = get_cqc_coefficients(w, damping) if rule == "CQC" else None
+    combined = np.empty((n_spectra, n_nodes * n_components))
+    for first in range(0, n_spectra, block):
+        # (n_block, n_modes, n_nodes * n_components)
+        responses = scale[first:first + block, :, None] * shapes[None, :, :]
+        combined[first:first + block] = combine(responses, rule, coefficients)
+    return combined.reshape(n_spectra, n_nodes, n_components)
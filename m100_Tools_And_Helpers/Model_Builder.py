@@ -0,0 +1,257 @@
+# This file provides incremental model building as an alternative to deleting and recreating the whole model.
+# A model is built as a series of named steps, each a function of its inputs which returns the objects it created
+# (points, lines, surfaces, volumes, groups, attributes and loadsets, in any nesting of lists, tuples and dicts).
+# The objects each step creates and a hash of its inputs are recorded, such that when the script is run again:
+#   - steps whose inputs are unchanged are skipped and return the recorded objects, leaving their mesh and results valid
+#   - steps whose inputs have changed delete the objects they created previously and are run again
+#   - steps that are no longer run have their objects deleted by finish()
+# Everything a step uses must be passed as an input, including objects returned by earlier steps, so that a change
+# to an earlier step is detected by the steps that use its objects. Objects are recorded by type and ID, and Modeller
+# reuses the IDs of deleted objects, so each build of a step is given a new token which is hashed with the inputs of the
+# steps using its objects: a step is run again whenever a step whose objects it uses has been built again.
+
+import os
+import json
+import time
+import hashlib
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+import numpy as np
+
+# Records of models that have not been saved, kept for the life of the python session
+_unsaved_steps : dict[str, dict] = {}
+
+# Geometry type codes returned by IFGeometry.getTypeCode
+GEOMETRY_TYPES = {1: "Point", 2: "Line", 3: "Combined Line", 4: "Surface", 5: "Volume"}
+
+
+@dataclass
+class ObjectIDs:
+    """IDs of objects of a single type created by a step, for example the IDs returned by Helpers.create_lines"""
+    type: str
+    ids: np.ndarray
+
+
+def _interface_name(obj) -> str | None:
+    # Name of the typed pywin32 wrapper class, e.g. IFLine, used to cast objects back when they are reused
+    name = type(obj).__name__
+    return name if name.startswith("IF") else None
+
+
+def _encode(value) -> Any:
+    # Convert a step result or input into JSON, replacing LPI objects with references to them
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return {"$array": value.tolist(), "dtype": str(value.dtype)}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {"$dict": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, ObjectIDs):
+        return {"$ids": value.type, "ids": np.asarray(value.ids, dtype=np.int64).tolist()}
+    if hasattr(value, "getAttributeType"):
+        return {"$attribute": value.getAttributeType(), "name": value.getName(), "class": _interface_name(value)}
+    if hasattr(value, "needsPrimaryComponent"):
+        return {"$loadset": value.getID(), "class": _interface_name(value)}
+    if hasattr(value, "getTypeCode"):
+        code = value.getTypeCode()
+        if code == 11:
+            return {"$group": value.getName(), "class": _interface_name(value)}
+        if code in GEOMETRY_TYPES:
+            return {"$object": GEOMETRY_TYPES[code], "id": value.getID(), "class": _interface_name(value)}
+    raise TypeError(f"{type(value).__name__} cannot be recorded by a build step")
+
+
+def _references(encoded) -> list[tuple]:
+    # All objects referenced by an encoded value as (kind, type, id or name)
+    refs = []
+    if isinstance(encoded, list):
+        for v in encoded:
+            refs.extend(_references(v))
+    elif isinstance(encoded, dict):
+        if "$dict" in encoded:
+            for k, v in encoded["$dict"]:
+                refs.extend(_references(k) + _references(v))
+        elif "$ids" in encoded:
+            refs.extend(("object", encoded["$ids"], id) for id in encoded["ids"])
+        elif "$object" in encoded:
+            refs.append(("object", encoded["$object"], encoded["id"]))
+        elif "$group" in encoded:
+            refs.append(("group", "Group", encoded["$group"]))
+        elif "$attribute" in encoded:
+            refs.append(("attribute", encoded["$attribute"], encoded["name"]))
+        elif "$loadset" in encoded:
+            refs.append(("loadset", "Loadset", encoded["$loadset"]))
+    return refs
+
+
+def _get_hash(encoded) -> str:
+    return hashlib.sha1(json.dumps(encoded, sort_keys=True).encode()).hexdigest()
+
+
+class ModelBuilder:
+    """Builds a model as a series of named steps, only repeating the steps whose inputs have changed"""
+
+    def __init__(self, modeller:'IFModeller', state_file:str=None):
+        """
+        Args:
+            modeller (IFModeller): Reference to LUSAS Modeller
+            state_file (str): File in which the record of each step is kept. Default is alongside the model file,
+                              or in memory for the rest of the python session if the model has not been saved
+        """
+        self.lusas = modeller
+        self.db = modeller.database()
+        if state_file is None and self.db.getDBFilename():
+            state_file = f"{self.db.getDBFilenameNoExtension()}.build.json"
+        self.state_file = state_file
+        # step name -> {"hash", "result", "time", "build"}
+        self.steps : dict[str, dict]
+        if state_file is None:
+            self.steps = _unsaved_steps.setdefault(self.db.getDBBasename(), {})
+        elif os.path.exists(state_file):
+            with open(state_file) as f:
+                self.steps = json.load(f)
+        else:
+            self.steps = {}
+        self.summary = {"built": [], "reused": [], "deleted": []}
+        self._run : list[str] = []
+
+    def _save(self):
+        if self.state_file is None:
+            return
+        temp = self.state_file + ".tmp"
+        with open(temp, "w") as f:
+            json.dump(self.steps, f)
+        os.replace(temp, self.state_file)
+
+    def _exists(self, kind:str, type:str, key) -> bool:
+        match kind:
+            case "object":
+                return self.db.exists(type, key)
+            case "group":
+                return self.db.exists("Group", key)
+            case "attribute":
+                return self.db.existsAttribute(type, key)
+            case "loadset":
+                return self.db.existsLoadset(key)
+        return False
+
+    def _input_hash(self, inputs:dict) -> str:
+        # Hash of the inputs and the build token of each step that created objects among them. The steps run this time
+        # take precedence, as IDs recorded by other steps may since have been reused
+        encoded = _encode(inputs)
+        owners = {}
+        for name in [n for n in self.steps if n not in self._run] + self._run:
+            record = self.steps.get(name)
+            if record is not None:
+                owners.update((tuple(r), (name, record.get("build"))) for r in _references(record["result"]))
+        builds = sorted(set(owners[r] for r in map(tuple, _references(encoded)) if r in owners), key=str)
+        return _get_hash([encoded, builds])
+
+    def _delete(self, refs:list[tuple]):
+        # Groups are ungrouped, leaving their members, then attributes, loadsets and the geometry are deleted
+        for kind, type, key in refs:
+            if kind == "group" and self.db.exists("Group", key):
+                self.db.getObject("Group", key).ungroup()
+        for kind, type, key in refs:
+            if kind == "attribute" and self.db.existsAttribute(type, key):
+                self.db.deleteAttribute(self.db.getAttribute(type, key))
+        for kind, type, key in refs:
+            if kind == "loadset" and self.db.existsLoadset(key):
+                self.db.deleteLoadset(key)
+        # Unshared lower order features of deleted features are also deleted
+        objects = self.lusas.newObjectSet()
+        geometry = [(type, key) for kind, type, key in refs if kind == "object" and self.db.exists(type, key)]
+        for type, key in geometry:
+            objects.add(type, key)
+        if geometry:
+            objects.Delete("All")
+
+    def _decode(self, encoded) -> Any:
+        if isinstance(encoded, list):
+            return [self._decode(v) for v in encoded]
+        if not isinstance(encoded, dict):
+            return encoded
+        if "$array" in encoded:
+            return np.array(encoded["$array"], dtype=encoded["dtype"])
+        if "$dict" in encoded:
+            return {_hashable(self._decode(k)): self._decode(v) for k, v in encoded["$dict"]}
+        if "$ids" in encoded:
+            return ObjectIDs(encoded["$ids"], np.array(encoded["ids"], dtype=np.int64))
+        if "$object" in encoded:
+            obj = self.db.getObject(encoded["$object"], encoded["id"])
+        elif "$group" in encoded:
+            obj = self.db.getObject("Group", encoded["$group"])
+        elif "$attribute" in encoded:
+            obj = self.db.getAttribute(encoded["$attribute"], encoded["name"])
+        else:
+            obj = self.db.getLoadset(encoded["$loadset"])
+        if encoded.get("class") is not None:
+            import win32com.client as win32
+            obj = win32.CastTo(obj, encoded["class"])
+        return obj
+
+    def step(self, name:str, build:Callable[..., Any], modify:bool=False, **inputs) -> Any:
+        """Run a build step, or return the objects it created previously if its inputs have not changed
+
+        Args:
+            name (str): Unique name of the step
+            build (Callable): Function called with the inputs as keyword arguments, returning the objects it created
+            modify (bool): Run the step again without first deleting its objects. Use for steps which only create attributes,
+                           attributes created with the name of an existing attribute redefine it and keep its assignments
+            **inputs: Everything the step depends on. Numbers, strings, numpy arrays, LPI objects and lists or dicts of these
+
+        Returns:
+            Any: Result of the build function
+        """
+        assert name not in self._run, f"Step {name} has already been run"
+        input_hash = self._input_hash(inputs)
+        self._run.append(name)
+        record = self.steps.get(name)
+        if record is not None and record["hash"] == input_hash:
+            refs = [tuple(r) for r in _references(record["result"])]
+            if all(self._exists(*r) for r in refs):
+                self.summary["reused"].append(name)
+                return self._decode(record["result"])
+
+        start = time.perf_counter()
+        old_refs = [tuple(r) for r in _references(record["result"])] if record is not None else []
+        if not modify:
+            self._delete(old_refs)
+        result = build(**inputs)
+        encoded = _encode(result)
+        if modify:
+            # Delete anything the step no longer creates
+            new_refs = set(tuple(r) for r in _references(encoded))
+            self._delete([r for r in old_refs if r not in new_refs])
+        self.steps[name] = {"hash": input_hash, "result": encoded, "time": time.perf_counter() - start, "build": uuid.uuid4().hex}
+        self.summary["built"].append(name)
+        self._save()
+        return result
+
+    def finish(self) -> dict:
+        """Delete the objects of recorded steps that were not run this time and save the record
+
+        Returns:
+            dict: Names of the steps built, reused and deleted
+        """
+        for name in [n for n in self.steps if n not in self._run]:
+            self._delete([tuple(r) for r in _references(self.steps[name]["result"])])
+            del self.steps[name]
+            self.summary["deleted"].append(name)
+        self._save()
+        return self.summary
+
+    def forget(self):
+        """Discard the record of all steps, such that they are all run again. The objects already created are not deleted"""
+        self.steps.clear()
+        self._save()
+
+
+def _hashable(key):
+    # JSON has no tuples, dict keys that were tuples are decoded as lists
+    return tuple(key) if isinstance(key, list) else key
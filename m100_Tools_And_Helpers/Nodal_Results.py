@@ -0,0 +1,57 @@
+# This file reads the results of many nodes and components from a results component set into a single numpy array of
+# shape (n_nodes, n_components), shared by Bearing_Schedule, Support_Reactions and Results_Query.
+# Results are requested with getContinuousResults, one call per node and component. Reading the files written by
+# dumpToFile is left to Results_Dump, whose layout has not yet been checked against files written by Modeller.
+# The min of an envelope or smart combination is read from its associated loadset, see get_extreme_loadsets.
+
+import numpy as np
+
+METHODS = ["continuous"]
+
+
+def _cast(obj, class_name:str):
+    # Objects that are not COM objects, e.g. stand ins for Modeller, are used as they are
+    if not hasattr(obj, "_oleobj_"):
+        return obj
+    import win32com.client as win32
+    return win32.CastTo(obj, class_name)
+
+
+def get_extreme_loadsets(loadset:'IFLoadset') -> list[tuple[str, 'IFLoadset']]:
+    """Entries of a loadset on the loadset axis, labelled "max", "min" or "" for loadsets without max and min.
+    The max of an envelope or smart combination also gives its associated loadset as the min, as in #160, the min gives only itself"""
+    match loadset.getTypeCode():
+        case 3:
+            combination = _cast(loadset, "IFEnvelope")
+        case 6:
+            combination = _cast(loadset, "IFSmartCombination")
+        case _:
+            return [("", loadset)]
+    if combination.isMax():
+        return [("max", loadset), ("min", combination.getAssocLoadset())]
+    return [("min", loadset)]
+
+
+class NodalReader:
+    """Reads the results of the given nodes from results component sets, fetching the nodes once"""
+
+    def __init__(self, nodes:'list[IFNode]', node_ids:np.ndarray, components:list[str], method:str="continuous", units:'IFUnitSet'=None):
+        """
+        Args:
+            nodes (list[IFNode]): Nodes whose results are read
+            node_ids (np.ndarray): ID of each node
+            components (list[str]): Results components
+            method (str): "continuous" requests each component of each node
+            units (IFUnitSet): Units of the results. Default is the units of the model
+        """
+        assert method in METHODS, f"Method must be one of {METHODS}"
+        self.nodes, self.node_ids, self.components, self.units = nodes, np.asarray(node_ids, dtype=np.int64), list(components), units
+
+    def read(self, results:'IFResultsComponentSet') -> np.ndarray:
+        """(n_nodes, n_components) results, nan where there are none"""
+        from m100_Tools_And_Helpers.Results_Utils import invalid_to_nan
+        i_comps = [results.getComponentNumber(c) for c in self.components]
+        values = np.array([[results.getContinuousResults(i, node, self.units, None) for i in i_comps] for node in self.nodes],
+                          dtype=float).reshape(-1, len(i_comps))
+        return invalid_to_nan(values)
+
@@ -0,0 +1,277 @@
+# This file exports results through the Print Results Wizard (PRW) as text at full precision and reads the text into
+# a long DataFrame indexed by (loadset, element, node, component), or into a Parquet file, without an Excel file in between.
+# A single wizard run per results entity covers all the requested loadsets, each loadset being a tab of the results
+# table, and all tabs are saved to one text file with IFGridWindow.saveAllAs.
+# The text is read line by line and parsed in chunks of rows, so tables larger than memory can be written to Parquet.
+# Each tab of the text file is expected to be a title line naming the loadset, e.g. "1:Dead", a row of tab separated
+# column names and then the rows of results. Tabs whose title does not include the loadset ID are taken to be the
+# loadsets in the order requested. A title is a line without tabs, any other line that is neither column names nor a
+# row of results raises, rather than being read as a new tab.
+# The layout above is assumed, it has not been checked against a file saved by Modeller. The sample in DataFiles/PRW
+# was written by hand in this layout, and the layout should be checked against a file saved by the version of Modeller
+# in use before relying on it.
+
+import io
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterator
+import numpy as np
+import pandas as pd
+
+# Significant figures of the exported values, enough to represent any double exactly
+SIGNIFICANT_FIGURES = 17
+
+# Number of rows parsed at once
+CHUNK_ROWS = 200_000
+
+# Column names identifying the element and the node, gauss point or internal point of each row, in lower case
+ELEMENT_COLUMNS = ["element"]
+NODE_COLUMNS = ["node", "gauss point", "gauss pt", "internal point", "point", "location"]
+LOADSET_COLUMNS = ["loadcase", "loadset"]
+COORDINATE_COLUMNS = ["x", "y", "z"]
+
+INDEX_NAMES = ["loadset", "element", "node", "component"]
+
+_TITLE_ID = re.compile(r"(?:^|\D)(\d+)\s*:")
+
+
+@dataclass
+class PRWRequest:
+    """Results of one entity to export"""
+    entity: str
+    location: str = "ElementNodal"
+    # None exports all components
+    components: list[str] = None
+    # "Global", "Feature" or "None"
+    transform: str = "Global"
+    extent: tuple[str, str] = ("Full Model", "")
+    # Any further settings, as names of IFPrintResultsWizard methods and their arguments
+    options: dict[str, tuple] = field(default_factory=dict)
+
+
+def create_wizard(db:'IFDatabase', name:str, request:PRWRequest, loadset_ids:list[int]) -> 'IFPrintResultsWizard':
+    """Create a Print Results Wizard of the results of the given loadsets at full precision
+
+    Args:
+        db (IFDatabase): Reference to the database
+        name (str): Name of the wizard attribute
+        request (PRWRequest): Entity, location, components and extent of the results
+        loadset_ids (list[int]): IDs of the loadsets
+
+    Returns:
+        IFPrintResultsWizard: The wizard
+    """
+    # Units are left as those of the model
+    attr = db.createPrintResultsWizard(name)
+    attr.setResultsType("Components")
+    attr.setResultsOrder("Mesh")
+    attr.setResultsContent("Tabular")
+    attr.setResultsEntity(request.entity)
+    attr.setExtent(*request.extent)
+    attr.setResultsLocation(request.location)
+
+    loadsets = [db.getLoadset(int(id)) for id in loadset_ids]
+    # The loadsets given to setLoadcases are used with the "Selected" option, as in #400
+    attr.setLoadcasesOption("Selected")
+    attr.setLoadcases([l.getID() for l in loadsets], [l.getResultsFileID() for l in loadsets],
+                      [l.getEigenvalueID() for l in loadsets], [l.getHarmonicID() for l in loadsets])
+
+    if request.components is not None:
+        attr.setComponents(list(request.components))
+    match request.transform:
+        case "Global":
+            attr.setResultsTransformGlobal()
+        case "Feature":
+            attr.setResultsTransformFeature()
+        case _:
+            attr.setResultsTransformNone()
+
+    attr.showCoordinates(False)
+    attr.showExtremeResults(False)
+    attr.setSlice(False)
+    attr.setAllowDerived(False)
+    attr.setDisplayNow(False)
+    # Significant figures rather than decimal places, and no threshold is set, so that small values are not rounded to zero
+    attr.setSigFig(SIGNIFICANT_FIGURES, False)
+    for method, arguments in request.options.items():
+        getattr(attr, method)(*arguments)
+    return attr
+
+
+def save_text(lusas:'IFModeller', request:PRWRequest, loadset_ids:list[int], filename:str):
+    """Run a temporary Print Results Wizard and save all of its tables, one per loadset, to a text file"""
+    import win32com.client as win32
+    db = lusas.database()
+    name = "___PRW_EXPORT___"
+    create_wizard(db, name, request, loadset_ids)
+    attr = win32.CastTo(db.getAttribute("Print Results Wizard", name), "IFPrintResultsWizard")
+    # The wizard is deleted when the table is closed
+    table = attr.showResults(True)
+    table.saveAllAs(filename, "Text")
+    table.close()
+
+
+def _columns(names:list[str]) -> tuple[dict[str, int], list[int], list[str]]:
+    # Positions of the element, node and loadset columns, and the positions and names of the components
+    ids, components, names_out = {}, [], []
+    for i, name in enumerate(names):
+        key = name.strip().lower()
+        if key in ELEMENT_COLUMNS and "element" not in ids:
+            ids["element"] = i
+        elif key in NODE_COLUMNS and "node" not in ids:
+            ids["node"] = i
+        elif key in LOADSET_COLUMNS and "loadset" not in ids:
+            ids["loadset"] = i
+        elif key in COORDINATE_COLUMNS or key == "":
+            continue
+        else:
+            components.append(i)
+            names_out.append(name.strip())
+    return ids, components, names_out
+
+
+def _is_header(fields:list[str]) -> bool:
+    return any(f.strip().lower() in ELEMENT_COLUMNS + NODE_COLUMNS for f in fields)
+
+
+def _parse(lines:list[str], names:list[str], loadset:int) -> pd.DataFrame:
+    # Parse rows of one table into the long format
+    ids, components, component_names = _columns(names)
+    table = pd.read_csv(io.StringIO("".join(lines)), sep="\t", header=None, names=range(len(names)),
+                        usecols=list(ids.values()) + components, index_col=False, float_precision="round_trip")
+    n = len(table)
+    values = table[components].to_numpy(dtype=float)
+    index = {"loadset": table[ids["loadset"]].to_numpy(np.int64) if "loadset" in ids else np.full(n, loadset, dtype=np.int64),
+             "element": table[ids["element"]].to_numpy(np.int64) if "element" in ids else np.full(n, -1, dtype=np.int64),
+             "node": table[ids["node"]].to_numpy(np.int64) if "node" in ids else np.full(n, -1, dtype=np.int64)}
+    frame = pd.DataFrame({key: np.repeat(v, len(components)) for key, v in index.items()})
+    frame["component"] = pd.Categorical.from_codes(np.tile(np.arange(len(components)), n), categories=component_names)
+    frame["value"] = values.reshape(-1)
+    return frame
+
+
+def iter_text(filename:str, loadset_ids:list[int]=None, chunk_rows:int=CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Read a text export of the Print Results Wizard in chunks, without reading the whole file into memory
+
+    Args:
+        filename (str): Text file saved from the results table
+        loadset_ids (list[int]): Loadsets of the tabs, in order, used for tabs whose title does not include the loadset ID
+        chunk_rows (int): Number of rows parsed at once
+
+    Yields:
+        pd.DataFrame: Long format chunks with the columns loadset, element, node, component and value.
+                      Element or node is -1 for results that are not at an element or node
+
+    Raises:
+        ValueError: For a line that is not a title, column names or a row of results
+    """
+    names, loadset, tab, lines = None, None, -1, []
+    with open(filename, encoding="utf-8", errors="replace") as f:
+        for number, line in enumerate(f, 1):
+            fields = line.rstrip("\r\n").split("\t")
+            # Rows of results start with an element or node ID
+            if fields[0].strip().isdigit() and len(fields) > 1:
+                if names is None:
+                    raise ValueError(f"Row of results before the column names at line {number} of {filename}")
+                lines.append(line)
+                if len(lines) >= chunk_rows:
+                    yield _parse(lines, names, loadset)
+                    lines = []
+                continue
+            if not line.strip():
+                continue
+            if lines:
+                yield _parse(lines, names, loadset)
+                lines = []
+            if _is_header(fields):
+                names = fields
+            elif len(fields) == 1:
+                # Title of the next tab
+                tab += 1
+                names = None
+                match = _TITLE_ID.search(line)
+                if match is not None:
+                    loadset = int(match.group(1))
+                elif loadset_ids is not None and tab < len(loadset_ids):
+                    loadset = int(loadset_ids[tab])
+                else:
+                    loadset = tab + 1
+            else:
+                raise ValueError(f"Unrecognised line {number} of {filename}: {line.strip()!r}")
+    if lines:
+        yield _parse(lines, names, loadset)
+
+
+def read_text(filename:str, loadset_ids:list[int]=None, chunk_rows:int=CHUNK_ROWS) -> pd.DataFrame:
+    """Read a text export of the Print Results Wizard into a DataFrame with a "value" column, indexed by (loadset, element, node, component)"""
+    frames = list(iter_text(filename, loadset_ids, chunk_rows))
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=INDEX_NAMES + ["value"])
+    frame["component"] = frame["component"].astype(str).astype("category")
+    return frame.set_index(INDEX_NAMES)
+
+
+def export_results(lusas:'IFModeller', requests:'list[PRWRequest] | PRWRequest', loadset_ids:list[int], parquet_file:str=None,
+                   folder:str=None, chunk_rows:int=CHUNK_ROWS) -> pd.DataFrame | None:
+    """Export the results of many entities and loadsets, with one wizard run per entity
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        requests (list[PRWRequest] | PRWRequest): Results to export
+        loadset_ids (list[int]): IDs of the loadsets
+        parquet_file (str): If given, the results are written to this Parquet file in chunks rather than returned. Requires pyarrow
+        folder (str): Folder of the intermediate text files, which are kept. Default is a temporary folder which is deleted
+
+    Returns:
+        pd.DataFrame | None: Results with the columns "entity" and "value" indexed by (loadset, element, node, component),
+                             or None when written to a Parquet file
+    """
+    if isinstance(requests, PRWRequest):
+        requests = [requests]
+    writer, frames = None, []
+    with tempfile.TemporaryDirectory() as temp_folder:
+        folder = folder if folder is not None else temp_folder
+        try:
+            for i, request in enumerate(requests):
+                entity_name = re.sub(r"[^\w]+", " ", request.entity).strip()
+                filename = os.path.join(folder, f"PRW {i} {entity_name}.txt")
+                save_text(lusas, request, loadset_ids, filename)
+                for chunk in iter_text(filename, loadset_ids, chunk_rows):
+                    chunk.insert(0, "entity", request.entity)
+                    if parquet_file is None:
+                        frames.append(chunk)
+                    else:
+                        writer = _write_parquet(writer, parquet_file, chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    if parquet_file is not None:
+        return None
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["entity"] + INDEX_NAMES + ["value"])
+    frame["component"] = frame["component"].astype(str).astype("category")
+    frame["entity"] = frame["entity"].astype("category")
+    return frame.set_index(INDEX_NAMES)
+
+
+def _write_parquet(writer, filename:str, chunk:pd.DataFrame):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    # Components differ between entities, they are stored as strings rather than as categories of the first chunk
+    chunk = chunk.assign(component=chunk["component"].astype(str))
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    if writer is None:
+        writer = pq.ParquetWriter(filename, table.schema)
+    writer.write_table(table.cast(writer.schema))
+    return writer
+
+
+def text_to_parquet(filename:str, parquet_file:str, loadset_ids:list[int]=None, chunk_rows:int=CHUNK_ROWS):
+    """Convert a text export of the Print Results Wizard to Parquet in chunks, e.g. for tables larger than memory. Requires pyarrow"""
+    writer = None
+    try:
+        for chunk in iter_text(filename, loadset_ids, chunk_rows):
+            writer = _write_parquet(writer, parquet_file, chunk)
+    finally:
+        if writer is not None:
+            writer.close()
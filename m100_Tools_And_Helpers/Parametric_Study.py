@@ -0,0 +1,153 @@
+# This file runs a script over many sets of parameters in parallel, for example to study the buckling factor of
+# #220 for a range of plate thicknesses. Each worker process owns its own connection to LUSAS Modeller and the
+# parameter sets are shared between the workers as they become free. The results are collected into a single table.
+#
+# A parameter set whose worker raises an exception, or whose worker process crashes, is retried on a fresh
+# connection up to the given number of times before its error is recorded in the table. A crash breaks the whole pool,
+# so only the parameter sets that were running are suspects, and when there are several they are run again one per pool
+# to find the one that crashed. Parameter sets still queued are resubmitted without being charged an attempt.
+#
+# Worker functions are sent to the worker processes by name, so they must be defined in a .py module rather than
+# in a notebook cell. They are called as worker(lusas, parameters) and return a dict of results.
+# The workers can be tested without LUSAS by passing a stand in for Modeller as the modeller factory, see tests/.
+
+import os
+import time
+import atexit
+import multiprocessing
+from typing import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+
+# Connection to Modeller of the current worker process
+_modeller = None
+_modeller_factory = None
+# Queue of the parameter sets started by the worker processes
+_started = None
+
+
+def new_modeller() -> 'IFModeller':
+    """Start a new, hidden, instance of LUSAS Modeller for the current process. Default modeller factory of run_study"""
+    import pythoncom
+    import win32com.client as win32
+    from LPI import VERSION
+    pythoncom.CoInitialize()
+    # DispatchEx starts a separate instance rather than connecting to one that is already running
+    modeller = win32.gencache.EnsureDispatch(win32.DispatchEx(f"Lusas.Modeller.{VERSION}"))
+    modeller.setVisible(False)
+    return modeller
+
+
+def _quit_modeller():
+    global _modeller
+    if _modeller is not None:
+        try:
+            _modeller.quit()
+        except Exception:
+            # The instance may already have closed or crashed
+            pass
+        _modeller = None
+
+
+def _initialise_worker(modeller_factory:Callable, started:'multiprocessing.SimpleQueue'):
+    global _modeller_factory, _started
+    _modeller_factory = modeller_factory
+    _started = started
+    # Close the instance of Modeller owned by this process when the pool shuts down
+    atexit.register(_quit_modeller)
+
+
+def _run_parameter_set(worker:Callable, index:int, parameters:dict) -> tuple[int, dict, int, float]:
+    global _modeller
+    # Written straight to the pipe, so it is received even if the process then crashes
+    _started.put(index)
+    if _modeller is None:
+        _modeller = _modeller_factory()
+    start = time.perf_counter()
+    try:
+        result = worker(_modeller, dict(parameters))
+    except BaseException:
+        # Modeller may be left in an unknown state, close it and connect again for the next parameter set
+        _quit_modeller()
+        raise
+    return index, result, os.getpid(), time.perf_counter() - start
+
+
+def run_study(worker:Callable[['IFModeller', dict], dict], parameter_sets:'list[dict] | pd.DataFrame', n_workers:int=None,
+              retries:int=2, modeller_factory:Callable[[], 'IFModeller']=new_modeller) -> pd.DataFrame:
+    """Run the worker function for each parameter set, in parallel over several worker processes
+
+    Args:
+        worker (Callable): Function defined in a module, called as worker(lusas, parameters), returning a dict of results
+        parameter_sets (list[dict] | pd.DataFrame): Parameters, one dict or row per run
+        n_workers (int): Number of worker processes, each with its own instance of Modeller. Default is the number of cores.
+                         This should not exceed the number of LUSAS licences available
+        retries (int): Number of times a failed parameter set is run again
+        modeller_factory (Callable): Function called once in each worker process to connect to Modeller
+
+    Returns:
+        pd.DataFrame: One row per parameter set with the parameters, results, and the columns
+                      "worker" (process ID), "attempts", "seconds" and "error" (None if successful)
+    """
+    if isinstance(parameter_sets, pd.DataFrame):
+        parameter_sets = parameter_sets.to_dict("records")
+    parameter_sets = [dict(p) for p in parameter_sets]
+    n_workers = min(n_workers or os.cpu_count(), max(len(parameter_sets), 1))
+
+    attempts = {i: 0 for i in range(len(parameter_sets))}
+    rows = {}
+    pending = set(attempts)
+    # Parameter sets running together when a worker process crashed, each run alone next to find the one that crashed
+    suspects = set()
+
+    def failed(i:int, error:str):
+        attempts[i] += 1
+        if attempts[i] > retries:
+            pending.discard(i)
+            rows[i] = {"worker": None, "attempts": attempts[i], "seconds": None, "error": error}
+
+    # A crashed worker process breaks the whole pool, a new pool is then started for the remaining parameter sets
+    while pending:
+        suspects &= pending
+        if suspects:
+            batch, pool_workers = [min(suspects)], 1
+            suspects.discard(batch[0])
+        else:
+            batch, pool_workers = sorted(pending), n_workers
+        started = multiprocessing.SimpleQueue()
+        started_sets, finished, crashed = set(), set(), []
+        with ProcessPoolExecutor(pool_workers, initializer=_initialise_worker, initargs=(modeller_factory, started)) as pool:
+            futures = {pool.submit(_run_parameter_set, worker, i, parameter_sets[i]): i for i in batch}
+            for future in as_completed(futures):
+                i = futures[future]
+                # Read as the results arrive so that the pipe never fills
+                while not started.empty():
+                    started_sets.add(started.get())
+                try:
+                    _, result, pid, seconds = future.result()
+                except BrokenProcessPool:
+                    crashed.append(i)
+                    continue
+                except Exception as e:
+                    finished.add(i)
+                    failed(i, f"{type(e).__name__}: {e}")
+                    continue
+                finished.add(i)
+                attempts[i] += 1
+                pending.discard(i)
+                rows[i] = {**result, "worker": pid, "attempts": attempts[i], "seconds": seconds, "error": None}
+
+        if crashed:
+            while not started.empty():
+                started_sets.add(started.get())
+            running = (started_sets - finished) & set(crashed) or set(crashed)
+            if len(running) == 1:
+                failed(running.pop(), "Worker process crashed")
+            else:
+                # It is not known which of them crashed, none is charged an attempt until each has been run alone
+                suspects |= running
+        started.close()
+
+    return pd.DataFrame([{**parameter_sets[i], **rows[i]} for i in range(len(parameter_sets))])
+
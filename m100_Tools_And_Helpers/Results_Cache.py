@@ -0,0 +1,325 @@
+# This file provides a persistent store of extracted results, such that repeated post-processing of the same
+# solved model reads results from disk rather than requesting them from LUSAS Modeller again.
+# The IDs and values of each result are stored together in one numpy .npz file, keyed by the model file hash, loadset ID,
+# results entity, component and location type (Nodal, ElementNodal, Gauss, Internal).
+# Deletion mirrors IFResultsCache (deleteForLoadset, deleteForEntity, deleteAll) and the least recently used
+# results are evicted once the store exceeds its maximum size. The time each result was last used is kept in memory
+# and written to the index with the next put, deletion or close, so that reading results never writes to disk.
+# Several processes, e.g. the workers of a parametric study, can share a store: the index is only read and written while
+# holding a lock file, and each write merges the changes of this process into the index as it is on disk.
+
+import os
+import glob
+import json
+import time
+import hashlib
+import warnings
+from typing import Callable
+import numpy as np
+
+LOCATION_TYPES = ["Nodal", "ElementNodal", "Gauss", "Internal"]
+
+# Hash of each model file, keyed by the path, size and modification time of the file and of its results files
+_model_hash_cache : dict[tuple, str] = {}
+
+
+def get_model_hash(db:'IFDatabase') -> str:
+    """Hash of the saved model file and its results files. This changes when the model is saved or re-solved.
+       The model file is only read again when its size or modification time, or those of its results files, change
+
+    Args:
+        db (IFDatabase): Reference to the database
+
+    Returns:
+        str: Hexadecimal hash
+    """
+    filename = db.getDBFilename()
+    # Results files are typically too large to read, their size and modification time identify a solve
+    results_files = []
+    for results_file in get_results_files(db):
+        stat = os.stat(results_file)
+        results_files.append((os.path.basename(results_file), stat.st_size, stat.st_mtime_ns))
+    stat = os.stat(filename)
+    stamp = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns, tuple(results_files))
+    if stamp in _model_hash_cache:
+        return _model_hash_cache[stamp]
+
+    sha = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    for name, size, mtime in results_files:
+        sha.update(f"{name}|{size}|{mtime}".encode())
+    _model_hash_cache[stamp] = sha.hexdigest()
+    return _model_hash_cache[stamp]
+
+
+def get_results_files(db:'IFDatabase') -> list[str]:
+    """Results files of the saved model, named as the model, "Bridge.mys", or as the model and an analysis, "Bridge_Analysis 1.mys".
+       Files that are named as another model in the same folder, "Bridge_v2.mys" of "Bridge_v2.mdl", belong to that model
+
+    Args:
+        db (IFDatabase): Reference to the database
+
+    Returns:
+        list[str]: Sorted filenames
+    """
+    base = db.getDBFilenameNoExtension()
+    extension = os.path.splitext(db.getDBFilename())[1]
+    # Escaped such that brackets in the folder or model name are not read as patterns
+    candidates = glob.glob(glob.escape(base) + ".mys") + glob.glob(glob.escape(base) + "_*.mys")
+    return sorted(f for f in candidates if f == base + ".mys" or not os.path.exists(os.path.splitext(f)[0] + extension))
+
+
+class _IndexLock:
+    """Lock file held while the index is read and written. A lock older than stale_time, left by a process that ended
+       while holding it, is removed"""
+
+    def __init__(self, filename:str, timeout:float=30, stale_time:float=120):
+        self.filename = filename
+        self.timeout = timeout
+        self.stale_time = stale_time
+        self._fd = None
+
+    def __enter__(self) -> '_IndexLock':
+        start = time.monotonic()
+        while True:
+            try:
+                self._fd = os.open(self.filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                return self
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.stat(self.filename).st_mtime > self.stale_time:
+                    warnings.warn(f"Removing the stale lock {self.filename}")
+                    os.remove(self.filename)
+                    continue
+            except FileNotFoundError:
+                # Released since the attempt to create it
+                continue
+            if time.monotonic() - start > self.timeout:
+                raise TimeoutError(f"The results cache index is locked by another process, delete {self.filename} if no other process is using the cache")
+            time.sleep(0.01)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        os.close(self._fd)
+        os.remove(self.filename)
+
+
+class ResultsCache:
+    """Persistent, size limited store of results arrays"""
+
+    def __init__(self, directory:str=None, max_size_mb:float=2048):
+        """
+        Args:
+            directory (str): Location of the store. Default is a "LusasResultsCache" folder in the user's home directory
+            max_size_mb (float): Size above which the least recently used results are deleted
+        """
+        self.directory = directory if directory is not None else os.path.join(os.path.expanduser("~"), "LusasResultsCache")
+        self.max_size = max_size_mb * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+        self._index_file = os.path.join(self.directory, "index.json")
+        # Last access times of the results read since the index was written
+        self._accessed : dict[str, float] = {}
+        with _IndexLock(self._index_file + ".lock"):
+            self._index = self._load_index()
+
+    def __enter__(self) -> 'ResultsCache':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def get_key(model_hash:str, loadset_id:int, entity:str, component:str, location:str) -> str:
+        assert location in LOCATION_TYPES, f"Location must be one of {LOCATION_TYPES}"
+        text = f"{model_hash}|{int(loadset_id)}|{entity}|{component}|{location}"
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _path(self, key:str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _load_index(self) -> dict[str, dict]:
+        if not os.path.exists(self._index_file):
+            return {}
+        with open(self._index_file) as f:
+            return json.load(f)
+
+    def _save_index(self, change:Callable[[dict], None]=None):
+        """Apply the last access times and the given change to the index as written by all processes, then write it
+
+        Args:
+            change (Callable): Function modifying the index, e.g. adding or removing entries
+        """
+        with _IndexLock(self._index_file + ".lock"):
+            index = self._load_index()
+            for key, last_access in self._accessed.items():
+                if key in index:
+                    index[key]["last_access"] = max(index[key]["last_access"], last_access)
+            if change is not None:
+                change(index)
+            # Write to a temporary file first so that an interrupted write does not corrupt the index
+            temp = self._index_file + ".tmp"
+            with open(temp, "w") as f:
+                json.dump(index, f)
+            os.replace(temp, self._index_file)
+        self._index = index
+        self._accessed = {}
+
+    def close(self):
+        """Write the last access times of the results read since the index was last written"""
+        if self._accessed:
+            self._save_index()
+
+    def contains(self, model_hash:str, loadset_id:int, entity:str, component:str, location:str) -> bool:
+        return self.get_key(model_hash, loadset_id, entity, component, location) in self._index
+
+    def get(self, model_hash:str, loadset_id:int, entity:str, component:str, location:str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Get stored results
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: Node/element IDs and values, or None if the results are not stored
+        """
+        key = self.get_key(model_hash, loadset_id, entity, component, location)
+        if key not in self._index:
+            return None
+        try:
+            with np.load(self._path(key)) as stored:
+                ids, values = stored["ids"], stored["values"]
+        except FileNotFoundError:
+            # Evicted or deleted by another process
+            self._save_index(lambda index: self._remove(index, key))
+            return None
+        # Written with the index on the next put, deletion or close
+        self._index[key]["last_access"] = self._accessed[key] = time.time()
+        return ids, values
+
+    def put(self, model_hash:str, loadset_id:int, entity:str, component:str, location:str, ids:np.ndarray, values:np.ndarray):
+        """Store results
+
+        Args:
+            ids (np.ndarray): Node IDs (Nodal) or element IDs of each row of values
+            values (np.ndarray): Results, one row per ID. Element results with differing numbers of points per element should be padded with nan
+        """
+        ids, values = np.asarray(ids), np.asarray(values, dtype=float)
+        assert len(ids) == len(values), "There must be one row of values for each ID"
+        key = self.get_key(model_hash, loadset_id, entity, component, location)
+        # The IDs and values are replaced together, the temporary file is named by process in case several store the same results
+        temp = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            np.savez(f, ids=ids, values=values)
+        size = os.path.getsize(temp)
+        os.replace(temp, self._path(key))
+        entry = {"model": model_hash, "loadset": int(loadset_id), "entity": entity, "component": component,
+                 "location": location, "size": size, "last_access": time.time()}
+
+        def add(index:dict):
+            index[key] = entry
+            self._evict(index, keep=key)
+        self._save_index(add)
+
+    def get_or_extract(self, model_hash:str, loadset_id:int, entity:str, component:str, location:str,
+                       extract:Callable[[], tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+        """Get stored results, calling extract to obtain them from Modeller if they are not already stored
+
+        Args:
+            extract (Callable): Function returning the IDs and values
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: IDs and values
+        """
+        cached = self.get(model_hash, loadset_id, entity, component, location)
+        if cached is not None:
+            return cached
+        ids, values = extract()
+        self.put(model_hash, loadset_id, entity, component, location, ids, values)
+        return self.get(model_hash, loadset_id, entity, component, location)
+
+    def _remove(self, index:dict, key:str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            # On Windows the file cannot be deleted while another process is reading it, it is overwritten on the next put
+            pass
+        index.pop(key, None)
+
+    def _evict(self, index:dict, keep:str=None):
+        total = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            total -= index[key]["size"]
+            self._remove(index, key)
+
+    def get_size_mb(self) -> float:
+        return sum(entry["size"] for entry in self._index.values()) / (1024 * 1024)
+
+    def delete_for_loadset(self, loadset_id:int, model_hash:str=None):
+        """Delete all stored results of the given loadset, as IFResultsCache.deleteForLoadset
+
+        Args:
+            loadset_id (int): Loadset ID, -1 means all loadsets
+            model_hash (str): Limit the deletion to the given model. Default is all models
+        """
+        def delete(index:dict):
+            for key, entry in list(index.items()):
+                if (loadset_id == -1 or entry["loadset"] == loadset_id) and (model_hash is None or entry["model"] == model_hash):
+                    self._remove(index, key)
+        self._save_index(delete)
+
+    def delete_for_entity(self, entity:str, model_hash:str=None):
+        """Delete all stored results of the given results entity, as IFResultsCache.deleteForEntity"""
+        def delete(index:dict):
+            for key, entry in list(index.items()):
+                if entry["entity"] == entity and (model_hash is None or entry["model"] == model_hash):
+                    self._remove(index, key)
+        self._save_index(delete)
+
+    def delete_all(self):
+        """Delete all stored results, as IFResultsCache.deleteAll"""
+        def delete(index:dict):
+            for key in list(index):
+                self._remove(index, key)
+        self._save_index(delete)
+
+
+def extract_results(lusas:'IFModeller', loadset_id:int, entity:str, component:str, location:str, objects:'IFObjectSet') -> tuple[np.ndarray, np.ndarray]:
+    """Extract results of a single component from Modeller using a results context, such that the view is unaffected.
+       Suitable as the extract function of ResultsCache.get_or_extract
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadset_id (int): Loadset ID
+        entity (str): Results entity e.g. "Displacement"
+        component (str): Results component e.g. "DZ"
+        location (str): "Nodal", "ElementNodal", "Gauss" or "Internal"
+        objects (IFObjectSet): Object set containing the nodes or elements
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Node or element IDs and the values, one row per ID padded with nan
+    """
+    if location != "Nodal":
+        from m100_Tools_And_Helpers import Element_Results
+        ids, values = Element_Results.extract_element_results(lusas, loadset_id, entity, [component], location, objects)
+        return ids, values[:, :, 0]
+
+    db = lusas.database()
+    context = lusas.newResultsContext(None)
+    context.getCalcResultsSet().add(objects)
+    loadset = db.getLoadset(loadset_id)
+    if loadset.needsPrimaryComponent():
+        context.setActiveLoadsetAssocVal(entity, component, loadset)
+    else:
+        context.setActiveLoadset(loadset)
+    results = db.getResultsComponentSet(entity, component, location, context)
+    i_comp = results.getComponentNumber(component)
+
+    from m100_Tools_And_Helpers.Results_Utils import invalid_to_nan
+    nodes = objects.getObjects("Node")
+    ids = np.array([n.getID() for n in nodes], dtype=np.int64)
+    values = np.array([results.getContinuousResults(i_comp, n, None, None) for n in nodes], dtype=float)
+    return ids, invalid_to_nan(values.reshape(-1, 1))
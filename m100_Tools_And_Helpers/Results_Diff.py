@@ -0,0 +1,223 @@
+# This file compares the results of two revisions of a model, to find which results moved after an edit and re-solve,
+# in place of comparing the tables of the Print Results Wizard of #02a by hand.
+# Either side can be results read from an open model by Results_Query, tables of PRW_Export, or results stored in a
+# Results_Cache, all being normalised to one long table with a row per entity, loadset, node or element, point and
+# component. Rows are aligned by ID, or, where the mesh was regenerated, through a one to one map from the new IDs to
+# the nearest old ones found by position with the spatial hash of Coincident_Nodes.
+# The point of a result of PRW_Export is the ID of its node, while that of Results_Query and Results_Cache is its
+# position within the element, so tables of PRW_Export can only be compared with each other.
+# The tables are merged a block of loadsets at a time, so that very large tables are compared with bounded memory, and
+# reduced to the largest absolute and relative differences of each entity, loadset and component, and the largest
+# individual changes, which can be saved as CSV or as a compact HTML page.
+
+import warnings
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+# Columns identifying a result
+KEYS = ["entity", "loadset", "extreme", "id", "point", "component"]
+
+# Columns of the summary, one row per group of results
+GROUPS = ["entity", "loadset", "extreme", "component"]
+
+# Meaning of the "point" of a normalised table: the position of the result within its element, or the ID of its node
+POINT_TYPES = ["index", "node"]
+
+@dataclass
+class ResultsDiff:
+    """Differences between two sets of results"""
+    # One row per entity, loadset, extreme and component with the number of rows, the rows only in one set, the largest
+    # absolute and relative differences, where the largest absolute difference is and its old and new values
+    summary: pd.DataFrame
+    # The individual results with the largest absolute differences
+    top: pd.DataFrame
+
+    def get_changed(self, tolerance:float=1e-6, relative:bool=True) -> pd.DataFrame:
+        """Groups with a difference above the tolerance, or with rows in only one of the sets"""
+        column = "max_rel_diff" if relative else "max_abs_diff"
+        changed = (self.summary[column] > tolerance) | (self.summary["only_old"] > 0) | (self.summary["only_new"] > 0)
+        return self.summary[changed]
+
+    def to_csv(self, prefix:str):
+        """Save the summary and the top changes to <prefix>_summary.csv and <prefix>_top.csv"""
+        self.summary.to_csv(f"{prefix}_summary.csv", index=False)
+        self.top.to_csv(f"{prefix}_top.csv", index=False)
+
+    def to_html(self, filename:str, title:str="Results differences", tolerance:float=1e-6):
+        """Save a compact HTML page of the changed groups and the top changes"""
+        changed = self.get_changed(tolerance)
+        parts = [f"<html><head><meta charset='utf-8'><title>{title}</title>",
+                 "<style>body{font-family:sans-serif;font-size:12px} table{border-collapse:collapse} "
+                 "td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}</style></head><body>",
+                 f"<h2>{title}</h2>",
+                 f"<p>{len(changed)} of {len(self.summary)} groups changed by more than {tolerance:g} relative, "
+                 f"{int(self.summary['only_old'].sum())} results only in the old set, {int(self.summary['only_new'].sum())} only in the new set</p>",
+                 "<h3>Changed groups</h3>", changed.sort_values("max_rel_diff", ascending=False).to_html(index=False, float_format="{:.6g}".format),
+                 "<h3>Largest changes</h3>", self.top.to_html(index=False, float_format="{:.6g}".format), "</body></html>"]
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("\n".join(parts))
+
+
+def normalise(frame:pd.DataFrame, entity:str=None) -> pd.DataFrame:
+    """Long table of KEYS, "value" and "point_type" from a tidy frame of Results_Query or a frame of PRW_Export
+
+    Args:
+        frame (pd.DataFrame): Results
+        entity (str): Results entity, if the frame does not have an "entity" column
+    """
+    frame = frame.reset_index() if frame.index.names[0] is not None else frame.copy()
+    if "element" in frame.columns and "node" in frame.columns:
+        # PRW_Export, the node of each element is its point
+        frame = frame.rename(columns={"element": "id", "node": "point"})
+        frame["point_type"] = "node"
+    else:
+        frame = frame.rename(columns={"element": "id", "node": "id"})
+    if "point_type" not in frame.columns:
+        frame["point_type"] = "index"
+    if "entity" not in frame.columns:
+        frame["entity"] = entity if entity is not None else ""
+    if "extreme" not in frame.columns:
+        frame["extreme"] = ""
+    if "point" not in frame.columns:
+        frame["point"] = 0
+    frame = frame[KEYS + ["value", "point_type"]].astype({"entity": str, "loadset": np.int64, "extreme": str, "id": np.int64, "component": str})
+    frame["point"] = pd.to_numeric(frame["point"], errors="coerce").fillna(0).astype(np.int64)
+    frame["value"] = frame["value"].astype(float)
+    frame["point_type"] = pd.Categorical(frame["point_type"].astype(str), categories=POINT_TYPES)
+    return frame
+
+
+def extract(lusas:'IFModeller', requests:list[tuple[str, list[str], str]], loadsets:'list[int | IFLoadset]', objects:'IFObjectSet'=None,
+            transform:'str | Callable'=None) -> pd.DataFrame:
+    """Results of an open model for comparison, with Results_Query
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller, of either revision
+        requests (list[tuple[str, list[str], str]]): Entity, components and location of each set of results, e.g.
+                                                     ("Displacement", ["DX", "DZ"], "Nodal")
+        loadsets (list[int | IFLoadset]): Loadsets, with the same IDs in both revisions
+        objects (IFObjectSet): Nodes or elements, default is all of them
+        transform (str | Callable): As Results_Query.query
+
+    Returns:
+        pd.DataFrame: Long table of KEYS and "value"
+    """
+    from m100_Tools_And_Helpers import Results_Query
+    frames = [normalise(Results_Query.query(lusas, entity, components, loadsets, location, objects, transform=transform), entity)
+              for entity, components, location in requests]
+    return pd.concat(frames, ignore_index=True) if frames else normalise(pd.DataFrame(columns=KEYS + ["value"]))
+
+
+def from_cache(cache:'ResultsCache', model_hash:str, loadset_ids:list[int], entity:str, components:list[str], location:str) -> pd.DataFrame:
+    """Results stored in a Results_Cache.ResultsCache, as a long table of KEYS and "value". Results not stored are left out"""
+    frames = []
+    for loadset_id in loadset_ids:
+        for component in components:
+            stored = cache.get(model_hash, loadset_id, entity, component, location)
+            if stored is None:
+                continue
+            ids, values = np.asarray(stored[0]), np.asarray(stored[1], dtype=float).reshape(len(stored[0]), -1)
+            n_points = values.shape[1]
+            frame = pd.DataFrame({"entity": entity, "loadset": int(loadset_id), "extreme": "", "id": np.repeat(ids, n_points),
+                                  "point": np.tile(np.arange(n_points), len(ids)), "component": component, "value": values.reshape(-1)})
+            frames.append(frame[~np.isnan(frame["value"].to_numpy())])
+    return normalise(pd.concat(frames, ignore_index=True)) if frames else normalise(pd.DataFrame(columns=KEYS + ["value"]))
+
+
+def map_by_position(old_ids:np.ndarray, old_xyz:np.ndarray, new_ids:np.ndarray, new_xyz:np.ndarray, tolerance:float) -> pd.Series:
+    """Map the IDs of the new revision to the IDs of the nearest old nodes or elements, e.g. from Helpers.get_node_table,
+       or element centroids, for meshes that have been regenerated. Each old ID is matched to at most one new ID, its nearest
+
+    Args:
+        tolerance (float): Largest distance of a match, new IDs without an old node or element this close are not mapped
+
+    Returns:
+        pd.Series: Old ID indexed by new ID
+    """
+    from m100_Tools_And_Helpers.Coincident_Nodes import find_coincident_nodes
+    old_ids, new_ids = np.asarray(old_ids, dtype=np.int64), np.asarray(new_ids, dtype=np.int64)
+    n_old = len(old_ids)
+    # Search both sets together by position, keeping the pairs of one old and one new
+    pairs = find_coincident_nodes(np.arange(n_old + len(new_ids)), np.vstack([np.asarray(old_xyz, dtype=float).reshape(-1, 3),
+                                                                              np.asarray(new_xyz, dtype=float).reshape(-1, 3)]), tolerance)
+    a, b = pairs["Node A"].to_numpy(), pairs["Node B"].to_numpy()
+    across = (a < n_old) & (b >= n_old)
+    matches = pd.DataFrame({"new": new_ids[b[across] - n_old], "old": old_ids[a[across]], "distance": pairs["Distance"].to_numpy()[across]})
+    # The nearest old of each new, then the nearest of the new claiming each old, so that the map is one to one
+    nearest = matches.sort_values("distance", kind="stable").drop_duplicates("new").drop_duplicates("old")
+    return pd.Series(nearest["old"].to_numpy(), index=pd.Index(nearest["new"].to_numpy(), name="new"), name="old").sort_index()
+
+
+def _blocks(loadsets:np.ndarray, counts:np.ndarray, block_rows:int) -> list[np.ndarray]:
+    # Consecutive loadsets with about block_rows rows together
+    blocks, first, rows = [], 0, 0
+    for i, count in enumerate(counts):
+        rows += count
+        if rows >= block_rows:
+            blocks.append(loadsets[first:i + 1])
+            first, rows = i + 1, 0
+    if first < len(loadsets):
+        blocks.append(loadsets[first:])
+    return blocks
+
+
+def compare(old:pd.DataFrame, new:pd.DataFrame, id_map:pd.Series=None, floor:float=1e-3, top:int=50, block_rows:int=1_000_000) -> ResultsDiff:
+    """Compare two sets of results
+
+    Args:
+        old (pd.DataFrame): Results of the old revision, as normalise, extract or from_cache
+        new (pd.DataFrame): Results of the new revision
+        id_map (pd.Series): Old ID indexed by new ID, from map_by_position, applied to the new results. New IDs mapped to
+                            an old ID that other new IDs are also mapped to are not matched, with a warning
+        floor (float): Relative differences are relative to the old value, but at least this fraction of the largest old
+                       value of the group, so that results near zero do not give huge relative differences
+        top (int): Number of individual changes to report
+        block_rows (int): Rows of the old results merged at once
+
+    Returns:
+        ResultsDiff: Summary of each group and the largest changes
+    """
+    old, new = normalise(old), normalise(new)
+    point_types = set(old["point_type"].dropna().unique()) | set(new["point_type"].dropna().unique())
+    if len(point_types) > 1:
+        raise ValueError("Results of PRW_Export, whose points are node IDs, cannot be compared with results whose points are positions within the element")
+    old, new = old.drop(columns="point_type"), new.drop(columns="point_type")
+    if id_map is not None:
+        claimed = id_map.duplicated(keep=False).to_numpy()
+        if claimed.any():
+            warnings.warn(f"{int(claimed.sum())} new IDs are mapped to old IDs mapped to more than once, their results are treated as only in the new set")
+            id_map = id_map[~claimed]
+        mapped = id_map.reindex(new["id"].to_numpy()).to_numpy()
+        new = new.assign(id=np.where(np.isnan(mapped), -1, mapped).astype(np.int64))
+        # New results without an old match are reported as only in the new set, by ID
+        new.loc[new["id"] < 0, "id"] = -1 - np.arange(int((new["id"] < 0).sum()))
+    counts = old["loadset"].value_counts().add(new["loadset"].value_counts(), fill_value=0).sort_index()
+    blocks = _blocks(counts.index.to_numpy(), counts.to_numpy(), block_rows)
+
+    summaries, tops = [], []
+    for block in blocks:
+        merged = old[old["loadset"].isin(block)].merge(new[new["loadset"].isin(block)], on=KEYS, how="outer", suffixes=("_old", "_new"))
+        value_old, value_new = merged["value_old"].to_numpy(), merged["value_new"].to_numpy()
+        merged["abs_diff"] = np.abs(value_new - value_old)
+        scale = merged["value_old"].abs().groupby([merged[g] for g in GROUPS], sort=False).transform("max").fillna(0.0).to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denominator = np.maximum(np.abs(value_old), floor * scale)
+            merged["rel_diff"] = np.where(denominator > 0, merged["abs_diff"].to_numpy() / denominator, np.where(merged["abs_diff"] > 0, np.inf, 0.0))
+        merged["only_old"] = np.isnan(value_new) & ~np.isnan(value_old)
+        merged["only_new"] = np.isnan(value_old) & ~np.isnan(value_new)
+
+        grouped = merged.groupby(GROUPS, sort=True)
+        summary = grouped.agg(rows=("abs_diff", "size"), only_old=("only_old", "sum"), only_new=("only_new", "sum"),
+                              max_abs_diff=("abs_diff", "max"), max_rel_diff=("rel_diff", "max"))
+        # Where the largest absolute difference of each group is
+        largest = merged.loc[merged["abs_diff"].fillna(-1.0).groupby([merged[g] for g in GROUPS], sort=True).idxmax()]
+        largest = largest.set_index(GROUPS)[["id", "point", "value_old", "value_new"]]
+        summaries.append(summary.join(largest).fillna({"max_abs_diff": 0.0, "max_rel_diff": 0.0}))
+        tops.append(merged[merged["abs_diff"] > 0].nlargest(top, "abs_diff")[KEYS + ["value_old", "value_new", "abs_diff", "rel_diff"]])
+
+    columns = GROUPS + ["rows", "only_old", "only_new", "max_abs_diff", "max_rel_diff", "id", "point", "value_old", "value_new"]
+    summary = pd.concat(summaries).reset_index()[columns] if summaries else pd.DataFrame(columns=columns)
+    top_changes = pd.concat(tops).nlargest(top, "abs_diff").reset_index(drop=True) if tops else pd.DataFrame(columns=KEYS)
+    return ResultsDiff(summary, top_changes)
+
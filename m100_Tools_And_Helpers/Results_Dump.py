@@ -0,0 +1,256 @@
+# This file reads the files written by IFResultsComponentSet.dumpToFile, such that the results of a whole model can be
+# written by Modeller in a single call and read without any further calls to Modeller.
+# dumpToFile writes three files:
+#   - a text header of "Key = Value" lines describing the results: entity, components, location, loadset and the
+#     names of the other two files
+#   - the body, one record per results point: loadset ID, node or element ID, point index within the element and
+#     the value of each component. As text, one record per line separated by whitespace, or as binary, packed little
+#     endian records of three int32 and a float64 per component
+#   - any errors, as text
+# The body is never read into memory as a whole. Text bodies are parsed in chunks of rows and binary bodies are
+# memory-mapped. Missing results, written by LUSAS as the smallest double, are read as nan.
+#
+# EXPERIMENTAL: the layout of the files above is assumed, it has not been checked against files written by Modeller.
+# The sample files in DataFiles/Results Dump are synthetic, written by write_dump, as are the files of the stand ins
+# for Modeller in tests. No other module reads results through this file, and the layout should be checked against
+# files written by the version of Modeller in use before relying on it.
+
+import os
+from dataclasses import dataclass
+from typing import Iterator
+import numpy as np
+
+# Number of rows parsed at once from text bodies
+CHUNK_ROWS = 100_000
+
+# Columns of each record preceding the component values
+ID_COLUMNS = ["loadset", "id", "point"]
+
+
+def get_record_dtype(n_components:int) -> np.dtype:
+    """Layout of the records of a binary body"""
+    return np.dtype([("loadset", "<i4"), ("id", "<i4"), ("point", "<i4"), ("values", "<f8", (n_components,))])
+
+
+@dataclass
+class DumpHeader:
+    """Contents of the header file written by dumpToFile"""
+    entity: str
+    components: list[str]
+    location: str
+    loadset: int
+    body_file: str
+    error_file: str
+    file_type: str
+    # All entries of the header, keyed by the lower case key
+    entries: dict[str, str]
+
+
+@dataclass
+class DumpChunk:
+    """Consecutive records of a dump body"""
+    loadset: np.ndarray
+    id: np.ndarray
+    point: np.ndarray
+    # (n_records, n_components)
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+def read_header(filename:str) -> DumpHeader:
+    """Read the header file written by dumpToFile, experimental. The body and error files are relative to the folder of the header
+
+    Args:
+        filename (str): Header file, the first file given to dumpToFile
+
+    Returns:
+        DumpHeader: Description of the results and the location of the body
+    """
+    entries = {}
+    with open(filename) as f:
+        for line in f:
+            key, separator, value = line.partition("=")
+            if separator:
+                entries[key.strip().lower()] = value.strip()
+    folder = os.path.dirname(os.path.abspath(filename))
+    return DumpHeader(entity=entries.get("entity", ""),
+                      components=[c.strip() for c in entries["components"].split(",") if c.strip()],
+                      location=entries.get("location", ""),
+                      loadset=int(entries.get("loadset", 0)),
+                      body_file=os.path.join(folder, entries["body file"]),
+                      error_file=os.path.join(folder, entries["error file"]) if entries.get("error file") else None,
+                      file_type=entries.get("file type", "text").lower(),
+                      entries=entries)
+
+
+def read_errors(header:'DumpHeader | str') -> list[str]:
+    """Lines of the error file, e.g. where a design check has been applied to an inappropriate member"""
+    header = header if isinstance(header, DumpHeader) else read_header(header)
+    if header.error_file is None or not os.path.exists(header.error_file):
+        return []
+    with open(header.error_file) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def iter_chunks(header:'DumpHeader | str', chunk_rows:int=CHUNK_ROWS) -> Iterator[DumpChunk]:
+    """Iterate over the body in chunks of records, without reading the whole file into memory
+
+    Args:
+        header (DumpHeader | str): Header or header file
+        chunk_rows (int): Number of records in each chunk
+
+    Yields:
+        DumpChunk: Consecutive records. The values are copies, the ID columns of binary bodies are memory-mapped
+    """
+    from m100_Tools_And_Helpers.Results_Utils import invalid_to_nan
+    header = header if isinstance(header, DumpHeader) else read_header(header)
+    n_components = len(header.components)
+    if header.file_type == "binary":
+        records = np.memmap(header.body_file, dtype=get_record_dtype(n_components), mode="r")
+        for start in range(0, len(records), chunk_rows):
+            chunk = records[start:start + chunk_rows]
+            yield DumpChunk(chunk["loadset"], chunk["id"], chunk["point"], invalid_to_nan(np.array(chunk["values"], dtype=float)))
+        del records
+        return
+
+    import pandas as pd
+    # The C parser of pandas reads the rows in chunks, "\s+" accepts any mixture of spaces and tabs.
+    # Values are parsed exactly, such that text and binary bodies give the same results
+    reader = pd.read_csv(header.body_file, sep=r"\s+", header=None, comment="#", chunksize=chunk_rows,
+                         names=ID_COLUMNS + header.components, dtype={c: np.int64 for c in ID_COLUMNS}, float_precision="round_trip")
+    with reader:
+        for frame in reader:
+            yield DumpChunk(frame["loadset"].to_numpy(), frame["id"].to_numpy(), frame["point"].to_numpy(),
+                            invalid_to_nan(frame[header.components].to_numpy(dtype=float)))
+
+
+def iter_record_batches(header:'DumpHeader | str', chunk_rows:int=CHUNK_ROWS) -> Iterator['pa.RecordBatch']:
+    """Iterate over the body as Arrow record batches, with the columns loadset, id, point and one per component. Requires pyarrow"""
+    import pyarrow as pa
+    header = header if isinstance(header, DumpHeader) else read_header(header)
+    for chunk in iter_chunks(header, chunk_rows):
+        columns = [pa.array(np.asarray(a)) for a in (chunk.loadset, chunk.id, chunk.point)]
+        columns += [pa.array(chunk.values[:, j], from_pandas=True) for j in range(len(header.components))]
+        yield pa.RecordBatch.from_arrays(columns, names=ID_COLUMNS + header.components)
+
+
+def iter_blocks(header:'DumpHeader | str', chunk_rows:int=CHUNK_ROWS) -> Iterator[tuple[int, int, str, np.ndarray]]:
+    """Iterate over the results of each node or element, one component at a time
+
+    Args:
+        header (DumpHeader | str): Header or header file
+        chunk_rows (int): Number of records read at once
+
+    Yields:
+        tuple[int, int, str, np.ndarray]: Loadset ID, node or element ID, component and the values at each point
+    """
+    header = header if isinstance(header, DumpHeader) else read_header(header)
+    pending = None
+    for chunk in iter_chunks(header, chunk_rows):
+        if pending is not None:
+            chunk = DumpChunk(*(np.concatenate([a, b]) for a, b in zip(_fields(pending), _fields(chunk))))
+        # Start of each run of records of the same loadset and ID
+        change = np.flatnonzero((np.diff(chunk.id) != 0) | (np.diff(chunk.loadset) != 0)) + 1
+        starts = np.concatenate([[0], change])
+        ends = np.concatenate([change, [len(chunk)]])
+        # The last run may continue into the next chunk
+        for start, end in zip(starts[:-1], ends[:-1]):
+            yield from _block(header, chunk, start, end)
+        pending = DumpChunk(*(a[starts[-1]:] for a in _fields(chunk)))
+    if pending is not None and len(pending) > 0:
+        yield from _block(header, pending, 0, len(pending))
+
+
+def _fields(chunk:DumpChunk) -> tuple:
+    return chunk.loadset, chunk.id, chunk.point, chunk.values
+
+
+def _block(header:DumpHeader, chunk:DumpChunk, start:int, end:int) -> Iterator[tuple[int, int, str, np.ndarray]]:
+    order = np.argsort(chunk.point[start:end], kind="stable") + start
+    for j, component in enumerate(header.components):
+        yield int(chunk.loadset[start]), int(chunk.id[start]), component, chunk.values[order, j]
+
+
+def read_dense(header:'DumpHeader | str', components:list[str]=None, chunk_rows:int=CHUNK_ROWS) -> tuple[np.ndarray, np.ndarray]:
+    """Read the body into a dense array, as returned by Element_Results.extract_element_results
+
+    Args:
+        header (DumpHeader | str): Header or header file
+        components (list[str]): Components to read, not case sensitive. Default is all components of the dump
+        chunk_rows (int): Number of records read at once
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Node or element IDs in the order of the file, and the (n_ids, n_points, n_components)
+                                       values padded with nan
+    """
+    header = header if isinstance(header, DumpHeader) else read_header(header)
+    names = [c.lower() for c in header.components]
+    columns = [names.index(c.lower()) for c in components] if components is not None else list(range(len(names)))
+
+    # Only the ID columns and the requested components are kept, a fraction of the size of a text body
+    ids, points, values = [], [], []
+    for chunk in iter_chunks(header, chunk_rows):
+        ids.append(np.array(chunk.id, dtype=np.int64))
+        points.append(np.array(chunk.point, dtype=np.int64))
+        values.append(chunk.values[:, columns])
+    ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+    points = np.concatenate(points) if points else np.empty(0, dtype=np.int64)
+    values = np.concatenate(values) if values else np.empty((0, len(columns)))
+
+    unique_ids, first, rows = np.unique(ids, return_index=True, return_inverse=True)
+    # Rows in the order the IDs first appear in the file
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    dense = np.full((len(unique_ids), points.max(initial=-1) + 1, len(columns)), np.nan)
+    dense[rank[rows], points] = values
+    return unique_ids[order], dense
+
+
+def write_dump(header_file:str, body_file:str, error_file:str, entity:str, components:list[str], location:str, loadset:int,
+               ids:np.ndarray, values:np.ndarray, file_type:str="text", errors:list[str]=None):
+    """Write synthetic results in the layout assumed for dumpToFile, e.g. to produce sample files or for stand ins for Modeller
+
+    Args:
+        header_file (str): Header file to write
+        body_file (str): Body file to write
+        error_file (str): Error file to write
+        entity (str): Results entity
+        components (list[str]): Names of the components
+        location (str): Location type, e.g. "Internal"
+        loadset (int): Loadset ID
+        ids (np.ndarray): Node or element IDs
+        values (np.ndarray): (n_ids, n_points, n_components) results. Points which are nan for every component are not written
+        file_type (str): "text" or "binary"
+        errors (list[str]): Lines of the error file
+    """
+    from m100_Tools_And_Helpers.Results_Utils import MISSING_VALUE
+    ids, values = np.asarray(ids), np.asarray(values, dtype=float)
+    row, point = np.nonzero(~np.isnan(values).all(axis=2))
+    with open(header_file, "w") as f:
+        f.write("Synthetic results component set, written by Results_Dump.write_dump rather than by Modeller\n")
+        for key, value in [("Entity", entity), ("Components", ",".join(components)), ("Location", location), ("Loadset", loadset),
+                           ("Body file", os.path.relpath(body_file, os.path.dirname(os.path.abspath(header_file)))),
+                           ("Error file", os.path.relpath(error_file, os.path.dirname(os.path.abspath(header_file)))),
+                           ("File type", file_type), ("Records", len(row))]:
+            f.write(f"{key} = {value}\n")
+    with open(error_file, "w") as f:
+        f.writelines(f"{line}\n" for line in errors or [])
+
+    # Missing values of points with results are written as the smallest double, as LUSAS does
+    record_values = np.nan_to_num(values[row, point], nan=MISSING_VALUE)
+    if file_type == "binary":
+        records = np.empty(len(row), dtype=get_record_dtype(len(components)))
+        records["loadset"], records["id"], records["point"], records["values"] = loadset, ids[row], point, record_values
+        records.tofile(body_file)
+        return
+    with open(body_file, "w") as f:
+        for start in range(0, len(row), CHUNK_ROWS):
+            rows = slice(start, start + CHUNK_ROWS)
+            table = np.column_stack([np.full(len(row[rows]), loadset), ids[row[rows]], point[rows]]).astype(np.int64)
+            # 17 significant figures preserve the full precision of a double
+            lines = [" ".join(map(str, r)) + " " + " ".join(f"{v:.17g}" for v in vals) for r, vals in zip(table.tolist(), record_values[rows].tolist())]
+            f.write("\n".join(lines) + "\n")
+
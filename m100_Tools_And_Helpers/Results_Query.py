@@ -0,0 +1,198 @@
+# This file provides a single function, query, returning results of any entity as a pandas DataFrame, in place of the
+# pattern repeated in the notebooks: create a context, set the active loadset, get the results component set, look up
+# the component number and loop over the objects.
+# The loadsets are first planned into steps. A loadcase or combination needs one loadset switch and one results component
+# set for all the components. An envelope or smart combination gives a max and a min entry, its associated loadset,
+# each needing one switch and one results component set per component, as the loadset differs between components.
+# A single results context is used for all the steps, so the calculation set and transformation are only set once.
+# Results are read by Element_Results and Nodal_Results.
+# iter_query yields the results of one entry of the loadset axis at a time, for processing with bounded memory.
+
+from dataclasses import dataclass
+from typing import Callable, Iterator
+import numpy as np
+import pandas as pd
+
+LOCATIONS = ["Nodal", "ElementNodal", "Gauss", "Internal", "Averaged"]
+
+FORMATS = ["tidy", "wide"]
+
+# "array" and "continuous" are the same, requesting the results of each element or node
+METHODS = ["array", "continuous"]
+
+TRANSFORMS = {"Global": "setResultsTransformGlobal", "None": "setResultsTransformNone",
+              "Element": "setResultsTransformElement", "Feature": "setResultsTransformFeature"}
+
+@dataclass
+class QueryStep:
+    """One loadset of a query and the components read from one results component set of it"""
+    loadset: 'IFLoadset'
+    # Loadset ID and name of the entry of the loadset axis, and "max", "min" or "" for loadsets without max and min
+    loadset_id: int
+    name: str
+    extreme: str
+    components: list[str]
+    # Set with setActiveLoadsetAssocVal for the first component, rather than setActiveLoadset
+    associated: bool
+    # Position of the entry on the loadset axis. Results loadsets, e.g. eigenvalues, share the ID of their loadcase
+    entry: int = 0
+
+
+def plan_query(db:'IFDatabase', components:list[str], loadsets:'list[int | IFLoadset]') -> list[QueryStep]:
+    """Plan the loadset switches and results component sets of a query
+
+    Args:
+        db (IFDatabase): Reference to the database
+        components (list[str]): Results components
+        loadsets (list[int | IFLoadset]): Loadsets or their IDs, IDs that do not exist are left out
+
+    Returns:
+        list[QueryStep]: Steps in the order of the loadsets, the steps of one entry of the loadset axis being consecutive
+    """
+    from m100_Tools_And_Helpers.Nodal_Results import get_extreme_loadsets
+    steps, entry = [], 0
+    for loadset in loadsets:
+        if isinstance(loadset, (int, np.integer)):
+            if not db.existsLoadset(int(loadset)):
+                continue
+            loadset = db.getLoadset(int(loadset))
+        if not loadset.needsPrimaryComponent():
+            steps.append(QueryStep(loadset, loadset.getID(), loadset.getName(), "", list(components), False, entry))
+            entry += 1
+            continue
+        for extreme, target in get_extreme_loadsets(loadset):
+            id, name = target.getID(), target.getName()
+            steps.extend(QueryStep(target, id, name, extreme, [c], True, entry) for c in components)
+            entry += 1
+    return steps
+
+
+def _set_transform(context:'IFResultsContext', transform:'str | Callable'):
+    if transform is None:
+        return
+    if callable(transform):
+        transform(context)
+        return
+    assert transform in TRANSFORMS, f"Transform must be one of {list(TRANSFORMS)} or a function of the context"
+    getattr(context, TRANSFORMS[transform])()
+
+
+def _to_frame(step:QueryStep, ids:np.ndarray, values:np.ndarray, components:list[str], id_name:str, format:str) -> pd.DataFrame:
+    # values is (n_ids, n_points, n_components)
+    n_ids, n_points, n_components = values.shape
+    index = {"loadset": np.full(n_ids * n_points, step.loadset_id, dtype=np.int64),
+             "extreme": np.full(n_ids * n_points, step.extreme, dtype=object),
+             id_name: np.repeat(ids, n_points),
+             "point": np.tile(np.arange(n_points, dtype=np.int64), n_ids)}
+    rows = values.reshape(-1, n_components)
+    keep = ~np.isnan(rows).all(axis=1)
+    if format == "wide":
+        frame = pd.DataFrame(rows[keep], columns=components)
+        frame.index = pd.MultiIndex.from_arrays([v[keep] for v in index.values()], names=list(index))
+        return frame
+    frame = pd.DataFrame({key: np.repeat(v[keep], n_components) for key, v in index.items()})
+    frame["component"] = pd.Categorical.from_codes(np.tile(np.arange(n_components), int(keep.sum())), categories=components)
+    frame["value"] = rows[keep].reshape(-1)
+    return frame[~np.isnan(frame["value"].to_numpy())].reset_index(drop=True)
+
+
+def iter_query(lusas:'IFModeller', entity:str, components:'list[str] | str', loadsets:'list[int | IFLoadset]', location:str="Nodal",
+               objects:'IFObjectSet'=None, units:'IFUnitSet'=None, transform:'str | Callable'=None, format:str="tidy",
+               method:str="array") -> Iterator[pd.DataFrame]:
+    """Results of each entry of the loadset axis in turn, as query
+
+    Yields:
+        pd.DataFrame: Results of one loadset, or of the max or min of an envelope or smart combination
+    """
+    from m100_Tools_And_Helpers import Element_Results, Nodal_Results
+    assert location in LOCATIONS, f"Location must be one of {LOCATIONS}"
+    assert format in FORMATS, f"Format must be one of {FORMATS}"
+    assert method in METHODS, f"Method must be one of {METHODS}"
+    if isinstance(components, str):
+        components = [components]
+
+    db = lusas.database()
+    if objects is None:
+        objects = lusas.newObjectSet().add("Node" if location == "Nodal" else "Element")
+    steps = plan_query(db, components, loadsets)
+
+    # One context for all the steps
+    context = lusas.newResultsContext(None)
+    context.getCalcResultsSet().add(objects)
+    _set_transform(context, transform)
+
+    # Nodes or elements are only fetched once for all the steps, elements if they are requested one at a time
+    if location == "Nodal":
+        nodes = objects.getObjects("Node")
+        node_ids = np.array([n.getID() for n in nodes], dtype=np.int64)
+        readers = {}
+    elements = None
+    result_location = Element_Results.LOCATIONS[location][0] if location != "Nodal" else "Nodal"
+
+    entry, parts = None, []
+    for step in steps + [None]:
+        key = None if step is None else step.entry
+        if parts and key != entry:
+            # All the components of the previous entry have been read
+            first = parts[0][0]
+            ids = parts[0][1]
+            n_points = max(p[2].shape[1] for p in parts)
+            values = np.concatenate([np.pad(p[2], ((0, 0), (0, n_points - p[2].shape[1]), (0, 0)), constant_values=np.nan) for p in parts], axis=2)
+            frame = _to_frame(first, ids, values, components, "node" if location == "Nodal" else "element", format)
+            yield frame
+            parts = []
+        if step is None:
+            break
+        entry = key
+
+        if step.associated:
+            context.setActiveLoadsetAssocVal(entity, step.components[0], step.loadset)
+        else:
+            context.setActiveLoadset(step.loadset)
+        results = db.getResultsComponentSet(entity, step.components[0], result_location, context)
+
+        if location == "Nodal":
+            reader_key = tuple(step.components)
+            if reader_key not in readers:
+                readers[reader_key] = Nodal_Results.NodalReader(nodes, node_ids, step.components, "continuous", units)
+            ids, values = node_ids, readers[reader_key].read(results)[:, None, :]
+        else:
+            sets = [(results, results.getComponentNumber(c)) for c in step.components]
+            ids, values = Element_Results.read_element_results(db, sets, location, objects, 1, units, elements)
+            if elements is None:
+                elements = (objects.getObjects("Element"), ids)
+        if parts and not np.array_equal(ids, parts[0][1]):
+            raise ValueError("Results of the components of a loadset are of different nodes or elements")
+        parts.append((step, ids, values))
+
+
+def query(lusas:'IFModeller', entity:str, components:'list[str] | str', loadsets:'list[int | IFLoadset]', location:str="Nodal",
+          objects:'IFObjectSet'=None, units:'IFUnitSet'=None, transform:'str | Callable'=None, format:str="tidy",
+          method:str="array") -> pd.DataFrame:
+    """Results of many components and loadsets as a DataFrame, without changing the view
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        entity (str): Results entity e.g. "Displacement" or "Force/Moment - Thick 3D Beam"
+        components (list[str] | str): Results components e.g. ["DX", "DZ"]
+        loadsets (list[int | IFLoadset]): Loadsets or their IDs. Envelopes and smart combinations give a max and a min entry
+        location (str): "Nodal", "ElementNodal", "Gauss", "Internal" or "Averaged"
+        objects (IFObjectSet): Nodes or elements, default is all of them
+        units (IFUnitSet): Units of the results. Default is the units of the model
+        transform (str | Callable): "Global", "None", "Element" or "Feature", or a function setting the transformation of
+                                    the results context. Default is that of a new results context
+        format (str): "tidy" for one row per value, with the columns loadset, extreme, node or element, point, component
+                      and value. "wide" for one column per component, indexed by (loadset, extreme, node or element, point)
+        method (str): "array" or "continuous", both requesting the results of each node or element
+
+    Returns:
+        pd.DataFrame: The results, missing results being left out
+    """
+    if isinstance(components, str):
+        components = [components]
+    frames = list(iter_query(lusas, entity, components, loadsets, location, objects, units, transform, format, method))
+    if frames:
+        return pd.concat(frames, ignore_index=format == "tidy")
+    columns = ["loadset", "extreme", "node" if location == "Nodal" else "element", "point"]
+    return pd.DataFrame(columns=columns + ["component", "value"]) if format == "tidy" else pd.DataFrame(columns=columns + list(components)).set_index(columns)
+
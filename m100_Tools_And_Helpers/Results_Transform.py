@@ -0,0 +1,224 @@
+# This file rotates results between element local axes, global axes, local coordinate systems and skew axes with numpy,
+# in place of setting setResultsTransformGlobal, setResultsTransformLocal or a results transformation attribute in
+# Modeller and reading the results again for each, as __create_shell_table of User_Tools_Library and #410 and #412 do.
+# Results are read once untransformed, in element local axes, e.g. by Results_Query with transform="None", and the axes
+# of the elements are read once and cached until the mesh changes. Any number of transformed views are then matrix
+# products, without further calls to Modeller.
+# Beam forces and nodal displacements are vectors and solid stresses are tensors, rotated fully in 3D. Shell stress
+# resultants stay in the plane of the shell as in Modeller: the x axis of the target is projected onto the plane of each
+# element, and the in-plane tensors and shear forces are rotated about the element normal by the angle of the projection.
+# The axes of an element are those at its centroid, so shells are taken to be flat and beams straight.
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+# Groups of components rotated together, for each kind of results. Other components are left unchanged
+ELEMENT_TYPES = {
+    "shell": {"tensors": [("Nx", "Ny", "Nxy"), ("Mx", "My", "Mxy"), ("Sx", "Sy", "Sxy")], "vectors": [("Sx", "Sy")]},
+    "beam": {"tensors": [], "vectors": [("Fx", "Fy", "Fz"), ("Mx", "My", "Mz")]},
+    "solid": {"tensors": [("Sx", "Sy", "Sz", "Sxy", "Syz", "Sxz")], "vectors": []},
+    "node": {"tensors": [], "vectors": [("DX", "DY", "DZ"), ("THX", "THY", "THZ"), ("FX", "FY", "FZ"), ("MX", "MY", "MZ")]},
+}
+
+# Axes of the elements of the most recently indexed model, with the stamp of the model when they were read
+_element_axes_cache = {"stamp": None, "ids": np.empty(0, dtype=np.int64), "axes": np.empty((0, 3, 3)), "all": False}
+
+@dataclass
+class ElementAxes:
+    """Axes of elements"""
+    ids: np.ndarray
+    # (n_elements, 3, 3) unit x, y and z axes of each element, as rows, in global coordinates
+    axes: np.ndarray
+
+    def get_rows(self, element_ids:np.ndarray) -> np.ndarray:
+        """(n, 3, 3) axes of the given elements, which must all have axes"""
+        position = np.searchsorted(self.ids, element_ids)
+        assert np.array_equal(self.ids[np.minimum(position, len(self.ids) - 1)], element_ids), "Some elements have no axes"
+        return self.axes[position]
+
+
+def _get_axes(element:'IFElement') -> np.ndarray:
+    # One call, the output arguments origin, x, y and z are returned as a tuple
+    _, x, y, z = tuple(element.getAxes([0.0] * 3, [0.0] * 3, [0.0] * 3, [0.0] * 3))[:4]
+    axes = np.array([x, y, z], dtype=float)
+    return axes / np.linalg.norm(axes, axis=1, keepdims=True)
+
+
+def _get_mesh_stamp(db:'IFDatabase') -> tuple:
+    # The model file, number of elements and modification times of the analyses together change whenever the mesh could have changed
+    return (db.getDBFilename(), db.count("Element"), tuple(a.getModificationTime(False) for a in db.getAnalyses()))
+
+
+def clear_element_axes_cache():
+    """Discard the cached element axes, for example after modifying the mesh within the same second"""
+    _element_axes_cache.update({"stamp": None, "ids": np.empty(0, dtype=np.int64), "axes": np.empty((0, 3, 3)), "all": False})
+
+
+def get_element_axes(lusas:'IFModeller', objects:'IFObjectSet | list[IFElement]'=None) -> ElementAxes:
+    """Axes of elements, read once with IFElement.getAxes and cached until the mesh changes
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        objects (IFObjectSet | list[IFElement]): Elements, or object set containing elements. Default is all elements
+
+    Returns:
+        ElementAxes: Axes of the elements, sorted by ID
+    """
+    db = lusas.database()
+    stamp = _get_mesh_stamp(db)
+    if stamp != _element_axes_cache["stamp"]:
+        clear_element_axes_cache()
+        _element_axes_cache["stamp"] = stamp
+    elif objects is None and _element_axes_cache["all"]:
+        # All the elements are cached, so not even their IDs are needed
+        return ElementAxes(_element_axes_cache["ids"], _element_axes_cache["axes"])
+
+    if objects is None:
+        elements = db.getObjects("Element")
+    elif isinstance(objects, (list, tuple)):
+        elements = objects
+    else:
+        elements = objects.getObjects("Element")
+    ids = np.array([e.getID() for e in elements], dtype=np.int64)
+
+    # Only read the axes of elements that are not already cached
+    cached_ids, cached_axes = _element_axes_cache["ids"], _element_axes_cache["axes"]
+    missing = ~np.isin(ids, cached_ids)
+    if missing.any():
+        new_ids, first = np.unique(ids[missing], return_index=True)
+        new_elements = [e for e, m in zip(elements, missing) if m]
+        new_axes = np.array([_get_axes(new_elements[i]) for i in first]).reshape(-1, 3, 3)
+        order = np.argsort(np.concatenate([cached_ids, new_ids]))
+        _element_axes_cache["ids"] = np.concatenate([cached_ids, new_ids])[order]
+        _element_axes_cache["axes"] = np.concatenate([cached_axes, new_axes])[order]
+
+    _element_axes_cache["all"] = _element_axes_cache["all"] or objects is None
+    unique = np.unique(ids)
+    position = np.searchsorted(_element_axes_cache["ids"], unique)
+    return ElementAxes(unique, _element_axes_cache["axes"][position])
+
+
+def get_frame(target:'str | float | np.ndarray | IFLocalCoord') -> np.ndarray:
+    """(3, 3) unit x, y and z axes, as rows, of a target of a transformation
+
+    Args:
+        target (str | float | np.ndarray | IFLocalCoord): "Global", an angle in degrees of the x axis from global X about
+                                                          global Z e.g. a skew angle, the axes as rows, or a local coordinate attribute
+    """
+    if isinstance(target, str):
+        assert target == "Global", "The only named target is Global"
+        return np.eye(3)
+    if isinstance(target, (int, float, np.integer, np.floating)):
+        c, s = np.cos(np.radians(target)), np.sin(np.radians(target))
+        return np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+    if hasattr(target, "getXVector"):
+        if hasattr(target, "_oleobj_"):
+            import win32com.client as win32
+            target = win32.CastTo(target, "IFLocalCoord")
+        target = [target.getXVector(), target.getYVector(), target.getZVector()]
+    frame = np.asarray(target, dtype=float)
+    return frame / np.linalg.norm(frame, axis=-1, keepdims=True)
+
+
+def get_shell_angles(axes:np.ndarray, frame:np.ndarray) -> np.ndarray:
+    """Angle in radians about the normal of each shell from its x axis to the projection of the x axis of the frame,
+       or of the y axis less 90 degrees where the x axis of the frame is normal to the shell
+
+    Args:
+        axes (np.ndarray): (n, 3, 3) axes of the shells
+        frame (np.ndarray): (3, 3) or (n, 3, 3) target axes
+    """
+    frame = np.broadcast_to(frame, axes.shape)
+    angles = np.arctan2(np.einsum("nj,nj->n", frame[:, 0], axes[:, 1]), np.einsum("nj,nj->n", frame[:, 0], axes[:, 0]))
+    normal = np.abs(np.einsum("nj,nj->n", frame[:, 0], axes[:, 2])) > 1 - 1e-6
+    if normal.any():
+        y_angles = np.arctan2(np.einsum("nj,nj->n", frame[:, 1], axes[:, 1]), np.einsum("nj,nj->n", frame[:, 1], axes[:, 0])) - np.pi / 2
+        angles = np.where(normal, y_angles, angles)
+    return angles
+
+
+def _find(components:list[str], group:tuple) -> list[int]:
+    # Positions of all the components of a group, case insensitive, or an empty list if any is missing
+    lower = [c.lower() for c in components]
+    return [lower.index(c.lower()) for c in group] if all(c.lower() in lower for c in group) else []
+
+
+def transform_array(values:np.ndarray, components:list[str], axes:np.ndarray, target:'str | float | np.ndarray | IFLocalCoord',
+                    element_type:str, inverse:bool=False) -> np.ndarray:
+    """Rotate results from element local axes to a target frame
+
+    Args:
+        values (np.ndarray): (..., n_rows, n_components) results, e.g. (n_loadsets, n_rows, n_components)
+        components (list[str]): Names of the components, see ELEMENT_TYPES for those rotated
+        axes (np.ndarray): (n_rows, 3, 3) axes of the element of each row, or (3, 3) for all. Ignored for "node" results, which are global
+        target (str | float | np.ndarray | IFLocalCoord): See get_frame, or (n_rows, 3, 3) axes of each row
+        element_type (str): One of ELEMENT_TYPES
+        inverse (bool): Rotate from the target frame back to the element axes instead
+
+    Returns:
+        np.ndarray: Rotated results
+    """
+    assert element_type in ELEMENT_TYPES, f"Element type must be one of {list(ELEMENT_TYPES)}"
+    values = np.array(values, dtype=float)
+    n_rows = values.shape[-2]
+    frame = np.broadcast_to(get_frame(target), (n_rows, 3, 3))
+    axes = np.broadcast_to(np.eye(3) if element_type == "node" else np.asarray(axes, dtype=float), (n_rows, 3, 3))
+    groups = ELEMENT_TYPES[element_type]
+
+    if element_type == "shell":
+        theta = get_shell_angles(axes, frame) * (-1 if inverse else 1)
+        c, s = np.cos(theta), np.sin(theta)
+        done = set()
+        for group in groups["tensors"]:
+            index = _find(components, group)
+            if not index or set(index) & done:
+                continue
+            xx, yy, xy = (values[..., i] for i in index)
+            values[..., index[0]], values[..., index[1]], values[..., index[2]] = (
+                xx * c**2 + yy * s**2 + 2 * xy * s * c, xx * s**2 + yy * c**2 - 2 * xy * s * c, (yy - xx) * s * c + xy * (c**2 - s**2))
+            done.update(index)
+        for group in groups["vectors"]:
+            index = _find(components, group)
+            if not index or set(index) & done:
+                continue
+            x, y = values[..., index[0]], values[..., index[1]]
+            values[..., index[0]], values[..., index[1]] = x * c + y * s, -x * s + y * c
+            done.update(index)
+    else:
+        # Rotation from element axes to the target, vectors in element axes are axes.T @ v in global axes
+        rotation = frame @ np.swapaxes(axes, -1, -2)
+        if inverse:
+            rotation = np.swapaxes(rotation, -1, -2)
+        for group in groups["vectors"]:
+            index = _find(components, group)
+            if index:
+                values[..., index] = np.einsum("rij,...rj->...ri", rotation, values[..., index])
+        for group in groups["tensors"]:
+            index = _find(components, group)
+            if not index:
+                continue
+            xx, yy, zz, xy, yz, xz = (values[..., i] for i in index)
+            tensor = np.stack([np.stack([xx, xy, xz], -1), np.stack([xy, yy, yz], -1), np.stack([xz, yz, zz], -1)], -2)
+            rotated = np.einsum("rij,...rjk,rlk->...ril", rotation, tensor, rotation)
+            for i, (a, b) in zip(index, [(0, 0), (1, 1), (2, 2), (0, 1), (1, 2), (0, 2)]):
+                values[..., i] = rotated[..., a, b]
+    return values
+
+
+def transform_frame(frame:pd.DataFrame, axes:'ElementAxes | None', target:'str | float | np.ndarray | IFLocalCoord', element_type:str,
+                    inverse:bool=False) -> pd.DataFrame:
+    """Rotate a wide frame of Results_Query, of results in element local axes, to a target frame. See transform_array
+
+    Args:
+        frame (pd.DataFrame): Results with an "element" or "node" level in the index and one column per component
+        axes (ElementAxes | None): Axes of the elements, from get_element_axes, None for nodal results
+    """
+    if element_type == "node":
+        rows = None
+    else:
+        rows = axes.get_rows(frame.index.get_level_values("element").to_numpy(np.int64))
+    components = list(frame.columns)
+    values = transform_array(frame.to_numpy(dtype=float), components, rows, target, element_type, inverse)
+    return pd.DataFrame(values, index=frame.index, columns=components)
+
@@ -0,0 +1,15 @@
+# This file holds small functions shared by the modules that read results, with no dependencies beyond numpy so that
+# it can be imported without Modeller or win32com.
+# Missing results, e.g. reactions of unsupported nodes or points without results, are returned by LUSAS as the
+# smallest double rather than raising, and are converted to nan here wherever results are read.
+
+import numpy as np
+
+# Value of missing results returned or written by LUSAS
+MISSING_VALUE = np.finfo(float).tiny
+
+
+def invalid_to_nan(values:np.ndarray) -> np.ndarray:
+    """Set missing results, MISSING_VALUE, to nan in place and return the array, which must be of floats"""
+    values[values == MISSING_VALUE] = np.nan
+    return values
@@ -0,0 +1,154 @@
+# This file sums reactions over the support nodes only, rather than asking every node of the model for its reactions.
+# The support nodes are indexed once from the assignments of the support attributes, mapped through the assigned
+# features to their nodes, and the index is kept until the supports, the mesh or the model change.
+# Reactions of all the support nodes for a loadset are then read from one results component set by Nodal_Results,
+# giving total reactions, totals per support attribute and equilibrium checks for many loadsets.
+# Nodal results have no call returning the results of many nodes, so Nodal_Results makes one getContinuousResults call
+# per node and component. Limiting these to the support nodes, typically a small part of the model, is what keeps the
+# number of calls down.
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+REACTION_COMPONENTS = ["FX", "FY", "FZ"]
+
+# Support index of the most recently indexed model, keyed by the stamp of the model at the time it was built
+_support_index_cache = {"stamp": None, "index": None}
+
+@dataclass
+class SupportIndex:
+    """Support nodes of a model"""
+    # Unique IDs of the support nodes, sorted, and the matching IFNode objects
+    node_ids: np.ndarray
+    nodes: list
+    # One row per support node of each assignment, with the columns "support", "feature" and "node"
+    assignments: pd.DataFrame
+
+
+def _get_supports_stamp(db:'IFDatabase', attributes:list) -> tuple:
+    # The analysis modification times change with any change to the model, the assignment counts identify changes
+    # to the supports within the same second
+    return (db.getDBFilename(), db.count("Node"), tuple(a.getModificationTime(False) for a in db.getAnalyses()),
+            tuple((a.getID(), len(a.getAssignments())) for a in attributes))
+
+
+def clear_support_index():
+    """Discard the cached support index, for example after changing the supports within the same second"""
+    _support_index_cache.update({"stamp": None, "index": None})
+
+
+def get_support_index(lusas:'IFModeller') -> SupportIndex:
+    """Get the support nodes of the model, indexed from the support assignments and cached until the supports or model change
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+
+    Returns:
+        SupportIndex: Support nodes and the support assigned to each
+    """
+    db = lusas.database()
+    attributes = db.getAttributes("Support")
+    stamp = _get_supports_stamp(db, attributes)
+    if stamp == _support_index_cache["stamp"]:
+        return _support_index_cache["index"]
+
+    rows, nodes = [], {}
+    for attr in attributes:
+        name = attr.getName()
+        for assignment in attr.getAssignments():
+            feature = assignment.getDatabaseObject()
+            feature_name = f"{feature.getTypeName()} {feature.getID()}"
+            for node in feature.getNodes():
+                id = node.getID()
+                nodes.setdefault(id, node)
+                rows.append((name, feature_name, id))
+
+    node_ids = np.array(sorted(nodes), dtype=np.int64)
+    index = SupportIndex(node_ids, [nodes[id] for id in node_ids.tolist()],
+                         pd.DataFrame(rows, columns=["support", "feature", "node"]).astype({"node": np.int64}))
+    _support_index_cache.update({"stamp": stamp, "index": index})
+    return index
+
+
+def get_reactions(lusas:'IFModeller', loadset_ids:list[int], components:list[str]=REACTION_COMPONENTS, method:str="continuous") -> tuple[SupportIndex, np.ndarray, list[int]]:
+    """Reactions of all the support nodes for many loadsets, without changing the view
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadset_ids (list[int]): IDs of the loadsets, loadsets that do not exist are left out
+        components (list[str]): Reaction components
+        method (str): "continuous", as Nodal_Results.NodalReader
+
+    Returns:
+        tuple[SupportIndex, np.ndarray, list[int]]: Support index, (n_loadsets, n_nodes, n_components) reactions with nan where
+                                                    there are none, and the IDs of the loadsets extracted
+    """
+    from m100_Tools_And_Helpers import Nodal_Results
+    assert method in Nodal_Results.METHODS, f"Method must be one of {Nodal_Results.METHODS}"
+    index = get_support_index(lusas)
+    db = lusas.database()
+
+    # Results are only calculated at the support nodes
+    context = lusas.newResultsContext(None)
+    objects = context.getCalcResultsSet()
+    for node in index.nodes:
+        objects.add(node)
+
+    loadsets = [db.getLoadset(int(id)) for id in loadset_ids if db.existsLoadset(int(id))]
+    reader = Nodal_Results.NodalReader(index.nodes, index.node_ids, components, method)
+    reactions = np.full((len(loadsets), len(index.nodes), len(components)), np.nan)
+    for l, loadset in enumerate(loadsets):
+        if not loadset.needsPrimaryComponent():
+            context.setActiveLoadset(loadset)
+            reactions[l] = reader.read(db.getResultsComponentSet("Reaction", components[0], "Nodal", context))
+            continue
+        # Envelopes and smart combinations give each component with the loadset for that component
+        for j, component in enumerate(components):
+            context.setActiveLoadsetAssocVal("Reaction", component, loadset)
+            reactions[l, :, j] = reader.read(db.getResultsComponentSet("Reaction", component, "Nodal", context))[:, j]
+    return index, reactions, [l.getID() for l in loadsets]
+
+
+def get_total_reactions(lusas:'IFModeller', loadset_ids:list[int], components:list[str]=REACTION_COMPONENTS, method:str="continuous") -> pd.DataFrame:
+    """Total reactions of the model, one row per loadset"""
+    _, reactions, ids = get_reactions(lusas, loadset_ids, components, method)
+    return pd.DataFrame(np.nansum(reactions, axis=1).reshape(len(ids), len(components)), index=pd.Index(ids, name="loadset"), columns=components)
+
+
+def get_support_reactions(lusas:'IFModeller', loadset_ids:list[int], components:list[str]=REACTION_COMPONENTS, method:str="continuous") -> pd.DataFrame:
+    """Total reactions of each support attribute, indexed by (loadset, support). Nodes shared by two supports count in both"""
+    index, reactions, ids = get_reactions(lusas, loadset_ids, components, method)
+    position = np.searchsorted(index.node_ids, index.assignments["node"].to_numpy())
+    # Each node once per support, even if the support is assigned to several features sharing the node
+    unique = ~pd.DataFrame({"support": index.assignments["support"], "node": position}).duplicated().to_numpy()
+    supports = index.assignments["support"].to_numpy()[unique]
+    frames = []
+    for l, id in enumerate(ids):
+        frame = pd.DataFrame(np.nan_to_num(reactions[l, position[unique]]), columns=components)
+        frame["support"] = supports
+        frame = frame.groupby("support", sort=False).sum()
+        frame.insert(0, "loadset", id)
+        frames.append(frame.reset_index())
+    if not frames:
+        return pd.DataFrame(columns=["loadset", "support"] + components).set_index(["loadset", "support"])
+    return pd.concat(frames, ignore_index=True).set_index(["loadset", "support"])
+
+
+def check_equilibrium(totals:pd.DataFrame, applied:pd.DataFrame, tolerance:float=1e-3) -> pd.DataFrame:
+    """Compare total reactions with the total applied loads of each loadset, which should sum to zero
+
+    Args:
+        totals (pd.DataFrame): Total reactions from get_total_reactions
+        applied (pd.DataFrame): Total applied loads with the same index and columns
+        tolerance (float): Out of balance allowed, relative to the largest applied load of each loadset
+
+    Returns:
+        pd.DataFrame: Out of balance of each component, and a column "balanced"
+    """
+    applied = applied.reindex(index=totals.index, columns=totals.columns)
+    out_of_balance = totals + applied
+    scale = applied.abs().max(axis=1).replace(0.0, 1.0)
+    out_of_balance["balanced"] = out_of_balance.abs().max(axis=1) <= tolerance * scale
+    return out_of_balance
+
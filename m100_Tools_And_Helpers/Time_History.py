@@ -0,0 +1,115 @@
+# This file reads the results of every step of a transient or creep analysis, as in #211 and #230, into a single array
+# of shape (n_steps, n_rows, n_components), a row being a node, or a results point of an element, without creating graph
+# wizards or history datasets in the model.
+# Each step is a results loadset of the loadcase and its results are read through Results_Query, one results component
+# set per step for all the nodes and components, rather than one history attribute per node and component.
+# The steps are written to the array as they are read, so for long runs the array can be a memory-mapped .npy file
+# which does not need to fit in memory. The response time and the IDs of the rows are saved alongside it, and
+# open_history maps the file again later, e.g. for fatigue counting in another session.
+
+import os
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+# Named value of each results loadset giving its response time
+TIME_VARIABLE = "RSPTIM"
+
+@dataclass
+class History:
+    """Results of every step of a loadcase"""
+    loadcase_id: int
+    # Response time of each step
+    times: np.ndarray
+    # Node or element ID, and results point of elements, of each row
+    ids: np.ndarray
+    points: np.ndarray
+    components: list[str]
+    # (n_steps, n_rows, n_components) results, nan where not available. A read only np.memmap if saved to file
+    values: np.ndarray
+
+    def get_series(self, id:int, component:str, point:int=0) -> pd.Series:
+        """Results of one node, or element results point, and component against response time"""
+        row = np.flatnonzero((self.ids == id) & (self.points == point))
+        assert len(row) == 1, f"No results for {id} point {point}"
+        return pd.Series(self.values[:, row[0], self.components.index(component)], index=pd.Index(self.times, name="Response time"), name=component)
+
+    def get_ranges(self) -> np.ndarray:
+        """(n_rows, n_components) range of each result over all the steps, e.g. for a first check of fatigue"""
+        return np.nanmax(self.values, axis=0) - np.nanmin(self.values, axis=0)
+
+
+def _index_file(filename:str) -> str:
+    return os.path.splitext(filename)[0] + "_index.npz"
+
+
+def extract_history(lusas:'IFModeller', loadcase:'int | IFLoadcase', entity:str, components:'list[str] | str', objects:'IFObjectSet'=None,
+                    location:str="Nodal", filename:str=None, method:str="array", progress:Callable[[int, int], None]=None) -> History:
+    """Read the results of every step of a transient or creep loadcase
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadcase (int | IFLoadcase): The loadcase or its ID
+        entity (str): Results entity e.g. "Displacement"
+        components (list[str] | str): Results components e.g. ["DX", "DZ"]
+        objects (IFObjectSet): Nodes or elements, default is all of them
+        location (str): As Results_Query.query
+        filename (str): If given, the results are written to this .npy file as they are read, and returned memory-mapped.
+                        The file and its index are written even if the loadcase has no steps
+        method (str): As Results_Query.query
+        progress (Callable[[int, int], None]): Called with the number of steps read and the total after each step
+
+    Returns:
+        History: Results of every step
+    """
+    from m100_Tools_And_Helpers import Results_Query
+    if isinstance(components, str):
+        components = [components]
+    db = lusas.database()
+    if isinstance(loadcase, (int, np.integer)):
+        loadcase = db.getLoadset(int(loadcase))
+    if hasattr(loadcase, "_oleobj_"):
+        import win32com.client as win32
+        loadcase = win32.CastTo(loadcase, "IFLoadcase")
+    steps = loadcase.getResultsLoadcases()
+    times = np.array([s.getValue(TIME_VARIABLE) for s in steps], dtype=float)
+
+    values, ids, points, index = None, None, None, None
+    for s, frame in enumerate(Results_Query.iter_query(lusas, entity, components, steps, location, objects, format="wide", method=method)):
+        frame = frame.droplevel(["loadset", "extreme"])
+        if values is None:
+            # The rows are those with results at the first step
+            index = frame.index
+            ids = index.get_level_values(0).to_numpy(np.int64)
+            points = index.get_level_values(1).to_numpy(np.int64)
+            shape = (len(steps), len(index), len(components))
+            if filename is not None:
+                values = np.lib.format.open_memmap(filename, mode="w+", dtype=float, shape=shape)
+            else:
+                values = np.empty(shape)
+        values[s] = frame.reindex(index)[components].to_numpy(dtype=float)
+        if progress is not None:
+            progress(s + 1, len(steps))
+
+    if values is None:
+        ids, points = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        values = np.empty((len(steps), 0, len(components)))
+        if filename is not None:
+            # No steps or no rows, the empty array is still saved so that open_history works
+            np.save(filename, values)
+    if filename is not None:
+        if isinstance(values, np.memmap):
+            values.flush()
+        del values
+        np.savez(_index_file(filename), loadcase_id=loadcase.getID(), times=times, ids=ids, points=points, components=np.array(components))
+        values = np.load(filename, mmap_mode="r")
+    return History(loadcase.getID(), times, ids, points, list(components), values)
+
+
+def open_history(filename:str) -> History:
+    """Map a history saved by extract_history, without reading it into memory"""
+    with np.load(_index_file(filename)) as index:
+        return History(int(index["loadcase_id"]), index["times"], index["ids"], index["points"], index["components"].tolist(),
+                       np.load(filename, mmap_mode="r"))
+
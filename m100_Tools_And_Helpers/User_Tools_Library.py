@@ -2,6 +2,7 @@
 import sys; sys.path.append('../') # Reference modules in parent directory
 import ctypes  # An included library with Python install.
 from LPI import *
+from m100_Tools_And_Helpers import Support_Reactions
 
 def msgbox(title, text, style):
     return ctypes.windll.user32.MessageBoxW(0, text, title, style)
@@ -312,11 +313,10 @@ def show_beam_results():
 # %%
 ''' Reactions '''
 def plot_reactions():
-    fx, fy, fz = 0, 0, 0
-    for n in lusas.database().getObjects("Node"):
-        fx += n.getResults("Reaction", "FX")[0] if n.hasResults("Reaction", "FX") else 0
-        fy += n.getResults("Reaction", "FY")[0] if n.hasResults("Reaction", "FY") else 0
-        fz += n.getResults("Reaction", "FZ")[0] if n.hasResults("Reaction", "FZ") else 0
+    # Only the support nodes are asked for reactions, the support index is kept until the supports change
+    loadset_id = lusas.view().getActiveLoadset().getID()
+    totals = Support_Reactions.get_total_reactions(lusas, [loadset_id])
+    fx, fy, fz = totals.loc[loadset_id, ["FX", "FY", "FZ"]] if len(totals) > 0 else (0, 0, 0)
 
     lusas.getTextWindow().writeLine(f"Total reactions : {fx:.2f}, {fy:.2f}, {fz:.2f}")
 
@@ -0,0 +1,188 @@
+# This file calculates Wood-Armer design moments of shell elements with numpy, from the moments Mx, My and Mxy of every
+# node of every loadset read once from "Force/Moment - Thick Shell", rather than by Modeller each time a loadset is viewed
+# with a Wood-Armer attribute assigned, as in #410 and #412.
+# Design combinations are linear, so their moments are the factored sums of the moments of the loadcases, one matrix
+# product. The Wood-Armer moments are not linear, so they are calculated for every combination, and every reinforcement
+# angle, in a single pass over arrays, and enveloped a block of combinations at a time to bound the memory.
+# Skew reinforcement follows Armer: the moments are first rotated to the x bars, then transformed to the skew axes, where
+# the orthogonal rules apply unchanged. Moments that sag, tension at the bottom, are positive, design moments of the
+# bottom reinforcement are positive and of the top reinforcement negative, zero where no reinforcement is needed.
+# Mxy is the off diagonal of the moment tensor, as in Results_Transform, so the normal moment in the direction at angle t
+# to x is Mx cos^2 t + My sin^2 t + 2 Mxy sin t cos t, and angles are anticlockwise about the normal of the shell. The
+# design moments satisfy Johansen's yield criterion: the resistance of the bars in every direction is at least the
+# normal moment.
+
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+SHELL_ENTITY = "Force/Moment - Thick Shell"
+
+SHELL_COMPONENTS = ["Mx", "My", "Mxy"]
+
+# Bottom and top design moments of the x bars and of the second set of bars
+DESIGN_COMPONENTS = ["Mx(B)", "My(B)", "Mx(T)", "My(T)"]
+
+@dataclass
+class ShellMoments:
+    """Moments of shell elements for many loadsets"""
+    # Element ID and results point of each row
+    ids: np.ndarray
+    points: np.ndarray
+    # ID and "max", "min" or "" of each entry of the loadset axis
+    loadset_ids: list[int]
+    extremes: list[str]
+    # (n_loadsets, n_rows, 3) Mx, My and Mxy, nan where not available
+    values: np.ndarray
+
+    def get_loadsets(self) -> list[tuple[int, str]]:
+        """(loadset ID, extreme) of each entry of the loadset axis"""
+        return list(zip(self.loadset_ids, self.extremes))
+
+    def combine(self, factors:np.ndarray, combination_ids:list[int]=None) -> 'ShellMoments':
+        """Moments of linear combinations, given the (n_combinations, n_loadsets) factors of the entries of the loadset axis"""
+        factors = np.atleast_2d(np.asarray(factors, dtype=float))
+        assert factors.shape[1] == len(self.loadset_ids), "There must be a factor for each loadset"
+        values = np.einsum("cl,lrk->crk", factors, np.nan_to_num(self.values))
+        return ShellMoments(self.ids, self.points, combination_ids or list(range(1, len(factors) + 1)), [""] * len(factors), values)
+
+
+@dataclass
+class WoodArmerEnvelope:
+    """Max and min Wood-Armer moments of each row over many combinations"""
+    ids: np.ndarray
+    points: np.ndarray
+    # Angle of the x bars to the x axis of the moments, in degrees, and angle between the two sets of bars
+    angles: np.ndarray
+    skew: float
+    # (n_angles, n_rows, 4) max and min of DESIGN_COMPONENTS, and the position of the combination giving each
+    max: np.ndarray
+    min: np.ndarray
+    max_combination: np.ndarray
+    min_combination: np.ndarray
+
+    def get_design(self) -> np.ndarray:
+        """(n_angles, n_rows, 4) design moments: the max of the bottom and the min of the top components"""
+        return np.concatenate([self.max[..., :2], self.min[..., 2:]], axis=-1)
+
+    def to_frame(self, angle_index:int=0) -> pd.DataFrame:
+        """Design moments and the combination giving each, for one reinforcement angle, indexed by (element, point)"""
+        design = self.get_design()[angle_index]
+        combination = np.concatenate([self.max_combination[angle_index, :, :2], self.min_combination[angle_index, :, 2:]], axis=-1)
+        frame = pd.DataFrame(design, columns=DESIGN_COMPONENTS, index=pd.MultiIndex.from_arrays([self.ids, self.points], names=["element", "point"]))
+        for j, component in enumerate(DESIGN_COMPONENTS):
+            frame[f"{component} combination"] = combination[:, j]
+        return frame
+
+
+def extract_shell_moments(lusas:'IFModeller', loadsets:'list[int | IFLoadset]', objects:'IFObjectSet'=None, location:str="ElementNodal",
+                          transform:'str | Callable'=None, method:str="array") -> ShellMoments:
+    """Read Mx, My and Mxy of shell elements for many loadsets
+
+    Args:
+        lusas (IFModeller): Reference to LUSAS Modeller
+        loadsets (list[int | IFLoadset]): Loadcases or basic combinations, envelopes give their max and min entries as rows of the loadset axis
+        objects (IFObjectSet): Shell elements, default is all elements with results
+        location (str): As Results_Query.query
+        transform (str | Callable): As Results_Query.query, the x axis of the moments is the axis the reinforcement angles are measured from
+        method (str): As Results_Query.query
+
+    Returns:
+        ShellMoments: Moments of every results point of every loadset
+    """
+    from m100_Tools_And_Helpers import Results_Query
+    frames = [frame for frame in Results_Query.iter_query(lusas, SHELL_ENTITY, SHELL_COMPONENTS, loadsets, location, objects,
+                                                           transform=transform, format="wide", method=method)]
+    frames = [f for f in frames if len(f) > 0]
+    loadset_ids = [int(f.index.get_level_values("loadset")[0]) for f in frames]
+    extremes = [str(f.index.get_level_values("extreme")[0]) for f in frames]
+    frames = [f.droplevel(["loadset", "extreme"]) for f in frames]
+    if not frames:
+        return ShellMoments(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), [], [], np.empty((0, 0, 3)))
+    index = frames[0].index
+    for f in frames[1:]:
+        index = index.union(f.index)
+    values = np.stack([f.reindex(index)[SHELL_COMPONENTS].to_numpy(dtype=float) for f in frames])
+    return ShellMoments(index.get_level_values(0).to_numpy(np.int64), index.get_level_values(1).to_numpy(np.int64), loadset_ids, extremes, values)
+
+
+def _transform(mx:np.ndarray, my:np.ndarray, mxy:np.ndarray, angle:'float | np.ndarray', skew:float) -> tuple:
+    # Rotate to axes at angle to x, then to the skew axes of the bars, the second bars at skew anticlockwise from the x bars
+    theta = np.radians(angle)
+    c, s = np.cos(theta), np.sin(theta)
+    rx = mx * c**2 + my * s**2 + 2 * mxy * s * c
+    ry = mx * s**2 + my * c**2 - 2 * mxy * s * c
+    rxy = (my - mx) * s * c + mxy * (c**2 - s**2)
+    if skew == 90:
+        return rx, ry, rxy
+    alpha = np.radians(skew)
+    cot, sin = 1 / np.tan(alpha), np.sin(alpha)
+    return rx - 2 * rxy * cot + ry * cot**2, ry / sin**2, (rxy - ry * cot) / sin
+
+
+def wood_armer(mx:np.ndarray, my:np.ndarray, mxy:np.ndarray, angle:'float | np.ndarray'=0.0, skew:float=90.0) -> np.ndarray:
+    """Wood-Armer design moments of any shape of arrays of moments
+
+    Args:
+        mx, my, mxy (np.ndarray): Moments, which broadcast with angle
+        angle (float | np.ndarray): Angle of the x bars to the x axis of the moments, in degrees, as IFWoodArmerAttr.setGeometry.
+                                    An array of shape (n_angles, 1, ...) gives all the angles at once
+        skew (float): Angle of the second set of bars anticlockwise from the x bars, in degrees, 90 for orthogonal reinforcement
+
+    Returns:
+        np.ndarray: Moments of DESIGN_COMPONENTS along a new last axis
+    """
+    a, b, c = _transform(np.asarray(mx, dtype=float), np.asarray(my, dtype=float), np.asarray(mxy, dtype=float), angle, skew)
+    abs_c, c2 = np.abs(c), c**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a_div, b_div = np.where(a == 0, np.inf, np.abs(a)), np.where(b == 0, np.inf, np.abs(b))
+        bottom_x, bottom_y = a + abs_c, b + abs_c
+        # Where the x or second bars would be in compression they are not needed, and the other bars take more
+        x_zero, y_zero = bottom_x < 0, bottom_y < 0
+        bottom_x, bottom_y = (np.where(x_zero, 0.0, np.where(y_zero, a + c2 / b_div, bottom_x)),
+                              np.where(y_zero, 0.0, np.where(x_zero, b + c2 / a_div, bottom_y)))
+        both = (bottom_x < 0) | (bottom_y < 0)
+        bottom_x, bottom_y = np.where(both, 0.0, bottom_x), np.where(both, 0.0, bottom_y)
+
+        top_x, top_y = a - abs_c, b - abs_c
+        x_zero, y_zero = top_x > 0, top_y > 0
+        top_x, top_y = (np.where(x_zero, 0.0, np.where(y_zero, a - c2 / b_div, top_x)),
+                        np.where(y_zero, 0.0, np.where(x_zero, b - c2 / a_div, top_y)))
+        both = (top_x > 0) | (top_y > 0)
+        top_x, top_y = np.where(both, 0.0, top_x), np.where(both, 0.0, top_y)
+    return np.stack([bottom_x, bottom_y, top_x, top_y], axis=-1)
+
+
+def envelope(moments:ShellMoments, factors:np.ndarray=None, angles:'list[float]'=(0.0,), skew:float=90.0, block:int=20) -> WoodArmerEnvelope:
+    """Envelope the Wood-Armer moments of many combinations and reinforcement angles
+
+    Args:
+        moments (ShellMoments): Moments of the loadsets
+        factors (np.ndarray): (n_combinations, n_loadsets) factors of linear combinations of the loadsets. Default is each loadset alone
+        angles (list[float]): Angles of the x bars, see wood_armer
+        skew (float): See wood_armer
+        block (int): Number of combinations calculated at once, memory is about 8 * 11 * block * n_rows * n_angles bytes
+
+    Returns:
+        WoodArmerEnvelope: Max and min design moments, the combinations indexed by their position in factors or the loadsets
+    """
+    angles = np.atleast_1d(np.asarray(angles, dtype=float))
+    values = np.nan_to_num(moments.values)
+    n_combinations = len(values) if factors is None else len(factors)
+    shape = (len(angles), values.shape[1], len(DESIGN_COMPONENTS))
+    max_values, min_values = np.full(shape, -np.inf), np.full(shape, np.inf)
+    max_combination, min_combination = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)
+    for first in range(0, n_combinations, block):
+        last = min(first + block, n_combinations)
+        combined = values[first:last] if factors is None else np.einsum("cl,lrk->crk", np.asarray(factors, dtype=float)[first:last], values)
+        # (n_angles, n_block, n_rows, 4)
+        design = wood_armer(combined[..., 0], combined[..., 1], combined[..., 2], angles[:, None, None], skew)
+        i_max, i_min = design.argmax(axis=1), design.argmin(axis=1)
+        block_max = np.take_along_axis(design, i_max[:, None], axis=1)[:, 0]
+        block_min = np.take_along_axis(design, i_min[:, None], axis=1)[:, 0]
+        better = block_max > max_values
+        max_values, max_combination = np.where(better, block_max, max_values), np.where(better, i_max + first, max_combination)
+        better = block_min < min_values
+        min_values, min_combination = np.where(better, block_min, min_values), np.where(better, i_min + first, min_combination)
+    return WoodArmerEnvelope(moments.ids, moments.points, angles, skew, max_values, min_values, max_combination, min_combination)
+
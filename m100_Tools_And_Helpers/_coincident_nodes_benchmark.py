@@ -0,0 +1,114 @@
+# Times the spatial hash of Coincident_Nodes against the three approaches of #121 on synthetic meshes of 10k, 100k and
+# 1M nodes. The approaches of #121 compare every pair of nodes, so they are timed on a sample of the nodes and the time
+# extrapolated by the ratio of the number of comparisons.
+# Run from the repository root:  python -m m100_Tools_And_Helpers._coincident_nodes_benchmark
+
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from m100_Tools_And_Helpers import Coincident_Nodes
+
+
+class _SyntheticNode:
+    # Minimal stand in for IFNode, used so approach 1 of #121 can be timed without a model
+    def __init__(self, id, x, y, z):
+        self.id, self.x, self.y, self.z = id, x, y, z
+    def getID(self): return self.id
+    def getX(self): return self.x
+    def getY(self): return self.y
+    def getZ(self): return self.z
+
+
+def create_synthetic_mesh(no_nodes:int, spacing:float=1.0, crack_fraction:float=0.01, seed:int=0) -> tuple[np.ndarray, np.ndarray]:
+    """Create a regular grid of nodes in which a fraction of the nodes are duplicated to form mesh cracks
+
+    Args:
+        no_nodes (int): Approximate number of nodes
+        spacing (float): Distance between nodes of the grid
+        crack_fraction (float): Fraction of nodes which are duplicated with a small offset
+        seed (int): Random seed
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Node IDs and (n, 3) coordinates
+    """
+    rng = np.random.default_rng(seed)
+    no_grid = int(no_nodes * (1 - crack_fraction))
+    nx = max(int(np.sqrt(no_grid / 4)), 1)
+    ix = np.arange(no_grid)
+    # A deck like grid, long in x, 4 nodes through the depth
+    xyz = np.column_stack([ix // (nx * 4), (ix // 4) % nx, ix % 4]).astype(float) * spacing
+    cracks = rng.choice(no_grid, no_nodes - no_grid, replace=False)
+    xyz = np.vstack([xyz, xyz[cracks] + rng.uniform(-0.01, 0.01, (len(cracks), 3)) * spacing])
+    return np.arange(1, len(xyz) + 1), xyz
+
+
+def _approach_1(nodes:list, tolerance:float) -> int:
+    found = 0
+    for a, b in itertools.combinations(nodes, 2):
+        delta = np.sqrt( (a.getX() - b.getX())**2 + (a.getY() - b.getY())**2 + (a.getZ() - b.getZ())**2 )
+        found += delta < tolerance
+    return found
+
+
+def _approach_2(positions:np.ndarray, tolerance:float) -> int:
+    found = 0
+    for a, b in itertools.combinations(positions, 2):
+        delta = np.sqrt( (a[0] - b[0])**2 + (a[1] - b[1])**2 + (a[2] - b[2])**2 )
+        found += delta < tolerance
+    return found
+
+
+def _approach_3(positions:np.ndarray, tolerance:float) -> int:
+    rel = positions[None, :, :] - positions[:, None, :]
+    distances = np.sqrt(np.square(rel).sum(axis=2))
+    return int(((distances < tolerance).sum() - len(positions)) / 2)
+
+
+def benchmark(sizes:list[int]=[10_000, 100_000, 1_000_000], tolerance:float=0.05, sample_limits:dict=None) -> pd.DataFrame:
+    """Time the spatial hash against the three approaches in #121 on synthetic meshes.
+    The original approaches are quadratic and cannot be run on large meshes, these are timed on a sample
+    of nodes (see sample_limits) and the time is extrapolated by the ratio of the number of comparisons.
+
+    Args:
+        sizes (list[int]): Number of nodes in each synthetic mesh
+        tolerance (float): Coincidence tolerance
+        sample_limits (dict): Maximum number of nodes actually timed for approaches 1, 2 and 3
+
+    Returns:
+        pd.DataFrame: Time taken for each approach and mesh size, and the pairs found where not extrapolated
+    """
+    if sample_limits is None:
+        sample_limits = {1: 1000, 2: 2000, 3: 2000}
+
+    rows = []
+    for size in sizes:
+        ids, xyz = create_synthetic_mesh(size)
+
+        start = time.perf_counter()
+        pairs = Coincident_Nodes.find_coincident_nodes(ids, xyz, tolerance)
+        rows.append({"Approach": "Spatial hash", "Nodes": size, "Seconds": time.perf_counter() - start,
+                     "Extrapolated": False, "Pairs": len(pairs)})
+
+        for approach in [1, 2, 3]:
+            sample = min(size, sample_limits[approach])
+            positions = xyz[:sample]
+            start = time.perf_counter()
+            match approach:
+                case 1:
+                    found = _approach_1([_SyntheticNode(i, *p) for i, p in zip(ids[:sample], positions)], tolerance)
+                case 2:
+                    found = _approach_2(positions, tolerance)
+                case 3:
+                    found = _approach_3(positions, tolerance)
+            seconds = time.perf_counter() - start
+            # Scale by the number of comparisons n(n-1)/2
+            scale = (size * (size - 1)) / (sample * (sample - 1))
+            rows.append({"Approach": f"Approach {approach}", "Nodes": size, "Seconds": seconds * scale,
+                         "Extrapolated": sample < size, "Pairs": int(found) if sample == size else np.nan})
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
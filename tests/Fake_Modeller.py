@@ -0,0 +1,738 @@
+# This file provides a stand in for LUSAS Modeller which can be used to test scripts without LUSAS.
+# Only a small part of the IFModeller interface is implemented. Every call to an LPI function is counted and can
+# optionally be delayed to represent the cost of a cross process COM call, so that alternative implementations
+# can be compared by the number of calls they make as well as by time.
+
+import time
+import numpy as np
+
+
+class FakeModeller:
+    """Stand in for IFModeller that counts LPI calls"""
+
+    def __init__(self, latency:float=0.0):
+        """
+        Args:
+            latency (float): Time in seconds added to every LPI call
+        """
+        self.latency = latency
+        self.calls = 0
+        self._ui_enabled = True
+        self._visible = True
+        self._database = FakeDatabase(self)
+
+    def _call(self):
+        self.calls += 1
+        if self.latency > 0:
+            # time.sleep is too coarse for typical COM latencies of a few tens of microseconds
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+
+    def reset_calls(self):
+        self.calls = 0
+
+    def database(self) -> 'FakeDatabase':
+        self._call()
+        return self._database
+
+    def db(self) -> 'FakeDatabase':
+        return self.database()
+
+    def existsDatabase(self) -> bool:
+        self._call()
+        return True
+
+    def getMajorVersionNumber(self) -> int:
+        self._call()
+        return 23
+
+    def geometryData(self) -> 'FakeGeometryData':
+        self._call()
+        return FakeGeometryData(self)
+
+    def newGeometryData(self) -> 'FakeGeometryData':
+        return self.geometryData()
+
+    def quit(self, force=None):
+        self._call()
+
+    def enableUI(self, isEnable):
+        self._call()
+        self._ui_enabled = bool(isEnable)
+
+    def isUIEnabled(self) -> bool:
+        self._call()
+        return self._ui_enabled
+
+    def setVisible(self, isVisible):
+        self._call()
+        self._visible = bool(isVisible)
+
+    def isVisible(self) -> bool:
+        self._call()
+        return self._visible
+
+    def newObjectSet(self) -> 'FakeObjectSet':
+        self._call()
+        return FakeObjectSet(self, [])
+
+    def newResultsContext(self, view) -> 'FakeResultsContext':
+        self._call()
+        return FakeResultsContext(self)
+
+    def openProject(self, filename, readOnly=None, noSubstitution=None, autoUpgrade=None, deleteLock=None, createNew=None) -> bool:
+        # The contents of the fake database are kept, as populated by the caller
+        self._call()
+        return True
+
+
+class FakeDatabase:
+    """Stand in for IFDatabase"""
+
+    def __init__(self, modeller:FakeModeller):
+        self._modeller = modeller
+        self._nodes : dict[int, FakeNode] = {}
+        self._elements : dict[int, FakeElement] = {}
+        self._loadsets : dict[int, FakeLoadset] = {}
+        self._slices : dict[str, FakeBeamShellSlice] = {}
+        self._attributes : dict[str, list[FakeAttribute]] = {}
+        self._geometry : dict[str, list] = {"Point": [], "Line": []}
+        self._modification_time = 0
+        # Labels of the open command batches, beginCommandBatch may be nested
+        self.command_batches : list[str] = []
+
+    def add_nodes(self, ids:np.ndarray, xyz:np.ndarray):
+        """Populate the database with nodes, this is not counted as an LPI call
+
+        Args:
+            ids (np.ndarray): Node IDs
+            xyz (np.ndarray): (n, 3) array of node coordinates
+        """
+        for id, (x, y, z) in zip(ids, xyz):
+            self._nodes[int(id)] = FakeNode(self._modeller, int(id), float(x), float(y), float(z))
+        self._modification_time += 1
+
+    def add_elements(self, ids:np.ndarray, n_points:int | np.ndarray, stress_type:str="Thick 3D Beam"):
+        """Populate the database with elements, this is not counted as an LPI call. Their results are generated by fake_result
+
+        Args:
+            ids (np.ndarray): Element IDs
+            n_points (int | np.ndarray): Number of results points of each element
+            stress_type (str): Stress type of the elements, e.g. "Thick 3D Beam"
+        """
+        n_points = np.broadcast_to(n_points, np.shape(ids))
+        for id, n in zip(ids, n_points):
+            self._elements[int(id)] = FakeElement(self._modeller, int(id), int(n), stress_type)
+        self._modification_time += 1
+
+    def add_loadsets(self, ids:list[int]):
+        """Populate the database with loadcases, this is not counted as an LPI call"""
+        for id in ids:
+            self._loadsets[int(id)] = FakeLoadset(self._modeller, int(id))
+
+    def add_envelope(self, id:int, assoc_id:int, loadcase_ids:list[int], smart:bool=False):
+        """Populate the database with the max and min of an envelope, or of a smart combination, of the given loadcases,
+        this is not counted as an LPI call. The results of both are taken as the envelope of the loadcases"""
+        kind = FakeSmartCombination if smart else FakeEnvelope
+        maximum = kind(self._modeller, int(id), [int(l) for l in loadcase_ids], True)
+        minimum = kind(self._modeller, int(assoc_id), [int(l) for l in loadcase_ids], False)
+        maximum._assoc, minimum._assoc = minimum, maximum
+        self._loadsets[int(id)], self._loadsets[int(assoc_id)] = maximum, minimum
+
+    def add_modes(self, id:int, frequencies:np.ndarray, participation:np.ndarray, total_mass:float=1.0):
+        """Populate the database with an eigenvalue loadcase and its modes, this is not counted as an LPI call
+
+        Args:
+            id (int): Loadcase ID
+            frequencies (np.ndarray): Natural frequency of each mode in Hz
+            participation (np.ndarray): (n_modes, 3) mass participation of each mode in X, Y and Z
+            total_mass (float): Total mass of the model
+        """
+        loadcase = FakeLoadset(self._modeller, int(id))
+        for mode, (f, (px, py, pz)) in enumerate(zip(frequencies, participation), start=1):
+            values = {"EIGVL": float((2 * np.pi * f)**2), "NATFRQ": float(f), "PMASSX": float(px), "PMASSY": float(py),
+                      "PMASSZ": float(pz), "TMASS": float(total_mass)}
+            loadcase._results_loadcases.append(FakeResultsLoadset(self._modeller, int(id), mode, values, eigenvalue_id=mode))
+        self._loadsets[int(id)] = loadcase
+
+    def add_steps(self, id:int, times:np.ndarray):
+        """Populate the database with a transient loadcase and its results at each response time, this is not counted as an LPI call"""
+        loadcase = FakeLoadset(self._modeller, int(id))
+        for step, t in enumerate(times, start=1):
+            loadcase._results_loadcases.append(FakeResultsLoadset(self._modeller, int(id), step, {"RSPTIM": float(t)}))
+        self._loadsets[int(id)] = loadcase
+
+    def add_slices(self, names:list[str], n_locations:int):
+        """Populate the database with beam/shell slices, this is not counted as an LPI call. Their results are generated by fake_result"""
+        for name in names:
+            self._slices[name] = FakeBeamShellSlice(self._modeller, len(self._slices) + 1, name, n_locations)
+
+    def add_supports(self, name:str, node_ids:list[int]):
+        """Populate the database with a support attribute assigned to one point at each of the given nodes, this is not counted as an LPI call"""
+        supports = self._attributes.setdefault("support", [])
+        points = self._geometry["Point"]
+        assignments = []
+        for id in node_ids:
+            point = FakeGeometry(self._modeller, "Point", len(points) + 1)
+            point._nodes = [self._nodes[int(id)]]
+            points.append(point)
+            assignments.append(FakeAssignment(self._modeller, point))
+        supports.append(FakeAttribute(self._modeller, len(supports) + 1, name, assignments))
+        self._modification_time += 1
+
+    def getAttributes(self, attrType, arg2=None) -> list['FakeAttribute']:
+        self._modeller._call()
+        return list(self._attributes.get(attrType.lower(), []))
+
+    def getDBFilename(self) -> str:
+        self._modeller._call()
+        return "Fake.mdl"
+
+    def getDBFilenameNoExtension(self) -> str:
+        self._modeller._call()
+        return "Fake"
+
+    def getDBBasename(self) -> str:
+        self._modeller._call()
+        return "Fake"
+
+    def getAnalyses(self, includeBranches=None) -> list['FakeAnalysis']:
+        self._modeller._call()
+        return [FakeAnalysis(self)]
+
+    def count(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> int:
+        self._modeller._call()
+        return len(self._get_objects(arg1))
+
+    def _get_objects(self, type:str) -> list:
+        if type.title() in self._geometry:
+            return list(self._geometry[type.title()])
+        if type.lower().startswith("node"):
+            return list(self._nodes.values())
+        if type.lower().startswith("element"):
+            return list(self._elements.values())
+        return [e for e in self._elements.values() if e._stress_type.lower() == type.lower()]
+
+    def getObjects(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> list:
+        self._modeller._call()
+        return self._get_objects(arg1)
+
+    def getObject(self, arg1, arg2=None):
+        self._modeller._call()
+        if arg1.lower().startswith("node"):
+            return self._nodes[int(arg2)]
+        if arg1.lower().startswith("element"):
+            return self._elements[int(arg2)]
+        if arg1.lower() == "beam/shell slicing":
+            return self._slices[arg2]
+        if arg1.title() in self._geometry:
+            return next(g for g in self._geometry[arg1.title()] if g._id == int(arg2))
+        return None
+
+    def exists(self, arg1, arg2=None) -> bool:
+        self._modeller._call()
+        return arg1.title() in self._geometry and any(g._id == int(arg2) for g in self._geometry[arg1.title()])
+
+    def existsLoadset(self, id) -> bool:
+        self._modeller._call()
+        return int(id) in self._loadsets
+
+    def getLoadset(self, id, resultsFileIndex=None) -> 'FakeLoadset':
+        self._modeller._call()
+        return self._loadsets[int(id)]
+
+    def getLoadsets(self, type=None, resultsFileIndex=None) -> list['FakeLoadset']:
+        self._modeller._call()
+        return list(self._loadsets.values())
+
+    def getResultsComponentSet(self, entity, component, locn, context=None) -> 'FakeResultsComponentSet':
+        self._modeller._call()
+        assert context is not None and context.loadset is not None, "Only results of a context with an active loadset are supported"
+        return FakeResultsComponentSet(self._modeller, entity, locn, context.loadset, context._calc_results_set._objects, context.component)
+
+    def beginCommandBatch(self, label, isUndoable=None) -> bool:
+        self._modeller._call()
+        self.command_batches.append(label)
+        return False
+
+    def closeCommandBatch(self):
+        self._modeller._call()
+        self.command_batches.pop()
+
+    def _create(self, type:str, count:int) -> 'FakeObjectSet':
+        # As Modeller, the lowest IDs not in use are given to new objects, reusing those of deleted objects
+        objects = self._geometry[type]
+        used = {g._id for g in objects}
+        free = (id for id in range(1, len(objects) + count + 1) if id not in used)
+        new = [FakeGeometry(self._modeller, type, next(free)) for _ in range(count)]
+        objects.extend(new)
+        self._modification_time += 1
+        return FakeObjectSet(self._modeller, new)
+
+    def createPoint(self, geomData:'FakeGeometryData') -> 'FakeObjectSet':
+        # One point per coordinate
+        self._modeller._call()
+        return self._create("Point", len(geomData.coords))
+
+    def createLine(self, geomData:'FakeGeometryData') -> 'FakeObjectSet':
+        # Straight lines joining consecutive coordinates
+        self._modeller._call()
+        assert geomData.create_method == "straight", "Only straight lines are supported"
+        return self._create("Line", max(len(geomData.coords) - 1, 0))
+
+
+class FakeAnalysis:
+    """Stand in for IFAnalysisBaseClass"""
+
+    def __init__(self, database:FakeDatabase):
+        self._database = database
+
+    def getModificationTime(self, analysisOnly) -> int:
+        self._database._modeller._call()
+        return self._database._modification_time
+
+
+class FakeNode:
+    """Stand in for IFNode"""
+
+    def __init__(self, modeller:FakeModeller, id:int, x:float, y:float, z:float):
+        self._modeller = modeller
+        self._id, self._x, self._y, self._z = id, x, y, z
+
+    def getID(self) -> int:
+        self._modeller._call()
+        return self._id
+
+    def getX(self) -> float:
+        self._modeller._call()
+        return self._x
+
+    def getY(self) -> float:
+        self._modeller._call()
+        return self._y
+
+    def getZ(self) -> float:
+        self._modeller._call()
+        return self._z
+
+    def getXYZ(self, X, Y=None, Z=None) -> tuple:
+        # As seen from pywin32 the output arguments are returned as a tuple
+        self._modeller._call()
+        return self._x, self._y, self._z
+
+    def hasResults(self, entity, component, units=None, loadcase=None) -> bool:
+        # Reactions are only available at supported nodes
+        self._modeller._call()
+        if entity.lower() != "reaction":
+            return True
+        supports = self._modeller._database._attributes.get("support", [])
+        return any(self in a._object._nodes for attr in supports for a in attr._assignments)
+
+    def getResults(self, entity, component, units=None, loadcase=None) -> tuple:
+        # The active loadset of the view is taken to be the first loadset
+        self._modeller._call()
+        loadset_id = min(self._modeller._database._loadsets, default=1)
+        component_number = [c.lower() for c in fake_components(entity)].index(component.lower())
+        return fake_result(self._id, 0, component_number, loadset_id), None
+
+
+# Components of the fake results entities, the component number is the position in this list
+FAKE_COMPONENTS = ["Fx", "Fy", "Fz", "Mx", "My", "Mz"]
+
+# Components of the fake entities that differ from FAKE_COMPONENTS, by lower case entity
+FAKE_ENTITY_COMPONENTS = {"displacement": ["DX", "DY", "DZ", "THX", "THY", "THZ", "RSLT"]}
+
+
+def fake_components(entity:str) -> list[str]:
+    """Components of a fake results entity"""
+    return FAKE_ENTITY_COMPONENTS.get(str(entity).lower(), FAKE_COMPONENTS)
+
+
+def fake_result(element_id:int, point:int, component_number:int, loadset_id:int) -> float:
+    """Value of the results generated for the fake elements, such that extracted results can be checked"""
+    return 1000.0 * loadset_id + element_id + 0.01 * point + 0.0001 * component_number
+
+
+class FakeElement:
+    """Stand in for IFElement, with results at its element nodes, gauss points and internal points"""
+
+    def __init__(self, modeller:FakeModeller, id:int, n_points:int, stress_type:str):
+        self._modeller = modeller
+        self._id, self._n_points, self._stress_type = id, n_points, stress_type
+
+    def getID(self) -> int:
+        self._modeller._call()
+        return self._id
+
+    def getStressType(self) -> str:
+        self._modeller._call()
+        return self._stress_type
+
+    def getDomainDimension(self) -> int:
+        self._modeller._call()
+        return 1 if "beam" in self._stress_type.lower() else 2
+
+    def countInternalPoints(self) -> int:
+        self._modeller._call()
+        return self._n_points
+
+    def getAxes(self, origin, xAxis=None, yAxis=None, zAxis=None) -> tuple:
+        # Axes rotated about Z then X by angles depending on the ID, returned with the origin as pywin32 returns output arguments
+        self._modeller._call()
+        a, b = 0.1 * self._id, 0.05 * self._id
+        rz = np.array([[np.cos(a), -np.sin(a), 0.0], [np.sin(a), np.cos(a), 0.0], [0.0, 0.0, 1.0]])
+        rx = np.array([[1.0, 0.0, 0.0], [0.0, np.cos(b), -np.sin(b)], [0.0, np.sin(b), np.cos(b)]])
+        axes = (rx @ rz).T
+        return (0.0, 0.0, 0.0), tuple(axes[0]), tuple(axes[1]), tuple(axes[2])
+
+    def getInternalResults(self, index, entity, component, units=None, loadcase=None) -> tuple:
+        # The active loadset of the view is taken to be the first loadset
+        self._modeller._call()
+        loadset_id = min(self._modeller._database._loadsets, default=1)
+        return fake_result(self._id, index, fake_components(entity).index(component), loadset_id), None
+
+
+class FakeBeamShellSlice:
+    """Stand in for IFBeamShellSlice, with the results of fake_result taking the slice number as element ID"""
+
+    def __init__(self, modeller:FakeModeller, number:int, name:str, n_locations:int):
+        self._modeller = modeller
+        self._number, self._name, self._n_locations = number, name, n_locations
+
+    def getName(self) -> str:
+        self._modeller._call()
+        return self._name
+
+    def getNumberLocations(self) -> int:
+        self._modeller._call()
+        return self._n_locations
+
+    def getAllResults(self, option=None, context=None, units=None) -> tuple:
+        self._modeller._call()
+        assert context is not None and context.loadset is not None, "Only results of a context with an active loadset are supported"
+        primary = context.component and [c.lower() for c in FAKE_COMPONENTS].index(context.component.lower())
+        return tuple(tuple(fake_result(self._number, i, j, context.loadset._get_results_id(self._number, i, j if primary is None else primary))
+                           for j in range(len(FAKE_COMPONENTS))) + (float(i),) for i in range(self._n_locations))
+
+
+class FakeLoadset:
+    """Stand in for IFLoadcase"""
+
+    def __init__(self, modeller:FakeModeller, id:int):
+        self._modeller = modeller
+        self._id = id
+        # Loadset ID given to fake_result, results loadsets share the ID of their loadcase but not their results
+        self._results_id = id
+        self._results_loadcases : list[FakeResultsLoadset] = []
+
+    def getID(self) -> int:
+        self._modeller._call()
+        return self._id
+
+    def getName(self) -> str:
+        self._modeller._call()
+        return f"Loadcase {self._id}"
+
+    def getEigenvalueID(self) -> int:
+        self._modeller._call()
+        return 0
+
+    def getResultsLoadcases(self) -> list['FakeResultsLoadset']:
+        self._modeller._call()
+        return list(self._results_loadcases)
+
+    def getTypeCode(self) -> int:
+        self._modeller._call()
+        return 0
+
+    def needsPrimaryComponent(self) -> bool:
+        self._modeller._call()
+        return False
+
+    def _get_results_id(self, id:int, point:int, component_number:int) -> int:
+        # Loadset ID given to fake_result for the results of an object, the governing loadcase for envelopes
+        return self._results_id
+
+
+class FakeEnvelope(FakeLoadset):
+    """Stand in for the max or min of an IFEnvelope, see FakeDatabase.add_envelope"""
+
+    TYPE_CODE = 3
+
+    def __init__(self, modeller:FakeModeller, id:int, loadcase_ids:list[int], is_max:bool):
+        super().__init__(modeller, id)
+        self._loadcase_ids, self._is_max = loadcase_ids, is_max
+        self._assoc : FakeEnvelope = None
+
+    def getName(self) -> str:
+        self._modeller._call()
+        return f"{type(self).__name__[4:]} {self._id} ({'Max' if self._is_max else 'Min'})"
+
+    def getTypeCode(self) -> int:
+        self._modeller._call()
+        return self.TYPE_CODE
+
+    def needsPrimaryComponent(self) -> bool:
+        self._modeller._call()
+        return True
+
+    def isMax(self) -> bool:
+        self._modeller._call()
+        return self._is_max
+
+    def getAssocLoadset(self) -> 'FakeEnvelope':
+        self._modeller._call()
+        return self._assoc
+
+    def getLoadcaseIDs(self) -> list[int]:
+        self._modeller._call()
+        return list(self._loadcase_ids)
+
+    def _get_results_id(self, id:int, point:int, component_number:int) -> int:
+        # The loadcase giving the max or min of the primary component of this object and point
+        pick = max if self._is_max else min
+        return pick(self._loadcase_ids, key=lambda l: fake_result(id, point, component_number, self._modeller._database._loadsets[l]._results_id))
+
+
+class FakeSmartCombination(FakeEnvelope):
+    """Stand in for the max or min of an IFSmartCombination, whose results are taken as the envelope of its loadcases"""
+
+    TYPE_CODE = 6
+
+
+class FakeResultsLoadset(FakeLoadset):
+    """Stand in for IFResultsLoadset, a mode or time step of a loadcase, with values such as "NATFRQ" or "RSPTIM" """
+
+    def __init__(self, modeller:FakeModeller, id:int, index:int, values:dict[str, float], eigenvalue_id:int=0):
+        super().__init__(modeller, id)
+        self._index, self._eigenvalue_id, self._values = index, eigenvalue_id, values
+        self._results_id = 100 * id + index
+
+    def getName(self) -> str:
+        self._modeller._call()
+        return f"Loadcase {self._id} Mode {self._eigenvalue_id}" if self._eigenvalue_id else f"Loadcase {self._id} Step {self._index}"
+
+    def getEigenvalueID(self) -> int:
+        self._modeller._call()
+        return self._eigenvalue_id
+
+    def getValue(self, varName, row=None, units=None) -> float:
+        self._modeller._call()
+        return self._values[varName]
+
+
+class FakeResultsContext:
+    """Stand in for IFResultsContext"""
+
+    def __init__(self, modeller:FakeModeller):
+        self._modeller = modeller
+        self._calc_results_set = FakeObjectSet(modeller, [])
+        self.loadset = None
+        # Primary component set with setActiveLoadsetAssocVal
+        self.component = None
+
+    def getCalcResultsSet(self) -> 'FakeObjectSet':
+        self._modeller._call()
+        return self._calc_results_set
+
+    def setActiveLoadset(self, loadset):
+        self._modeller._call()
+        self.loadset = self._modeller._database._loadsets[int(loadset)] if isinstance(loadset, (int, np.integer)) else loadset
+        self.component = None
+
+    def setActiveLoadsetAssocVal(self, entity, component, loadset):
+        self.setActiveLoadset(loadset)
+        self.component = component
+
+    def setResultsTransformGlobal(self):
+        # Fake results are the same in any transformation
+        self._modeller._call()
+
+    def setResultsTransformNone(self):
+        self._modeller._call()
+
+
+class FakeResultsComponentSet:
+    """Stand in for IFResultsComponentSet, returning the results of fake_result for all components of the entity, see fake_components"""
+
+    def __init__(self, modeller:FakeModeller, entity:str, location:str, loadset:FakeLoadset, objects:list, component:str=None):
+        self._modeller = modeller
+        self._entity, self._location, self._loadset = entity, location, loadset
+        # Results of envelopes are those of the loadcase governing the primary component, if one was set
+        self._primary = None if component is None else [c.lower() for c in fake_components(entity)].index(component.lower())
+        self._elements = [o for o in objects if isinstance(o, FakeElement)]
+        self._nodes = [o for o in objects if isinstance(o, FakeNode)]
+
+    def _result(self, id:int, point:int, component_number:int) -> float:
+        primary = component_number if self._primary is None else self._primary
+        return fake_result(id, point, component_number, self._loadset._get_results_id(id, point, primary))
+
+    def getComponentNumber(self, component) -> int:
+        self._modeller._call()
+        return [c.lower() for c in fake_components(self._entity)].index(component.lower())
+
+    def getContinuousResults(self, componentNumber, node, units, loadcase) -> float:
+        # Nodal results, e.g. reactions, of node i are those of element i at point 0
+        self._modeller._call()
+        return self._result(node._id, 0, componentNumber)
+
+    def _get_array(self, componentNumber, element:FakeElement) -> tuple:
+        # As seen from pywin32 arrays are returned as tuples
+        self._modeller._call()
+        return tuple(self._result(element._id, i, componentNumber) for i in range(element._n_points))
+
+    def getElementNodalResultsArray(self, componentNumber, element, units) -> tuple:
+        return self._get_array(componentNumber, element)
+
+    def getGaussResultsArray(self, componentNumber, element, units) -> tuple:
+        return self._get_array(componentNumber, element)
+
+    def getInternalResultsArray(self, componentNumber, element, units) -> tuple:
+        return self._get_array(componentNumber, element)
+
+    def getAveragedResultsArray(self, componentNumber, element, units) -> tuple:
+        return self._get_array(componentNumber, element)
+
+
+class FakeGeometryData:
+    """Stand in for IFGeometryData, only coordinate input is supported"""
+
+    def __init__(self, modeller:FakeModeller):
+        self._modeller = modeller
+        self.coords : list[tuple[float, float, float]] = []
+        self.create_method = None
+
+    def setAllDefaults(self) -> 'FakeGeometryData':
+        self._modeller._call()
+        self.coords, self.create_method = [], None
+        return self
+
+    def setLowerOrderGeometryType(self, type) -> 'FakeGeometryData':
+        self._modeller._call()
+        assert type == "coordinates", "Only coordinate input is supported"
+        return self
+
+    def setCreateMethod(self, method) -> 'FakeGeometryData':
+        self._modeller._call()
+        self.create_method = method
+        return self
+
+    def addCoords(self, X, Y=None, Z=None, isGlobal=None) -> 'FakeGeometryData':
+        self._modeller._call()
+        self.coords.append((X, Y, Z))
+        return self
+
+    def removeAllCoords(self) -> 'FakeGeometryData':
+        self._modeller._call()
+        self.coords = []
+        return self
+
+
+class FakeObjectSet:
+    """Stand in for IFObjectSet"""
+
+    def __init__(self, modeller:FakeModeller, objects:list):
+        self._modeller = modeller
+        self._objects = objects
+
+    def add(self, arg1, arg2=None) -> 'FakeObjectSet':
+        # Accepts another object set, a list of objects, an object, or a type name meaning all objects of that type
+        self._modeller._call()
+        if isinstance(arg1, FakeObjectSet):
+            new = arg1._objects
+        elif isinstance(arg1, (list, tuple)):
+            new = list(arg1)
+        elif isinstance(arg1, str) and arg2 is not None:
+            new = [self._modeller._database.getObject(arg1, arg2)]
+        elif isinstance(arg1, str):
+            new = self._modeller._database._get_objects(arg1)
+        else:
+            new = [arg1]
+        present = set(map(id, self._objects))
+        self._objects.extend(o for o in new if id(o) not in present)
+        return self
+
+    def count(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> int:
+        self._modeller._call()
+        return len(self.getObjects(arg1))
+
+    def getObjects(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None) -> list:
+        self._modeller._call()
+        if arg1.lower() == "all":
+            return list(self._objects)
+        return [o for o in self._objects if _type_name(o).lower() == arg1.lower()]
+
+    def getObject(self, arg1, arg2=None, arg3=None, arg4=None, arg5=None):
+        objects = self.getObjects(arg1)
+        return objects[0] if objects else None
+
+    def Delete(self, type):
+        # Deletes the geometry of the set from the database
+        self._modeller._call()
+        geometry = self._modeller._database._geometry
+        for o in self.getObjects(type):
+            if isinstance(o, FakeGeometry):
+                geometry[o._type] = [g for g in geometry[o._type] if g is not o]
+        self._modeller._database._modification_time += 1
+
+
+def _type_name(obj) -> str:
+    return {FakeNode: "Node", FakeElement: "Element"}.get(type(obj)) or obj._type
+
+
+class FakeGeometry:
+    """Stand in for IFPoint and IFLine"""
+
+    def __init__(self, modeller:FakeModeller, type:str, id:int):
+        self._modeller = modeller
+        self._type, self._id = type, id
+        self._nodes : list[FakeNode] = []
+
+    def getID(self) -> int:
+        self._modeller._call()
+        return self._id
+
+    def getTypeName(self) -> str:
+        self._modeller._call()
+        return self._type
+
+    def getTypeCode(self) -> int:
+        self._modeller._call()
+        return {"Point": 1, "Line": 2}[self._type]
+
+    def getNodes(self) -> list[FakeNode]:
+        self._modeller._call()
+        return list(self._nodes)
+
+
+class FakeAttribute:
+    """Stand in for IFAttribute"""
+
+    def __init__(self, modeller:FakeModeller, id:int, name:str, assignments:list['FakeAssignment']):
+        self._modeller = modeller
+        self._id, self._name, self._assignments = id, name, assignments
+
+    def getID(self) -> int:
+        self._modeller._call()
+        return self._id
+
+    def getName(self) -> str:
+        self._modeller._call()
+        return self._name
+
+    def getAssignments(self, andAssignedObjects=None) -> list['FakeAssignment']:
+        self._modeller._call()
+        return list(self._assignments)
+
+
+class FakeAssignment:
+    """Stand in for IFAssignment"""
+
+    def __init__(self, modeller:FakeModeller, object):
+        self._modeller = modeller
+        self._object = object
+
+    def getDatabaseObject(self):
+        self._modeller._call()
+        return self._object
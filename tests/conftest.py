@@ -0,0 +1,20 @@
+# Stands in for pywin32 where it is not installed, e.g. on Linux, so that modules importing LPI, such as Helpers, can be
+# tested with Fake_Modeller. Only CastTo is used with the stand ins, and returns the object unchanged. Connecting to
+# Modeller raises.
+
+import sys
+import types
+
+try:
+    import win32com.client
+except ImportError:
+    def _no_modeller(*args, **kwargs):
+        raise RuntimeError("pywin32 is not installed, LUSAS Modeller cannot be started")
+
+    client = types.ModuleType("win32com.client")
+    client.CastTo = lambda obj, target: obj
+    client.Dispatch = _no_modeller
+    client.gencache = types.SimpleNamespace(EnsureDispatch=_no_modeller)
+    win32com = types.ModuleType("win32com")
+    win32com.client = client
+    sys.modules["win32com"], sys.modules["win32com.client"] = win32com, client
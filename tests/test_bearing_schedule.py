@@ -0,0 +1,77 @@
+# Checks Bearing_Schedule against the loop of #160, a results component set per loadset, component and max/min
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Bearing_Schedule
+from tests.Fake_Modeller import FakeModeller, fake_result
+
+N_BEARINGS, N_LOADSETS = 40, 6
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    ids = np.arange(1, N_BEARINGS + 1)
+    db.add_nodes(ids, np.column_stack([ids, np.zeros(N_BEARINGS), np.zeros(N_BEARINGS)]))
+    db.add_loadsets(range(1, N_LOADSETS + 1))
+    return lusas
+
+
+def loop(lusas:FakeModeller) -> np.ndarray:
+    db = lusas.database()
+    nodes = db.getObjects("Node")
+    context = lusas.newResultsContext(None)
+    obs = context.getCalcResultsSet()
+    for node in nodes:
+        obs.add(node)
+    values = np.full((N_LOADSETS, len(Bearing_Schedule.REACTION_COMPONENTS), 2, N_BEARINGS), np.nan)
+    for l in range(N_LOADSETS):
+        for j, component in enumerate(Bearing_Schedule.REACTION_COMPONENTS):
+            for e in range(2):
+                context.setActiveLoadset(db.getLoadset(l + 1))
+                results = db.getResultsComponentSet("Reaction", component, "Nodal", context)
+                i_comp = results.getComponentNumber(component)
+                for b, node in enumerate(nodes):
+                    values[l, j, e, b] = results.getContinuousResults(i_comp, node, None, None)
+    return values
+
+
+def test_matches_loop(lusas):
+    expected = loop(lusas)
+    schedule = Bearing_Schedule.extract_bearing_schedule(lusas, lusas.database().getObjects("Node"), range(1, N_LOADSETS + 1), method="continuous")
+    frame = schedule.to_frame()
+    n_components = len(Bearing_Schedule.REACTION_COMPONENTS)
+    assert np.allclose(frame.to_numpy().reshape(N_BEARINGS, N_LOADSETS, n_components, 2), expected.transpose(3, 0, 1, 2))
+
+
+def test_missing_loadsets_left_out(lusas):
+    schedule = Bearing_Schedule.extract_bearing_schedule(lusas, lusas.database().getObjects("Node"), [1, 99], method="continuous")
+    assert schedule.loadset_ids.tolist() == [1]
+
+
+def test_envelopes(lusas):
+    # Envelope 101/102 of all the loadcases and smart combination 103/104 of loadcases 2 and 3, given as max, min and max
+    db = lusas.database()
+    db.add_envelope(101, 102, range(1, N_LOADSETS + 1))
+    db.add_envelope(103, 104, [2, 3], smart=True)
+    nodes = db.getObjects("Node")
+    schedule = Bearing_Schedule.extract_bearing_schedule(lusas, nodes, [103, 101, 102], method="continuous")
+    frame = schedule.to_frame()
+    node_ids = np.arange(1, N_BEARINGS + 1)
+    for j, component in enumerate(Bearing_Schedule.REACTION_COMPONENTS):
+        values = frame[component].unstack("loadset")
+        assert np.allclose(values[("max", 101)], fake_result(node_ids, 0, j, N_LOADSETS))
+        assert np.allclose(values[("min", 101)], fake_result(node_ids, 0, j, 1))
+        assert np.allclose(values[("max", 103)], fake_result(node_ids, 0, j, 3))
+        assert np.allclose(values[("min", 103)], fake_result(node_ids, 0, j, 2))
+        # The min envelope has no max
+        assert np.isnan(values[("max", 102)]).all() and np.allclose(values[("min", 102)], fake_result(node_ids, 0, j, 1))
+
+    governing = schedule.governing()
+    maximum, minimum = governing.xs("max", level="extreme"), governing.xs("min", level="extreme")
+    assert (maximum["loadset"] == 101).all() and (maximum["loadset name"] == "Envelope 101 (Max)").all()
+    assert (minimum["loadset"] == 101).all()
+    # Coincident reactions of the governing loadcase
+    for j, component in enumerate(Bearing_Schedule.REACTION_COMPONENTS):
+        assert np.allclose(maximum[component].to_numpy(), np.repeat(fake_result(node_ids, 0, j, N_LOADSETS), len(schedule.components)))
@@ -0,0 +1,39 @@
+# Checks the spatial hash of Coincident_Nodes against comparing every pair of nodes, as approach 3 of #121
+
+import numpy as np
+from m100_Tools_And_Helpers import Coincident_Nodes
+from m100_Tools_And_Helpers._coincident_nodes_benchmark import create_synthetic_mesh, benchmark
+
+
+def brute_force_pairs(ids:np.ndarray, xyz:np.ndarray, tolerance:float) -> set[tuple[int, int]]:
+    distances = np.sqrt(np.square(xyz[None, :, :] - xyz[:, None, :]).sum(axis=2))
+    a, b = np.nonzero(np.triu(distances < tolerance, k=1))
+    return {(int(min(i, j)), int(max(i, j))) for i, j in zip(ids[a], ids[b])}
+
+
+def test_matches_brute_force():
+    ids, xyz = create_synthetic_mesh(2_000)
+    pairs = Coincident_Nodes.find_coincident_nodes(ids, xyz, 0.05)
+    found = {(int(min(a, b)), int(max(a, b))) for a, b in zip(pairs["Node A"], pairs["Node B"])}
+    assert len(found) == 20
+    assert found == brute_force_pairs(ids, xyz, 0.05)
+
+
+def test_small_chunks():
+    ids, xyz = create_synthetic_mesh(2_000, seed=1)
+    expected = Coincident_Nodes.find_coincident_nodes(ids, xyz, 0.05)
+    chunked = Coincident_Nodes.find_coincident_nodes(ids, xyz, 0.05, chunk_size=100)
+    assert len(chunked) == len(expected)
+
+
+def test_tolerance_larger_than_spacing():
+    ids, xyz = create_synthetic_mesh(500, spacing=0.1)
+    found = Coincident_Nodes.find_coincident_nodes(ids, xyz, 0.15)
+    assert len(found) == len(brute_force_pairs(ids, xyz, 0.15))
+
+
+def test_benchmark():
+    # The three approaches of #121 find the same pairs as the spatial hash where they are run on every node
+    times = benchmark([1_000], sample_limits={1: 1_000, 2: 1_000, 3: 1_000})
+    assert len(times) == 4 and not times["Extrapolated"].any()
+    assert (times["Pairs"] == times["Pairs"].iloc[0]).all()
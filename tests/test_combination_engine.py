@@ -0,0 +1,84 @@
+# Checks Combination_Engine against combinations calculated by hand, as in #123 Combinations View
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Combination_Engine
+
+# Results of loadcases 1, 2 and 3 at three locations
+RESULTS = np.array([[10.0, -5.0, 0.0],
+                    [ 4.0, -2.0, 3.0],
+                    [-6.0,  1.0, 2.0]])
+
+
+def test_basic_combination():
+    engine = Combination_Engine.CombinationEngine().add_basic_combination(10, [1, 2], [1.35, 1.5])
+    values = engine.evaluate([1, 2, 3], RESULTS)
+    assert np.allclose(values[10], [1.35*10 + 1.5*4, 1.35*-5 + 1.5*-2, 1.5*3])
+
+
+def test_smart_combination():
+    # Loadcase 1 is permanent (beneficial 1.0, adverse 1.35), loadcases 2 and 3 are variable (adverse 1.5)
+    engine = Combination_Engine.CombinationEngine().add_smart_combination(20, 21, [1, 2, 3], [1.0, 0.0, 0.0], [0.35, 1.5, 1.5])
+    values = engine.evaluate([1, 2, 3], RESULTS)
+    # Max: adverse permanent where positive, variable only where adverse
+    assert np.allclose(values[20], [1.35*10 + 1.5*4, 1.0*-5 + 1.5*1, 1.5*3 + 1.5*2])
+    # Min: beneficial permanent where positive, variable only where it reduces the result
+    assert np.allclose(values[21], [1.0*10 + 1.5*-6, 1.35*-5 + 1.5*-2, 0.0])
+
+
+def test_envelope_governing():
+    engine = Combination_Engine.CombinationEngine().add_envelope(30, 31, [1, 2, 3])
+    values, governing = engine.evaluate([1, 2, 3], RESULTS, return_governing=True)
+    assert np.allclose(values[30], [10.0, 1.0, 3.0]) and np.allclose(values[31], [-6.0, -5.0, 0.0])
+    assert governing[30].tolist() == [1, 3, 2] and governing[31].tolist() == [3, 1, 1]
+
+
+def test_envelope_of_combinations():
+    # As in #123, the smart combination governs both the max and the min
+    engine = Combination_Engine.CombinationEngine().add_basic_combination(10, [1, 2], [1.35, 1.5])
+    engine.add_smart_combination(20, 21, [1, 2, 3], [1.0, 0.0, 0.0], [0.35, 1.5, 1.5])
+    engine.add_envelope(30, 31, [10, 20, 21])
+    values = engine.evaluate([1, 2, 3], RESULTS)
+    assert np.allclose(values[30], values[20]) and np.allclose(values[31], values[21])
+
+
+def test_envelope_of_envelopes_governed_by_loadcases():
+    engine = Combination_Engine.CombinationEngine().add_envelope(30, 31, [1, 2]).add_envelope(40, 41, [30, 31, 3])
+    values, governing = engine.evaluate([1, 2, 3], RESULTS, return_governing=True)
+    assert np.allclose(values[40], [10.0, 1.0, 3.0]) and np.allclose(values[41], [-6.0, -5.0, 0.0])
+    assert governing[40].tolist() == [1, 3, 2] and governing[41].tolist() == [3, 1, 1]
+
+
+def test_smart_combination_of_max_min_pair():
+    # Both the max and min of the envelope of loadcases 1 and 2 are included with the same factors, they are treated as
+    # a single variable entry lying between the max and min: the max is applied where positive and the min where negative
+    engine = Combination_Engine.CombinationEngine().add_envelope(30, 31, [1, 2])
+    engine.add_smart_combination(50, 51, [30, 31, 3], [0.0, 0.0, 1.0], [1.5, 1.5, 0.0])
+    values = engine.evaluate([1, 2, 3], RESULTS)
+    # Envelope max [10, -2, 3] and min [4, -5, 0]
+    assert np.allclose(values[50], [1.5*10 - 6.0, 0.0 + 1.0, 1.5*3 + 2.0])
+    assert np.allclose(values[51], [0.0 - 6.0, 1.5*-5 + 1.0, 0.0 + 2.0])
+
+
+def test_smart_combination_of_envelope_max_only():
+    # The max alone is an ordinary entry
+    engine = Combination_Engine.CombinationEngine().add_envelope(30, 31, [1, 2])
+    engine.add_smart_combination(50, 51, [30], [1.0], [0.5])
+    values = engine.evaluate([1, 2, 3], RESULTS)
+    assert np.allclose(values[50], [1.5*10, 1.0*-2, 1.5*3]) and np.allclose(values[51], [1.0*10, 1.5*-2, 1.0*3])
+
+
+def test_chunks_match_whole():
+    rng = np.random.default_rng(0)
+    results = rng.normal(size=(3, 100, 2))
+    engine = Combination_Engine.CombinationEngine().add_smart_combination(20, 21, [1, 2, 3], [1.0, 0.0, 0.0], [0.35, 1.5, 1.5])
+    engine.add_envelope(30, 31, [20, 21, 1])
+    whole = engine.evaluate([1, 2, 3], results)
+    chunked = engine.evaluate([1, 2, 3], results, chunk_size=7)
+    assert all(whole[id].shape == (100, 2) and np.allclose(whole[id], chunked[id]) for id in whole)
+
+
+def test_missing_loadset():
+    engine = Combination_Engine.CombinationEngine().add_basic_combination(10, [1, 4], [1.0, 1.0])
+    with pytest.raises(ValueError, match="without results"):
+        engine.evaluate([1, 2, 3], RESULTS)
@@ -0,0 +1,72 @@
+# Checks Element_Results against asking each element for each results point, as in #02
+
+import numpy as np
+from m100_Tools_And_Helpers import Element_Results
+from tests.Fake_Modeller import FakeModeller, FAKE_COMPONENTS
+
+ENTITY = "Force/Moment - Thick 3D Beam"
+
+
+def new_modeller(n_elements:int=200, n_points:int=5) -> FakeModeller:
+    lusas = FakeModeller()
+    lusas.database().add_elements(np.arange(1, n_elements + 1), n_points)
+    lusas.database().add_loadsets([1])
+    return lusas
+
+
+def per_point(lusas:FakeModeller, components:list[str]) -> np.ndarray:
+    elements = lusas.db().getObjects("Element")
+    values = np.full((len(elements), max(e.countInternalPoints() for e in elements), len(components)), np.nan)
+    for row, e in enumerate(elements):
+        for i in range(e.countInternalPoints()):
+            for j, component in enumerate(components):
+                values[row, i, j] = e.getInternalResults(i, ENTITY, component)[0]
+    return values
+
+
+def test_matches_per_point():
+    lusas = new_modeller()
+    expected = per_point(lusas, FAKE_COMPONENTS)
+    objects = lusas.newObjectSet().add("Thick 3D Beam")
+    ids, values = Element_Results.extract_element_results(lusas, 1, ENTITY, FAKE_COMPONENTS, "Internal", objects, method="array")
+    assert np.array_equal(ids, np.arange(1, 201))
+    assert np.array_equal(values, expected)
+
+
+def test_threads():
+    lusas = new_modeller()
+    objects = lusas.newObjectSet().add("Thick 3D Beam")
+    _, expected = Element_Results.extract_element_results(lusas, 1, ENTITY, ["Fx", "My"], "Internal", objects, method="array")
+    _, values = Element_Results.extract_element_results(lusas, 1, ENTITY, ["Fx", "My"], "Internal", objects, method="array", n_threads=4)
+    assert np.array_equal(values, expected)
+
+
+def test_fewer_calls_than_per_point():
+    lusas = new_modeller()
+    lusas.reset_calls()
+    per_point(lusas, FAKE_COMPONENTS)
+    loop_calls = lusas.calls
+    lusas.reset_calls()
+    Element_Results.extract_element_results(lusas, 1, ENTITY, FAKE_COMPONENTS, "Internal", lusas.newObjectSet().add("Thick 3D Beam"), method="array")
+    assert lusas.calls < loop_calls / 4
+
+
+def test_mixed_points_padded_with_nan():
+    lusas = FakeModeller()
+    lusas.database().add_elements(np.arange(1, 11), np.where(np.arange(10) < 5, 2, 3))
+    lusas.database().add_loadsets([1])
+    _, values = Element_Results.extract_element_results(lusas, 1, ENTITY, ["Fx"], "Internal", lusas.newObjectSet().add("Thick 3D Beam"), method="array")
+    assert values.shape == (10, 3, 1)
+    assert np.isnan(values[:5, 2]).all() and not np.isnan(values[5:]).any()
+
+
+
+def test_statistics_count_calls():
+    lusas = new_modeller()
+    objects = lusas.newObjectSet().add("Thick 3D Beam")
+    lusas.reset_calls()
+    ids, _ = Element_Results.extract_element_results(lusas, 1, ENTITY, FAKE_COMPONENTS, "Internal", objects)
+    statistics = Element_Results.extraction_statistics
+    assert statistics["com_calls"] == lusas.calls
+    assert statistics["elements"] == len(ids) and statistics["components"] == len(FAKE_COMPONENTS)
+    assert statistics["calls_per_second"] > 0
@@ -0,0 +1,91 @@
+# Checks that an extraction job which fails part way, as if Modeller stopped responding, carries on when run again
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from m100_Tools_And_Helpers import Extraction_Jobs, Results_Query
+from tests.Fake_Modeller import FakeModeller
+
+ENTITY = "Force/Moment - Thick 3D Beam"
+COMPONENTS = ["Fx", "My"]
+N_LOADSETS = 6
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_elements(np.arange(1, 201), 3)
+    db.add_loadsets(range(1, N_LOADSETS + 1))
+    return lusas
+
+
+def test_rerun_after_crash(lusas, tmp_path):
+    loadset_ids = list(range(1, N_LOADSETS + 1))
+    expected = Results_Query.query(lusas, ENTITY, COMPONENTS, loadset_ids, "ElementNodal", format="wide", method="array").sort_index()
+    units = Extraction_Jobs.plan_units(lusas, loadset_ids, [(ENTITY, COMPONENTS, "ElementNodal")], chunk_size=50)
+    assert len(units) == N_LOADSETS * 4
+    crash_at = len(units) * 2 // 3
+    extractor = Extraction_Jobs._ResultsExtractor(lusas, "array")
+
+    def crashing(unit:Extraction_Jobs.JobUnit) -> pd.DataFrame:
+        # Every unit after crash_at raises, as the calls of a crashed Modeller do
+        if units.index(unit) >= crash_at:
+            raise RuntimeError("The remote procedure call failed")
+        return extractor(unit)
+
+    store = Extraction_Jobs.JobStore(str(tmp_path))
+    report = Extraction_Jobs.run_units(units, crashing, store, retries=0)
+    assert report.extracted == crash_at and len(report.failures) == len(units) - crash_at
+    progress = []
+    report = Extraction_Jobs.run_units(units, extractor, store, retries=0, progress=progress.append)
+    assert report.skipped == crash_at and report.extracted == len(units) - crash_at and not report.failures
+    assert progress[-1].completed == len(units)
+
+    result = Extraction_Jobs.collect(store, units).drop(columns="entity").sort_index()
+    assert result.index.equals(expected.index) and np.allclose(result.to_numpy(), expected.to_numpy())
+
+
+def test_stop_on_error(lusas, tmp_path):
+    units = Extraction_Jobs.plan_units(lusas, [1, 2], [(ENTITY, COMPONENTS, "ElementNodal")], chunk_size=100)
+
+    def failing(unit:Extraction_Jobs.JobUnit) -> pd.DataFrame:
+        raise ValueError("No results")
+
+    with pytest.raises(ValueError):
+        Extraction_Jobs.run_units(units, failing, Extraction_Jobs.JobStore(str(tmp_path)), stop_on_error=True)
+
+
+def test_key_depends_on_request():
+    ids = np.arange(1, 11)
+    unit = Extraction_Jobs.JobUnit(1, ENTITY, ["Fx"], "ElementNodal", 0, ids)
+    assert unit.key == Extraction_Jobs.JobUnit(1, ENTITY, ["Fx"], "ElementNodal", 0, ids.copy()).key
+    assert unit.key != Extraction_Jobs.JobUnit(1, ENTITY, ["My"], "ElementNodal", 0, ids).key
+    assert unit.key != Extraction_Jobs.JobUnit(1, ENTITY, ["Fx"], "ElementNodal", 0, ids, "Global").key
+
+
+def test_key_depends_on_model(lusas):
+    units = Extraction_Jobs.plan_units(lusas, [1], [(ENTITY, COMPONENTS, "ElementNodal")])
+    # As saving or solving the model again, which changes the modification time of the analysis
+    lusas.database()._modification_time += 1
+    assert units[0].key != Extraction_Jobs.plan_units(lusas, [1], [(ENTITY, COMPONENTS, "ElementNodal")])[0].key
+
+
+class DisconnectedError(Exception):
+    # As pywintypes.com_error once Modeller has crashed
+    hresult = -2147023174
+
+
+def test_stops_when_disconnected(lusas, tmp_path):
+    units = Extraction_Jobs.plan_units(lusas, [1, 2], [(ENTITY, COMPONENTS, "ElementNodal")], chunk_size=100)
+    calls = []
+
+    def disconnected(unit:Extraction_Jobs.JobUnit) -> pd.DataFrame:
+        calls.append(unit)
+        raise DisconnectedError("The RPC server is unavailable")
+
+    store = Extraction_Jobs.JobStore(str(tmp_path))
+    with pytest.raises(ConnectionError):
+        Extraction_Jobs.run_units(units, disconnected, store, retries=2)
+    assert len(calls) == 1 and not os.listdir(tmp_path)
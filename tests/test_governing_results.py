@@ -0,0 +1,47 @@
+# Checks Governing_Results against extracting every loadset and filtering with pandas, and resuming from a checkpoint
+
+import os
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Governing_Results, Results_Query
+from tests.Fake_Modeller import FakeModeller
+
+ENTITY = "Force/Moment - Thick 3D Beam"
+N_ELEMENTS, N_POINTS, N_LOADSETS, N = 100, 3, 40, 5
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_elements(np.arange(1, N_ELEMENTS + 1), N_POINTS)
+    db.add_loadsets(range(1, N_LOADSETS + 1))
+    return lusas
+
+
+def test_matches_pandas(lusas):
+    everything = Results_Query.query(lusas, ENTITY, ["My", "Fz"], list(range(1, N_LOADSETS + 1)), "ElementNodal", format="wide", method="array")
+    expected = everything.sort_values("My", ascending=False).groupby(level=["element", "point"]).head(N)
+    top = expected.reset_index().sort_values(["element", "point", "My"], ascending=[True, True, False])
+    result = Governing_Results.find_governing(lusas, ENTITY, "My", N, coincident=["Fz"], location="ElementNodal", block=7, method="array")
+    assert np.allclose(result.max_values.reshape(-1), top["My"].to_numpy())
+    assert np.array_equal(result.max_loadsets.reshape(-1), top["loadset"].to_numpy())
+    assert np.allclose(result.max_coincident[:, :, 0].reshape(-1), top["Fz"].to_numpy())
+
+
+def test_resume_from_checkpoint(lusas, tmp_path):
+    filename = os.path.join(tmp_path, "governing.npz")
+    result = Governing_Results.find_governing(lusas, ENTITY, "My", N, None, ["Fz"], "ElementNodal", block=5, method="array")
+
+    def interrupt(done:int, total:int):
+        if done >= total // 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        Governing_Results.find_governing(lusas, ENTITY, "My", N, None, ["Fz"], "ElementNodal", block=5, checkpoint=filename,
+                                         method="array", progress=interrupt)
+    progress = []
+    resumed = Governing_Results.find_governing(lusas, ENTITY, "My", N, None, ["Fz"], "ElementNodal", block=5, checkpoint=filename,
+                                               method="array", progress=lambda done, total: progress.append(done))
+    assert progress[0] > N_LOADSETS // 2
+    assert np.array_equal(resumed.max_values, result.max_values) and np.array_equal(resumed.min_loadsets, result.min_loadsets)
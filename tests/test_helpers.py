@@ -0,0 +1,90 @@
+# Checks the bulk helpers of Helpers against creating and reading objects one at a time. Helpers imports LPI, which
+# needs pywin32, stood in for by conftest where it is not installed
+
+import numpy as np
+import pytest
+from tests.Fake_Modeller import FakeModeller, FakeNode
+from m100_Tools_And_Helpers import Helpers
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    Helpers.initialise(lusas)
+    Helpers.clear_node_table_cache()
+    return lusas
+
+
+def test_create_lines(lusas):
+    girders, segments = 4, 20
+    X, Y = np.meshgrid(np.arange(segments + 1) * 1.0, np.arange(girders) * 2.0)
+    grid = np.stack([X, Y, np.zeros_like(X)], axis=-1)
+    start_xyz = np.vstack([grid[:, :-1].reshape(-1, 3), grid[:-1, :].transpose(1, 0, 2).reshape(-1, 3)])
+    end_xyz = np.vstack([grid[:, 1:].reshape(-1, 3), grid[1:, :].transpose(1, 0, 2).reshape(-1, 3)])
+    # One line per call, as create_line_by_coordinates
+    for (x1, y1, z1), (x2, y2, z2) in zip(start_xyz.tolist(), end_xyz.tolist()):
+        geometry_data = lusas.geometryData().setAllDefaults()
+        geometry_data.setLowerOrderGeometryType("coordinates")
+        geometry_data.setCreateMethod("straight")
+        geometry_data.addCoords(x1, y1, z1)
+        geometry_data.addCoords(x2, y2, z2)
+        lusas.database().createLine(geometry_data).getObject("Line").getID()
+    loop_calls = lusas.calls
+    lusas.reset_calls()
+    line_ids = Helpers.create_lines(start_xyz, end_xyz)
+    assert len(line_ids) == len(start_xyz) and len(np.unique(line_ids)) == len(line_ids)
+    assert lusas.calls < loop_calls / 2
+
+
+def test_get_node_table_cached(lusas):
+    xyz = np.random.default_rng(0).random((500, 3))
+    lusas.db().add_nodes(np.arange(1, 501), xyz)
+    nodes = lusas.db().getObjects("Node")
+    table = Helpers.get_node_table(nodes)
+    assert np.array_equal(table["id"], np.arange(1, 501))
+    assert np.allclose(np.column_stack([table["x"], table["y"], table["z"]]), xyz)
+    lusas.reset_calls()
+    saved = Helpers.node_table_statistics["com_calls_saved"]
+    Helpers.get_node_table(nodes)
+    # Only the IDs are read again
+    assert lusas.calls < 520
+    assert Helpers.node_table_statistics["com_calls_saved"] - saved == 4 * 500 - lusas.calls
+
+
+def test_get_node_table_fallback(lusas, monkeypatch):
+    # Where getXYZ is not available the coordinates are read one at a time, with a warning
+    lusas.db().add_nodes(np.arange(1, 11), np.arange(30.0).reshape(10, 3))
+    monkeypatch.delattr(FakeNode, "getXYZ")
+    with pytest.warns(UserWarning):
+        table = Helpers.get_node_table()
+    assert np.allclose(table["z"], np.arange(2.0, 30.0, 3.0))
+
+
+def test_get_node_table_error(lusas, monkeypatch):
+    # Other errors are not hidden by the fallback
+    lusas.db().add_nodes(np.arange(1, 11), np.zeros((10, 3)))
+    def disconnected(self, X, Y=None, Z=None):
+        raise ConnectionError("Modeller has closed")
+    monkeypatch.setattr(FakeNode, "getXYZ", disconnected)
+    with pytest.raises(ConnectionError):
+        Helpers.get_node_table()
+
+
+def test_fast_session_restores_state(lusas):
+    with Helpers.fast_session(lusas, "Create") as session:
+        assert not lusas.isUIEnabled()
+    assert lusas.isUIEnabled()
+    assert session.statistics["seconds"] is not None
+    # The calls of the block and those made by the session to disable the user interface and open the command batch
+    assert session.statistics["com_calls"] >= 5
+    assert Helpers.fast_session_statistics[-1] is session.statistics
+
+
+def test_fast_session_keeps_error(lusas, capsys):
+    # An error restoring Modeller does not replace the error of the block
+    with pytest.raises(ValueError):
+        with Helpers.fast_session(lusas, "Create"):
+            lusas.database().command_batches.clear()
+            raise ValueError("Error of the block")
+    assert lusas.isUIEnabled()
+    assert "Error closing fast session Create" in capsys.readouterr().out
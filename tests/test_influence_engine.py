@@ -0,0 +1,49 @@
+# Checks the vehicle search of Influence_Engine against placing the vehicle one position at a time
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Influence_Engine
+
+SPAN = 100.0
+
+
+@pytest.fixture
+def influence():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.0, SPAN, 501)
+    # Influence lines of bending moment at points along a simply supported span, and some noise
+    a = np.linspace(0.05, 0.95, 20)[:, None] * SPAN
+    values = np.where(x[None, :] <= a, x[None, :] * (SPAN - a) / SPAN, a * (SPAN - x[None, :]) / SPAN) + rng.normal(0, 0.01, (20, len(x)))
+    return Influence_Engine.InfluenceLine.from_points(x, values, SPAN / 500, [f"M at {v:.1f}" for v in a[:, 0]])
+
+
+@pytest.fixture
+def vehicles():
+    return [Influence_Engine.parse_vehicle("MyVehicle1", "0|2|5|2", "5000|5000|5000|5000", "1.5|1.5|2|2"),
+            Influence_Engine.parse_vehicle("MyVehicle2", "0|2|5|2|0", "5000|5000|5000|3000|3000", "1.5|1.5|2|2|2.5")]
+
+
+def test_line_effects_match_reference(influence, vehicles):
+    positions, effects = Influence_Engine.line_effects(influence, vehicles[1])
+    check = np.random.default_rng(1).choice(len(positions), 50, replace=False)
+    expected = Influence_Engine.reference_line_effects(influence, vehicles[1], positions[check])
+    assert np.allclose(effects[:, check], expected)
+
+
+def test_find_worst(influence, vehicles):
+    worst = Influence_Engine.find_worst(influence, vehicles)
+    assert len(worst) == 20 * 4
+    for vehicle in vehicles:
+        _, effects = Influence_Engine.line_effects(influence, vehicle)
+        assert (worst.xs(vehicle.name, level="vehicle")["max"].to_numpy() >= effects.max(axis=1) - 1e-9).all()
+    envelope = Influence_Engine.get_envelope(worst)
+    assert np.isclose(envelope["max"].max(), worst["max"].max())
+
+
+def test_simply_supported_midspan(vehicles):
+    # A single 1 unit load at midspan of a simply supported span gives L / 4
+    x = np.linspace(0.0, SPAN, 1001)
+    influence = Influence_Engine.InfluenceLine.from_points(x, np.where(x <= 50.0, x / 2, (SPAN - x) / 2)[None, :], 0.1, ["M mid"])
+    point_load = Influence_Engine.parse_vehicle("Point", "0", "1", "0")
+    worst = Influence_Engine.find_worst(influence, [point_load], both_directions=False)
+    assert np.isclose(worst["max"].iloc[0], SPAN / 4)
@@ -0,0 +1,47 @@
+# Checks Member_Results in one process against the slices shared between worker processes
+
+import functools
+import numpy as np
+from m100_Tools_And_Helpers import Member_Results
+from tests.Fake_Modeller import FakeModeller, fake_result
+
+
+def new_fake_modeller(n_slices:int, n_locations:int, n_loadsets:int, latency:float=0.0) -> FakeModeller:
+    """Fake Modeller with slices named "Girder 1", "Girder 2", ... and loadcases 1, 2, ..., e.g. as modeller factory"""
+    lusas = FakeModeller(latency=latency)
+    lusas.database().add_slices([f"Girder {i + 1}" for i in range(n_slices)], n_locations)
+    lusas.database().add_loadsets(range(1, n_loadsets + 1))
+    return lusas
+
+
+def test_shape():
+    results = Member_Results.extract_slice_results(new_fake_modeller(4, 10, 3), ["Girder 1", "Girder 3"], [1, 2, 3, 99])
+    assert results.values.shape == (2, 3, 10, len(Member_Results.SLICE_COMPONENTS))
+    assert results.loadset_ids.tolist() == [1, 2, 3]
+    assert not np.isnan(results.values).any()
+
+
+def test_parallel_matches_one_process():
+    names = [f"Girder {i + 1}" for i in range(6)]
+    factory = functools.partial(new_fake_modeller, 6, 10, 4)
+    expected = Member_Results.extract_slice_results(factory(), names, [1, 2, 3, 4])
+    results = Member_Results.extract_slice_results_parallel("Fake.mdl", names, [1, 2, 3, 4], n_workers=2, modeller_factory=factory)
+    assert results.slices == names
+    assert np.array_equal(results.values, expected.values)
+
+
+def test_envelope_max_and_min():
+    lusas = new_fake_modeller(2, 5, 3)
+    lusas.database().add_envelope(101, 102, [1, 2, 3], smart=True)
+    results = Member_Results.extract_slice_results(lusas, ["Girder 1", "Girder 2"], [1, 101, 102])
+    # The max gives its min, the min alone only itself
+    assert results.loadset_ids.tolist() == [1, 101, 102, 102]
+    assert results.extremes == ["", "max", "min", "min"]
+    assert results.get_labels()[1] == "SmartCombination 101 (Max) max"
+    locations, components = np.meshgrid(np.arange(5), np.arange(len(Member_Results.SLICE_COMPONENTS)), indexing="ij")
+    for i, number in enumerate([1, 2]):
+        assert np.allclose(results.values[i, 1], fake_result(number, locations, components, 3))
+        assert np.allclose(results.values[i, 2], fake_result(number, locations, components, 1))
+        assert np.array_equal(results.values[i, 3], results.values[i, 2])
+    totals_max, totals_min = results.get_totals()
+    assert np.allclose(totals_max, results.values[:, 0] + results.values[:, 1])
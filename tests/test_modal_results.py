@@ -0,0 +1,70 @@
+# Checks Modal_Results against reading the modes one value at a time, as #210, and against combining one spectrum
+# at a time with a loop over the modes
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Modal_Results
+from tests.Fake_Modeller import FakeModeller
+
+N_NODES, N_MODES = 50, 8
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_nodes(np.arange(1, N_NODES + 1), np.zeros((N_NODES, 3)))
+    db.add_modes(1, np.linspace(1.0, 20.0, N_MODES), np.full((N_MODES, 3), 1.0 / N_MODES), total_mass=100.0)
+    return lusas
+
+
+def value_at_a_time(lusas:FakeModeller) -> np.ndarray:
+    db = lusas.database()
+    context = lusas.newResultsContext(None)
+    shapes = np.empty((N_MODES, N_NODES, len(Modal_Results.MODE_COMPONENTS)))
+    nodes = db.getObjects("Node")
+    for m, mode in enumerate(db.getLoadset(1).getResultsLoadcases()):
+        context.setActiveLoadset(mode)
+        for j, component in enumerate(Modal_Results.MODE_COMPONENTS):
+            results = db.getResultsComponentSet("Displacement", component, "Nodal", context)
+            for n, node in enumerate(nodes):
+                shapes[m, n, j] = results.getContinuousResults(results.getComponentNumber(component), node, None, None)
+    return shapes
+
+
+@pytest.fixture
+def modal(lusas):
+    return Modal_Results.extract_modes(lusas, 1, method="continuous")
+
+
+def test_extract_modes(lusas, modal):
+    assert np.allclose(modal.shapes, value_at_a_time(lusas))
+    assert np.allclose(modal.frequencies, np.linspace(1.0, 20.0, N_MODES))
+    assert np.allclose(modal.to_frame()["Cumulative X"].iloc[-1], 1.0)
+
+
+@pytest.mark.parametrize("rule", Modal_Results.RULES)
+def test_response_spectrum_matches_loop(modal, rule):
+    periods = np.linspace(0.01, 4.0, 100)
+    spectra = np.random.default_rng(0).uniform(0.5, 5.0, (20, len(periods)))
+    accelerations = Modal_Results.interpolate_spectra(periods, spectra, modal.periods)
+    w = modal.circular_frequencies
+    # Factors of both signs, which CQC depends on
+    factors = modal.get_participation_factors("X") * np.where(np.arange(N_MODES) % 3 == 0, -1.0, 1.0)
+    combined = Modal_Results.response_spectrum(modal, accelerations, "X", rule, factors=factors, block=7)
+    rho = Modal_Results.get_cqc_coefficients(w, 0.05) if rule == "CQC" else np.eye(N_MODES)
+    for s in range(len(spectra)):
+        peaks = [factors[i] * accelerations[s, i] / w[i]**2 * modal.shapes[i] for i in range(N_MODES)]
+        total = sum(rho[i, j] * peaks[i] * peaks[j] for i in range(N_MODES) for j in range(N_MODES))
+        assert np.allclose(np.sqrt(total), combined[s])
+
+
+def test_cqc_coefficients():
+    rho = Modal_Results.get_cqc_coefficients(np.array([1.0, 1.0001, 10.0]), 0.05)
+    assert np.allclose(np.diag(rho), 1.0) and np.allclose(rho, rho.T)
+    assert rho[0, 1] > 0.99 and rho[0, 2] < 0.01
+
+
+def test_cqc_needs_factors(modal):
+    with pytest.raises(AssertionError):
+        Modal_Results.response_spectrum(modal, np.ones((1, N_MODES)), "X", "CQC")
@@ -0,0 +1,63 @@
+# Checks that Model_Builder only runs again the steps whose inputs, or the steps whose objects they use, have changed,
+# including when Modeller gives the objects of a rebuilt step the IDs of those it deleted, as in #125
+
+import os
+import pytest
+from tests.Fake_Modeller import FakeModeller
+from m100_Tools_And_Helpers import Model_Builder
+
+
+def create_points(lusas:FakeModeller, width:float) -> list:
+    geometry_data = lusas.geometryData().setAllDefaults()
+    geometry_data.setLowerOrderGeometryType("coordinates")
+    for x in (0.0, width):
+        geometry_data.addCoords(x, 0.0, 0.0)
+    return lusas.database().createPoint(geometry_data).getObjects("Point")
+
+
+def create_line(lusas:FakeModeller, points:list) -> list:
+    geometry_data = lusas.geometryData().setAllDefaults()
+    geometry_data.setLowerOrderGeometryType("coordinates")
+    geometry_data.setCreateMethod("straight")
+    for _ in points:
+        geometry_data.addCoords(0.0, 0.0, 0.0)
+    return lusas.database().createLine(geometry_data).getObjects("Line")
+
+
+def build(lusas:FakeModeller, state_file:str, deck_width:float, loading:bool=True) -> dict:
+    builder = Model_Builder.ModelBuilder(lusas, state_file)
+    deck = builder.step("Deck", lambda width: create_points(lusas, width), width=deck_width)
+    if loading:
+        builder.step("Loading", lambda points: create_line(lusas, points), points=deck)
+    return builder.finish()
+
+
+@pytest.fixture
+def state_file(tmp_path) -> str:
+    return os.path.join(tmp_path, "model.build.json")
+
+
+def test_unchanged_steps_reused(state_file):
+    lusas = FakeModeller()
+    assert build(lusas, state_file, 10.0)["built"] == ["Deck", "Loading"]
+    summary = build(lusas, state_file, 10.0)
+    assert summary["reused"] == ["Deck", "Loading"] and summary["built"] == []
+
+
+def test_dependants_rebuilt_when_ids_reused(state_file):
+    lusas = FakeModeller()
+    build(lusas, state_file, 10.0)
+    ids = [p.getID() for p in lusas.database().getObjects("Point")]
+    summary = build(lusas, state_file, 12.0)
+    # The new points of the deck have the IDs of the deleted ones
+    assert [p.getID() for p in lusas.database().getObjects("Point")] == ids
+    assert summary["built"] == ["Deck", "Loading"]
+    assert len(lusas.database().getObjects("Line")) == 1
+
+
+def test_steps_not_run_deleted(state_file):
+    lusas = FakeModeller()
+    build(lusas, state_file, 10.0)
+    summary = build(lusas, state_file, 10.0, loading=False)
+    assert summary["deleted"] == ["Loading"] and summary["reused"] == ["Deck"]
+    assert lusas.database().getObjects("Line") == []
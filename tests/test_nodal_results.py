@@ -0,0 +1,36 @@
+# Checks Nodal_Results against asking each node for each component
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Nodal_Results
+from tests.Fake_Modeller import FakeModeller
+
+COMPONENTS = ["FX", "FY", "FZ"]
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    ids = np.arange(1, 101)
+    db.add_nodes(ids, np.zeros((len(ids), 3)))
+    db.add_loadsets([1])
+    return lusas
+
+
+def test_read_matches_each_node(lusas):
+    db = lusas.database()
+    nodes = db.getObjects("Node")[::2]
+    context = lusas.newResultsContext(None)
+    for node in nodes:
+        context.getCalcResultsSet().add(node)
+    context.setActiveLoadset(db.getLoadset(1))
+    results = db.getResultsComponentSet("Reaction", COMPONENTS[0], "Nodal", context)
+    reader = Nodal_Results.NodalReader(nodes, [n.getID() for n in nodes], COMPONENTS)
+    expected = [[results.getContinuousResults(results.getComponentNumber(c), node, None, None) for c in COMPONENTS] for node in nodes]
+    assert np.array_equal(reader.read(results), np.array(expected, dtype=float), equal_nan=True)
+
+
+def test_unknown_method(lusas):
+    with pytest.raises(AssertionError):
+        Nodal_Results.NodalReader([], [], COMPONENTS, "dump")
@@ -0,0 +1,70 @@
+# Checks Parametric_Study with a stand in for a parametric model, including worker processes that crash
+
+import os
+import random
+import functools
+import numpy as np
+from m100_Tools_And_Helpers import Parametric_Study
+from tests.Fake_Modeller import FakeModeller
+
+
+def fake_worker(lusas:FakeModeller, parameters:dict) -> dict:
+    """Stand in for a parametric model. Makes the given number of calls to Modeller and crashes the worker process
+       with the given probability
+    """
+    if random.random() < parameters.get("crash_probability", 0.0):
+        os._exit(1)
+    n = int(parameters["calls"])
+    lusas.reset_calls()
+    db = lusas.database()
+    ids = np.arange(1, n + 1)
+    db.add_nodes(ids, np.column_stack([ids * parameters.get("span", 1.0) / n, np.zeros(n), np.zeros(n)]))
+    x = [db.getObject("Node", id).getX() for id in ids[:n // 2 + 1]]
+    return {"max_x": max(x, default=0.0), "com_calls": lusas.calls}
+
+
+def raising_worker(lusas:FakeModeller, parameters:dict) -> dict:
+    if parameters["span"] == 12.0:
+        raise ValueError("Span not supported")
+    return {"max_x": parameters["span"]}
+
+
+def crashing_worker(lusas:FakeModeller, parameters:dict) -> dict:
+    if parameters["span"] == 12.0:
+        os._exit(1)
+    return {"max_x": parameters["span"]}
+
+
+def test_results_in_order():
+    parameter_sets = [{"span": 10.0 + i, "calls": 20} for i in range(8)]
+    table = Parametric_Study.run_study(fake_worker, parameter_sets, n_workers=2, modeller_factory=FakeModeller)
+    assert table["error"].isna().all()
+    assert np.allclose(table["max_x"], table["span"] * 11 / 20)
+    assert (table["attempts"] == 1).all()
+
+
+def test_error_recorded_after_retries():
+    parameter_sets = [{"span": 10.0 + i} for i in range(4)]
+    table = Parametric_Study.run_study(raising_worker, parameter_sets, n_workers=2, retries=1, modeller_factory=FakeModeller)
+    failed = table[table["error"].notna()]
+    assert failed["span"].tolist() == [12.0]
+    assert failed["attempts"].tolist() == [2]
+    assert failed["error"].iloc[0] == "ValueError: Span not supported"
+
+
+def test_crashes_retried():
+    random.seed(0)
+    parameter_sets = [{"span": 10.0 + i, "calls": 20, "crash_probability": 0.2} for i in range(12)]
+    factory = functools.partial(FakeModeller, latency=0.0)
+    table = Parametric_Study.run_study(fake_worker, parameter_sets, n_workers=2, retries=20, modeller_factory=factory)
+    assert table["error"].isna().all()
+
+
+def test_crash_charged_to_crashing_set():
+    parameter_sets = [{"span": 10.0 + i} for i in range(8)]
+    table = Parametric_Study.run_study(crashing_worker, parameter_sets, n_workers=3, retries=2, modeller_factory=FakeModeller)
+    failed = table[table["error"].notna()]
+    assert failed["span"].tolist() == [12.0]
+    assert failed["attempts"].tolist() == [3]
+    assert failed["error"].iloc[0] == "Worker process crashed"
+    assert (table.loc[table["error"].isna(), "attempts"] == 1).all()
@@ -0,0 +1,69 @@
+# Checks PRW_Export reads the sample text export of DataFiles/PRW, written by hand in the layout assumed by PRW_Export,
+# rejects lines it does not recognise, and sets up the wizard without passing None to Modeller
+
+import os
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import PRW_Export
+from tests.Fake_Modeller import FakeModeller
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "m100_Tools_And_Helpers", "DataFiles", "PRW", "Beam Results.txt")
+
+
+def test_sample():
+    frame = PRW_Export.read_text(SAMPLE)
+    assert frame.index.get_level_values("loadset").unique().tolist() == [1, 2]
+    assert len(frame) == 2 * 20 * 6
+    assert frame.loc[(1, 5, 6, "My"), "value"] == 41.666666666666664
+    assert frame.loc[(2, 1, 2, "Fz"), "value"] == 14.800000000000001
+
+
+def test_chunks_match_whole():
+    whole = PRW_Export.read_text(SAMPLE)
+    chunked = PRW_Export.read_text(SAMPLE, chunk_rows=7)
+    assert whole.index.equals(chunked.index) and np.array_equal(whole["value"], chunked["value"])
+
+
+def test_titles_without_ids(tmp_path):
+    with open(SAMPLE) as f:
+        text = f.read().replace("1:Dead", "Dead").replace("2:Live", "Live")
+    filename = tmp_path / "titles.txt"
+    filename.write_text(text)
+    frame = PRW_Export.read_text(str(filename), loadset_ids=[7, 9])
+    assert frame.index.get_level_values("loadset").unique().tolist() == [7, 9]
+
+
+def test_unrecognised_line(tmp_path):
+    with open(SAMPLE) as f:
+        text = f.read().replace("2:Live\n", "2:Live\nUnits\tkN\tm\n")
+    filename = tmp_path / "units.txt"
+    filename.write_text(text)
+    with pytest.raises(ValueError, match="Unrecognised line"):
+        PRW_Export.read_text(str(filename))
+
+
+class RecordingWizard:
+    """Records the methods called on a Print Results Wizard and their arguments"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *arguments: self.calls.append((name, arguments))
+
+
+@pytest.mark.parametrize("components", [None, ["Fx", "My"]])
+def test_wizard_settings(components):
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_loadsets([1, 2])
+    wizard = RecordingWizard()
+    db.createPrintResultsWizard = lambda name: wizard
+    for loadset in db.getLoadsets():
+        loadset.getResultsFileID = loadset.getHarmonicID = lambda: 0
+    PRW_Export.create_wizard(db, "PRW", PRW_Export.PRWRequest("Force/Moment - Thick 3D Beam", components=components), [1, 2])
+    calls = dict(wizard.calls)
+    assert all(a is not None for _, arguments in wizard.calls for a in arguments)
+    assert calls["setLoadcasesOption"] == ("Selected",) and calls["setLoadcases"][0] == [1, 2]
+    assert "setUnits" not in calls and "setThreshold" not in calls
+    assert calls.get("setComponents") == (None if components is None else (components,))
@@ -0,0 +1,98 @@
+# Checks that Results_Cache only writes its index when results are stored, deleted or the cache is closed, that several
+# caches can share a store, and that model files are only hashed again when they or their own results files change
+
+import os
+import pytest
+import numpy as np
+from m100_Tools_And_Helpers import Results_Cache
+
+
+class FakeDatabase:
+    def __init__(self, filename:str):
+        self.filename = filename
+
+    def getDBFilename(self) -> str:
+        return self.filename
+
+    def getDBFilenameNoExtension(self) -> str:
+        return os.path.splitext(self.filename)[0]
+
+
+def test_get_does_not_write_index(tmp_path):
+    cache = Results_Cache.ResultsCache(str(tmp_path), max_size_mb=1)
+    cache.put("model", 1, "Displacement", "DZ", "Nodal", np.arange(10), np.ones((10, 1)))
+    index_file = os.path.join(tmp_path, "index.json")
+    written = os.stat(index_file).st_mtime_ns
+    first_access = cache._index[next(iter(cache._index))]["last_access"]
+    for _ in range(5):
+        assert cache.get("model", 1, "Displacement", "DZ", "Nodal") is not None
+    assert os.stat(index_file).st_mtime_ns == written
+
+    cache.close()
+    reopened = Results_Cache.ResultsCache(str(tmp_path), max_size_mb=1)
+    assert reopened._index[next(iter(reopened._index))]["last_access"] > first_access
+
+
+def test_least_recently_read_evicted(tmp_path):
+    values = np.ones((25_000, 1))
+    with Results_Cache.ResultsCache(str(tmp_path), max_size_mb=1) as cache:
+        cache.put("model", 1, "Displacement", "DZ", "Nodal", np.arange(len(values)), values)
+        cache.put("model", 2, "Displacement", "DZ", "Nodal", np.arange(len(values)), values)
+        cache.get("model", 1, "Displacement", "DZ", "Nodal")
+        # Over 1MB, the results of loadset 2 were read least recently
+        cache.put("model", 3, "Displacement", "DZ", "Nodal", np.arange(len(values)), values)
+        assert cache.contains("model", 1, "Displacement", "DZ", "Nodal")
+        assert not cache.contains("model", 2, "Displacement", "DZ", "Nodal")
+
+
+def test_model_hash_cached_until_file_changes(tmp_path):
+    filename = tmp_path / "model.mdl"
+    filename.write_bytes(b"model")
+    db = FakeDatabase(str(filename))
+    first = Results_Cache.get_model_hash(db)
+    # Same size and modification time, so the file is not read again
+    stat = os.stat(filename)
+    filename.write_bytes(b"MODEL")
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert Results_Cache.get_model_hash(db) == first
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert Results_Cache.get_model_hash(db) != first
+
+
+def test_results_files_of_other_models_excluded(tmp_path):
+    for name in ["Bridge[1].mdl", "Bridge[1].mys", "Bridge[1]_Analysis 2.mys", "Bridge[1]_v2.mdl", "Bridge[1]_v2.mys", "Bridge[1]v3.mys"]:
+        (tmp_path / name).write_bytes(b"model")
+    files = Results_Cache.get_results_files(FakeDatabase(str(tmp_path / "Bridge[1].mdl")))
+    assert [os.path.basename(f) for f in files] == ["Bridge[1].mys", "Bridge[1]_Analysis 2.mys"]
+
+
+def test_put_writes_one_file(tmp_path):
+    with Results_Cache.ResultsCache(str(tmp_path)) as cache:
+        cache.put("model", 1, "Displacement", "DZ", "Nodal", np.arange(3), np.ones((3, 1)))
+        ids, values = cache.get("model", 1, "Displacement", "DZ", "Nodal")
+    assert ids.tolist() == [0, 1, 2] and values.shape == (3, 1)
+    # The IDs and values in one file, besides the index
+    assert sorted(os.path.splitext(f)[1] for f in os.listdir(tmp_path)) == [".json", ".npz"]
+
+
+def test_caches_sharing_store_merge_index(tmp_path):
+    first = Results_Cache.ResultsCache(str(tmp_path))
+    second = Results_Cache.ResultsCache(str(tmp_path))
+    first.put("model", 1, "Displacement", "DZ", "Nodal", np.arange(3), np.ones((3, 1)))
+    second.put("model", 2, "Displacement", "DZ", "Nodal", np.arange(3), np.ones((3, 1)))
+    first.delete_for_loadset(2)
+    second.close()
+    reopened = Results_Cache.ResultsCache(str(tmp_path))
+    assert reopened.contains("model", 1, "Displacement", "DZ", "Nodal")
+    assert not reopened.contains("model", 2, "Displacement", "DZ", "Nodal")
+
+
+def test_index_locked(tmp_path):
+    cache = Results_Cache.ResultsCache(str(tmp_path))
+    lock = Results_Cache._IndexLock(os.path.join(tmp_path, "index.json.lock"))
+    with lock:
+        with pytest.raises(TimeoutError):
+            with Results_Cache._IndexLock(lock.filename, timeout=0.05):
+                pass
+    cache.put("model", 1, "Displacement", "DZ", "Nodal", np.arange(3), np.ones((3, 1)))
+    assert not os.path.exists(lock.filename)
@@ -0,0 +1,78 @@
+# Checks Results_Diff finds known changes in large synthetic sets of results, in one block and in several
+
+import numpy as np
+import pandas as pd
+import pytest
+from m100_Tools_And_Helpers import Results_Diff
+
+N_IDS, N_POINTS, N_LOADSETS, N_CHANGED = 2_000, 4, 5, 40
+COMPONENTS = ["Fx", "My"]
+
+
+@pytest.fixture
+def results():
+    rng = np.random.default_rng(0)
+    index = [np.arange(1, N_LOADSETS + 1), np.arange(1, N_IDS + 1), np.arange(N_POINTS), np.arange(len(COMPONENTS))]
+    grid = [g.ravel() for g in np.meshgrid(*index, indexing="ij")]
+    values = rng.normal(0.0, 100.0, grid[0].shape)
+    old = pd.DataFrame({"entity": "Force/Moment - Thick 3D Beam", "loadset": grid[0], "extreme": "", "id": grid[1], "point": grid[2],
+                        "component": np.array(COMPONENTS)[grid[3]], "value": values})
+    # Changes to the results of elements that are kept, and the last element removed from the new results
+    changed = rng.choice(np.flatnonzero(grid[1] != N_IDS), N_CHANGED, replace=False)
+    new_values = values.copy()
+    new_values[changed] += 1.0 + np.arange(N_CHANGED)
+    new = old.assign(value=new_values)[old["id"] != N_IDS]
+    return old, new, new_values[changed] - values[changed]
+
+
+@pytest.mark.parametrize("block_rows", [10**9, N_IDS * N_POINTS * len(COMPONENTS)])
+def test_compare(results, block_rows):
+    old, new, changes = results
+    diff = Results_Diff.compare(old, new, top=10, block_rows=block_rows)
+    assert np.allclose(diff.top["abs_diff"].to_numpy(), np.sort(changes)[::-1][:10])
+    assert int(diff.summary["only_old"].sum()) == N_LOADSETS * N_POINTS * len(COMPONENTS)
+    assert len(diff.summary) == N_LOADSETS * len(COMPONENTS)
+
+
+def test_unchanged(results):
+    old, _, _ = results
+    diff = Results_Diff.compare(old, old.copy())
+    assert len(diff.get_changed()) == 0 and len(diff.top) == 0
+
+
+def test_map_by_position():
+    # Renumbered nodes map back to the old IDs by position
+    rng = np.random.default_rng(0)
+    xyz = rng.uniform(0.0, 100.0, (1_000, 3))
+    order = rng.permutation(1_000)
+    id_map = Results_Diff.map_by_position(np.arange(1, 1_001), xyz, np.arange(5_001, 6_001), xyz[order] + 1e-6, 1e-3)
+    assert np.array_equal(id_map.to_numpy(), order + 1)
+
+
+def test_map_by_position_one_to_one():
+    # Two new nodes near the same old node, only the nearer is mapped to it
+    id_map = Results_Diff.map_by_position(np.array([1, 2]), np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]]),
+                                          np.array([11, 12]), np.array([[0.1, 0.0, 0.0], [0.2, 0.0, 0.0]]), 1.0)
+    assert id_map.to_dict() == {11: 1}
+
+
+def test_compare_duplicate_map(results):
+    # Results of new IDs mapped to the same old ID are not matched to it, leaving it and the old ID no longer mapped to unmatched
+    old, _, _ = results
+    new = old.assign(id=old["id"] + 10_000)
+    id_map = pd.Series(np.arange(1, N_IDS + 1), index=np.arange(10_001, 10_001 + N_IDS))
+    id_map.iloc[1] = 1
+    with pytest.warns(UserWarning):
+        diff = Results_Diff.compare(old, new, id_map=id_map)
+    assert int(diff.summary["only_new"].sum()) == 2 * N_LOADSETS * N_POINTS * len(COMPONENTS)
+    assert int(diff.summary["only_old"].sum()) == 2 * N_LOADSETS * N_POINTS * len(COMPONENTS)
+    assert len(diff.top) == 0
+
+
+def test_compare_mixed_points(results):
+    # Points of PRW_Export are node IDs, which cannot be compared with positions within the element
+    old, _, _ = results
+    prw = old.rename(columns={"id": "element", "point": "node"})
+    with pytest.raises(ValueError):
+        Results_Diff.compare(old, prw)
+    assert len(Results_Diff.compare(prw, prw.copy()).get_changed()) == 0
@@ -0,0 +1,54 @@
+# Checks that Results_Dump reads back the files of write_dump, in text and binary, whole and in chunks
+
+import os
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Results_Dump
+
+COMPONENTS = ["Fx", "Fz", "My"]
+
+
+def write(directory, file_type:str, values:np.ndarray, errors:list[str]=None) -> str:
+    files = [os.path.join(directory, f"{file_type}.{extension}") for extension in ("hdr", "body", "err")]
+    Results_Dump.write_dump(*files, "Force/Moment - Thick 3D Beam", COMPONENTS, "Internal", 3, np.arange(1, len(values) + 1) * 10,
+                            values, file_type, errors)
+    return files[0]
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).standard_normal((1_000, 4, len(COMPONENTS)))
+
+
+@pytest.mark.parametrize("file_type", ["text", "binary"])
+def test_read_dense(tmp_path, values, file_type):
+    header = write(tmp_path, file_type, values)
+    ids, dense = Results_Dump.read_dense(header, chunk_rows=333)
+    assert np.array_equal(ids, np.arange(1, 1_001) * 10)
+    assert np.array_equal(dense, values)
+
+
+@pytest.mark.parametrize("file_type", ["text", "binary"])
+def test_chunks_and_blocks(tmp_path, values, file_type):
+    header = Results_Dump.read_header(write(tmp_path, file_type, values, ["Element 10 has no results"]))
+    assert header.components == COMPONENTS and header.loadset == 3
+    assert Results_Dump.read_errors(header) == ["Element 10 has no results"]
+    assert sum(len(chunk.id) for chunk in Results_Dump.iter_chunks(header, 333)) == values.shape[0] * values.shape[1]
+    blocks = {(id, component): v for _, id, component, v in Results_Dump.iter_blocks(header, 333)}
+    assert np.array_equal(blocks[(20, "My")], values[1, :, 2])
+
+
+@pytest.mark.parametrize("file_type", ["text", "binary"])
+def test_missing_values(tmp_path, values, file_type):
+    values[5, 1, 0] = np.nan
+    values[6, 3] = np.nan
+    ids, dense = Results_Dump.read_dense(write(tmp_path, file_type, values), ["Fx"])
+    assert np.isnan(dense[5, 1, 0]) and np.isnan(dense[6, 3, 0])
+    assert np.count_nonzero(np.isnan(dense)) == 2
+
+
+def test_synthetic_samples():
+    folder = os.path.join(os.path.dirname(__file__), "..", "m100_Tools_And_Helpers", "DataFiles", "Results Dump")
+    text_ids, text = Results_Dump.read_dense(os.path.join(folder, "Synthetic Beam Forces text.hdr"))
+    binary_ids, binary = Results_Dump.read_dense(os.path.join(folder, "Synthetic Beam Forces binary.hdr"))
+    assert np.array_equal(text_ids, binary_ids) and np.array_equal(text, binary, equal_nan=True)
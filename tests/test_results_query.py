@@ -0,0 +1,87 @@
+# Checks Results_Query against the loop of the notebooks, one context and results component set per loadset and component
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Results_Query
+from tests.Fake_Modeller import FakeModeller, FAKE_COMPONENTS, fake_result
+
+ENTITY = "Force/Moment - Thick 3D Beam"
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_elements(np.arange(1, 301), 3)
+    db.add_nodes(np.arange(1, 51), np.zeros((50, 3)))
+    db.add_loadsets(range(1, 6))
+    return lusas
+
+
+def loop_total(lusas:FakeModeller, loadsets:list[int]) -> float:
+    db = lusas.database()
+    total = 0.0
+    elements = db.getObjects("Element")
+    for id in loadsets:
+        for component in FAKE_COMPONENTS:
+            context = lusas.newResultsContext(None)
+            context.getCalcResultsSet().add(elements)
+            context.setActiveLoadset(db.getLoadset(id))
+            results = db.getResultsComponentSet(ENTITY, component, "ElementNodal", context)
+            i_comp = results.getComponentNumber(component)
+            total += sum(sum(results.getElementNodalResultsArray(i_comp, e, None)) for e in elements)
+    return total
+
+
+@pytest.mark.parametrize("method", ["array", "continuous"])
+def test_matches_loop(lusas, method):
+    loadsets = [1, 2, 3, 4, 5]
+    expected = loop_total(lusas, loadsets)
+    frame = Results_Query.query(lusas, ENTITY, FAKE_COMPONENTS, loadsets, "ElementNodal", method=method)
+    assert len(frame) == 300 * 3 * len(FAKE_COMPONENTS) * len(loadsets)
+    assert np.isclose(frame["value"].sum(), expected)
+
+
+def test_wide_matches_tidy(lusas):
+    tidy = Results_Query.query(lusas, ENTITY, ["Fx", "My"], [1, 2], "ElementNodal", method="array")
+    wide = Results_Query.query(lusas, ENTITY, ["Fx", "My"], [1, 2], "ElementNodal", format="wide", method="array")
+    assert list(wide.index.names) == ["loadset", "extreme", "element", "point"]
+    assert np.isclose(wide.to_numpy().sum(), tidy["value"].sum())
+
+
+def test_nodal(lusas):
+    frame = Results_Query.query(lusas, "Reaction", ["FX", "FZ"], [1, 2], "Nodal", format="wide", method="continuous")
+    assert len(frame) == 100
+    assert list(frame.columns) == ["FX", "FZ"]
+
+
+def test_iter_query_one_loadset_at_a_time(lusas):
+    frames = list(Results_Query.iter_query(lusas, ENTITY, "My", [1, 2, 3], "ElementNodal", method="array"))
+    assert [int(f["loadset"].iloc[0]) for f in frames] == [1, 2, 3]
+
+
+def test_no_loadsets(lusas):
+    frame = Results_Query.query(lusas, ENTITY, ["Fx"], [], "ElementNodal", format="wide", method="array")
+    assert len(frame) == 0 and list(frame.columns) == ["Fx"]
+
+
+def test_envelopes(lusas):
+    lusas.database().add_envelope(101, 102, [1, 2, 3])
+    frame = Results_Query.query(lusas, ENTITY, ["Fx", "My"], [101], "ElementNodal", format="wide", method="array")
+    assert sorted(set(zip(frame.index.get_level_values("loadset"), frame.index.get_level_values("extreme")))) == [(101, "max"), (102, "min")]
+    elements = frame.xs((101, "max"), level=["loadset", "extreme"]).index.get_level_values("element").to_numpy()
+    points = frame.xs((101, "max"), level=["loadset", "extreme"]).index.get_level_values("point").to_numpy()
+    assert np.allclose(frame.xs((101, "max"), level=["loadset", "extreme"])["My"], fake_result(elements, points, 4, 3))
+    assert np.allclose(frame.xs((102, "min"), level=["loadset", "extreme"])["Fx"], fake_result(elements, points, 0, 1))
+
+    nodal = Results_Query.query(lusas, "Reaction", ["FX", "FZ"], [101], "Nodal", format="wide", method="continuous")
+    nodes = nodal.xs((101, "max"), level=["loadset", "extreme"]).index.get_level_values("node").to_numpy()
+    assert np.allclose(nodal.xs((101, "max"), level=["loadset", "extreme"])["FZ"], fake_result(nodes, 0, 2, 3))
+
+
+def test_min_envelope_labelled_min(lusas):
+    lusas.database().add_envelope(101, 102, [1, 2, 3])
+    steps = Results_Query.plan_query(lusas.database(), ["Fx", "My"], [102])
+    assert [(s.loadset_id, s.extreme) for s in steps] == [(102, "min"), (102, "min")]
+    frame = Results_Query.query(lusas, ENTITY, ["Fx"], [102], "ElementNodal", method="array")
+    assert set(frame["extreme"]) == {"min"}
@@ -0,0 +1,44 @@
+# Checks that Results_Transform rotations of results read once in element axes preserve the results
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Results_Query, Results_Transform
+from tests.Fake_Modeller import FakeModeller, FAKE_COMPONENTS
+
+ENTITY = "Force/Moment - Thick 3D Beam"
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_elements(np.arange(1, 201), 3)
+    db.add_loadsets([1, 2])
+    Results_Transform.clear_element_axes_cache()
+    return lusas
+
+
+def test_round_trip_and_lengths(lusas):
+    local = Results_Query.query(lusas, ENTITY, FAKE_COMPONENTS, [1, 2], "ElementNodal", format="wide", transform="None", method="array")
+    axes = Results_Transform.get_element_axes(lusas)
+    for target in ["Global", 10.0, 45.0, 80.0]:
+        view = Results_Transform.transform_frame(local, axes, target, "beam")
+        assert np.allclose(Results_Transform.transform_frame(view, axes, target, "beam", inverse=True).to_numpy(), local.to_numpy())
+        for group in Results_Transform.ELEMENT_TYPES["beam"]["vectors"]:
+            assert np.allclose(np.linalg.norm(view[list(group)], axis=1), np.linalg.norm(local[list(group)], axis=1))
+
+
+def test_axes_cached(lusas):
+    Results_Transform.get_element_axes(lusas)
+    lusas.reset_calls()
+    axes = Results_Transform.get_element_axes(lusas)
+    assert len(axes.ids) == 200
+    assert lusas.calls < 10
+
+
+def test_shell_rotation_about_normal():
+    # Moments rotated by 90 degrees about z swap Mx and My and change the sign of Mxy
+    axes = np.eye(3)[None]
+    values = np.array([[10.0, 2.0, 3.0]])
+    rotated = Results_Transform.transform_array(values, ["Mx", "My", "Mxy"], axes, 90.0, "shell")
+    assert np.allclose(rotated, [[2.0, 10.0, -3.0]])
@@ -0,0 +1,52 @@
+# Checks the totals of Support_Reactions against asking every node for its reactions, as plot_reactions did
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Support_Reactions
+from tests.Fake_Modeller import FakeModeller
+
+N_NODES, N_SUPPORTS = 500, 40
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    ids = np.arange(1, N_NODES + 1)
+    db.add_nodes(ids, np.zeros((N_NODES, 3)))
+    db.add_supports("Pinned", ids[:N_SUPPORTS // 2])
+    db.add_supports("Sliding", ids[N_SUPPORTS // 2:N_SUPPORTS])
+    db.add_loadsets(range(1, 4))
+    Support_Reactions.clear_support_index()
+    return lusas
+
+
+def every_node(lusas:FakeModeller) -> np.ndarray:
+    # The active loadset of the fake view is the first loadset
+    totals = np.zeros(len(Support_Reactions.REACTION_COMPONENTS))
+    for n in lusas.database().getObjects("Node"):
+        for j, component in enumerate(Support_Reactions.REACTION_COMPONENTS):
+            totals[j] += n.getResults("Reaction", component)[0] if n.hasResults("Reaction", component) else 0
+    return totals
+
+
+def test_totals_match_every_node(lusas):
+    expected = every_node(lusas)
+    totals = Support_Reactions.get_total_reactions(lusas, [1, 2, 3], method="continuous")
+    assert totals.index.tolist() == [1, 2, 3]
+    assert np.allclose(totals.loc[1].to_numpy(), expected)
+
+
+def test_index_cached(lusas):
+    Support_Reactions.get_total_reactions(lusas, [1], method="continuous")
+    lusas.reset_calls()
+    index = Support_Reactions.get_support_index(lusas)
+    assert len(index.node_ids) == N_SUPPORTS
+    assert lusas.calls < 20
+
+
+def test_support_totals_sum_to_total(lusas):
+    totals = Support_Reactions.get_total_reactions(lusas, [1, 2], method="continuous")
+    supports = Support_Reactions.get_support_reactions(lusas, [1, 2], method="continuous")
+    assert supports.index.get_level_values("support").unique().tolist() == ["Pinned", "Sliding"]
+    assert np.allclose(supports.groupby(level="loadset").sum().to_numpy(), totals.to_numpy())
@@ -0,0 +1,64 @@
+# Checks Time_History against reading the history of every node one value at a time, in memory and saved to file
+
+import os
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Time_History
+from tests.Fake_Modeller import FakeModeller
+
+N_NODES, N_STEPS = 40, 12
+COMPONENTS = ["DX", "DZ"]
+
+
+@pytest.fixture
+def lusas():
+    lusas = FakeModeller()
+    db = lusas.database()
+    db.add_nodes(np.arange(1, N_NODES + 1), np.zeros((N_NODES, 3)))
+    db.add_steps(1, np.linspace(0.01, N_STEPS * 0.01, N_STEPS))
+    return lusas
+
+
+def value_at_a_time(lusas:FakeModeller) -> np.ndarray:
+    db = lusas.database()
+    context = lusas.newResultsContext(None)
+    values = np.empty((N_STEPS, N_NODES, len(COMPONENTS)))
+    nodes = db.getObjects("Node")
+    for s, step in enumerate(db.getLoadset(1).getResultsLoadcases()):
+        context.setActiveLoadset(step)
+        for j, component in enumerate(COMPONENTS):
+            results = db.getResultsComponentSet("Displacement", component, "Nodal", context)
+            i_comp = results.getComponentNumber(component)
+            for n, node in enumerate(nodes):
+                values[s, n, j] = results.getContinuousResults(i_comp, node, None, None)
+    return values
+
+
+def test_in_memory(lusas):
+    history = Time_History.extract_history(lusas, 1, "Displacement", COMPONENTS, method="continuous")
+    assert np.allclose(history.values, value_at_a_time(lusas))
+    assert np.allclose(history.times, np.linspace(0.01, N_STEPS * 0.01, N_STEPS))
+    assert np.array_equal(history.get_series(3, "DZ").to_numpy(), history.values[:, 2, 1])
+
+
+def test_saved_and_reopened(lusas, tmp_path):
+    filename = os.path.join(tmp_path, "history.npy")
+    progress = []
+    history = Time_History.extract_history(lusas, 1, "Displacement", COMPONENTS, filename=filename, method="continuous",
+                                           progress=lambda done, total: progress.append(done))
+    assert progress == list(range(1, N_STEPS + 1))
+    reopened = Time_History.open_history(filename)
+    assert np.array_equal(reopened.values, history.values) and np.array_equal(reopened.times, history.times)
+    assert reopened.components == COMPONENTS
+    del history, reopened
+
+
+def test_no_steps_saved(lusas, tmp_path):
+    # A loadcase without steps still gives a file that can be opened again
+    lusas.database().add_steps(2, [])
+    filename = os.path.join(tmp_path, "empty.npy")
+    history = Time_History.extract_history(lusas, 2, "Displacement", COMPONENTS, filename=filename, method="continuous")
+    reopened = Time_History.open_history(filename)
+    assert history.values.shape == reopened.values.shape == (0, 0, len(COMPONENTS))
+    assert reopened.loadcase_id == 2 and reopened.components == COMPONENTS
+    del history, reopened
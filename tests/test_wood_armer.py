@@ -0,0 +1,104 @@
+# Checks the vectorised Wood-Armer moments and envelopes against a point at a time calculation following Armer
+
+import numpy as np
+import pytest
+from m100_Tools_And_Helpers import Wood_Armer
+
+
+def wood_armer_reference(mx:float, my:float, mxy:float, angle:float=0.0, skew:float=90.0) -> list[float]:
+    # One point at a time, following the cases of Armer
+    a, b, c = (float(v) for v in Wood_Armer._transform(mx, my, mxy, angle, skew))
+    bottom = [a + abs(c), b + abs(c)]
+    if bottom[0] < 0 and bottom[1] < 0:
+        bottom = [0.0, 0.0]
+    elif bottom[0] < 0:
+        bottom = [0.0, b + c**2 / abs(a)]
+    elif bottom[1] < 0:
+        bottom = [a + c**2 / abs(b), 0.0]
+    bottom = [0.0, 0.0] if min(bottom) < 0 else bottom
+    top = [a - abs(c), b - abs(c)]
+    if top[0] > 0 and top[1] > 0:
+        top = [0.0, 0.0]
+    elif top[0] > 0:
+        top = [0.0, b - c**2 / abs(a)]
+    elif top[1] > 0:
+        top = [a - c**2 / abs(b), 0.0]
+    top = [0.0, 0.0] if max(top) > 0 else top
+    return bottom + top
+
+
+@pytest.fixture
+def moments():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0.0, 100.0, (6, 400, 3))
+    return Wood_Armer.ShellMoments(np.arange(400) // 4 + 1, np.arange(400) % 4 + 1, [1, 2, 3, 4, 5, 5], [""] * 4 + ["max", "min"], values)
+
+
+@pytest.mark.parametrize("moment, expected", [
+    # Sagging in x only needs bottom x bars, hogging top x bars
+    ((10.0, 0.0, 0.0), [10.0, 0.0, 0.0, 0.0]),
+    ((-10.0, 0.0, 0.0), [0.0, 0.0, -10.0, 0.0]),
+    # Pure twist needs both bars top and bottom
+    ((0.0, 0.0, 4.0), [4.0, 4.0, -4.0, -4.0]),
+    # Mx + |Mxy| and My + |Mxy| at the bottom, no top bars as Mx - |Mxy| and My - |Mxy| are positive
+    ((10.0, 5.0, 3.0), [13.0, 8.0, 0.0, 0.0]),
+    # My + |Mxy| is negative, so Mx* = Mx + Mxy^2 / |My| at the bottom and My* = My - Mxy^2 / |Mx| at the top
+    ((10.0, -5.0, 3.0), [11.8, 0.0, 0.0, -5.9]),
+])
+def test_orthogonal_hand_calculations(moment, expected):
+    assert np.allclose(Wood_Armer.wood_armer(*moment), expected)
+
+
+def test_sign_convention():
+    # Mxy is the off diagonal of the tensor, so positive twist is a sagging moment at 45 degrees anticlockwise from x,
+    # taken by the bottom bars alone when they are at 45 degrees, and a hogging moment at -45 degrees
+    assert np.allclose(Wood_Armer.wood_armer(0.0, 0.0, 5.0, 45.0), [5.0, 0.0, 0.0, -5.0])
+    assert np.allclose(Wood_Armer.wood_armer(0.0, 0.0, 5.0, -45.0), [0.0, 5.0, -5.0, 0.0])
+
+
+def test_skew_hand_calculations():
+    # Second bars at 60 degrees: Mx* = Mx - 2 Mxy cot 60 + My cot^2 60 + |Mxy - My cot 60| / sin 60 and
+    # My* = My / sin^2 60 + |Mxy - My cot 60| / sin 60, as Armer with Mxy the off diagonal of the tensor
+    cot, sin = 1 / np.sqrt(3), np.sqrt(3) / 2
+    assert np.allclose(Wood_Armer.wood_armer(0.0, 10.0, 0.0, 0.0, 60.0), [10 * cot**2 + 10 * cot / sin, 10 / sin**2 + 10 * cot / sin, 0.0, 0.0])
+    # A sagging moment along the second bars is taken by them alone
+    t = np.radians(60.0)
+    mx, my, mxy = 10 * np.cos(t)**2, 10 * np.sin(t)**2, 10 * np.sin(t) * np.cos(t)
+    assert np.allclose(Wood_Armer.wood_armer(mx, my, mxy, 0.0, 60.0), [0.0, 10.0, 0.0, 0.0])
+
+
+@pytest.mark.parametrize("angle, skew", [(0.0, 90.0), (30.0, 90.0), (0.0, 60.0), (20.0, 75.0), (-15.0, 45.0)])
+def test_yield_criterion(moments, angle, skew):
+    # Johansen: the resistance of the bottom bars in every direction is at least the normal moment, and of the top bars at most
+    values = moments.values.reshape(-1, 3)
+    design = Wood_Armer.wood_armer(values[:, 0], values[:, 1], values[:, 2], angle, skew)
+    t = np.radians(np.linspace(0.0, 180.0, 721))[:, None]
+    normal = values[:, 0] * np.cos(t)**2 + values[:, 1] * np.sin(t)**2 + 2 * values[:, 2] * np.sin(t) * np.cos(t)
+    x_bars, second_bars = np.cos(t - np.radians(angle))**2, np.cos(t - np.radians(angle + skew))**2
+    assert (design[:, 0] * x_bars + design[:, 1] * second_bars >= normal - 1e-9).all()
+    assert (design[:, 2] * x_bars + design[:, 3] * second_bars <= normal + 1e-9).all()
+
+
+def test_combine_loadsets(moments):
+    assert moments.get_loadsets()[-2:] == [(5, "max"), (5, "min")]
+    combined = moments.combine(np.eye(6)[:2])
+    assert combined.get_loadsets() == [(1, ""), (2, "")] and np.allclose(combined.values, moments.values[:2])
+
+
+@pytest.mark.parametrize("angle, skew", [(0.0, 90.0), (30.0, 90.0), (20.0, 75.0)])
+def test_matches_reference(moments, angle, skew):
+    values = moments.values.reshape(-1, 3)
+    design = Wood_Armer.wood_armer(values[:, 0], values[:, 1], values[:, 2], angle, skew)
+    expected = np.array([wood_armer_reference(*v, angle, skew) for v in values])
+    assert np.allclose(design, expected)
+
+
+@pytest.mark.parametrize("angles, skew", [([0.0], 90.0), ([0.0, 30.0, 60.0], 75.0)])
+def test_envelope_matches_reference(moments, angles, skew):
+    factors = np.random.default_rng(1).choice([0.0, 1.0, 1.35, 1.5], (30, 6))
+    result = Wood_Armer.envelope(moments, factors, angles, skew, block=7)
+    combined = moments.combine(factors).values
+    for r in range(0, 400, 37):
+        expected = np.array([wood_armer_reference(*combined[c, r], angles[-1], skew) for c in range(len(factors))])
+        assert np.allclose(result.max[-1, r], expected.max(axis=0)) and np.allclose(result.min[-1, r], expected.min(axis=0))
+        assert np.allclose(expected[result.max_combination[-1, r], range(4)], result.max[-1, r])